@@ -1,5 +1,7 @@
 from collections import defaultdict
 
+from port_graph import PORT_GRAPH_KEY, attach_port_graph
+
 def get_dict_key(d, value):
     for k, v in d.items():
         if v == value:
@@ -132,7 +134,8 @@ def move_to_scout(G, agent):
         raise Exception("Agent is not settled")
     if agent.help_port is None:
         raise Exception("No help port found for agent")
-    help_node = G.nodes[agent.currentnode]['port_map'][agent.help_port]
+    ports = G.graph[PORT_GRAPH_KEY]
+    help_node = ports.neighbor(agent.currentnode, agent.help_port)
     if help_node is None:
         raise Exception("No help node found for agent")
     else:
@@ -140,7 +143,7 @@ def move_to_scout(G, agent):
         print(f"Agent {agent.id} moved forward to help node {help_node} via help port {agent.help_port}")
         # move to the help node
         G.nodes[agent.currentnode]['agents'].remove(agent)
-        agent.pin = G[agent.currentnode][help_node][f"port_{help_node}"]
+        agent.pin = ports.arrival_port(agent.currentnode, agent.help_port)
         agent.currentnode = help_node
         G.nodes[help_node]['agents'].add(agent)
     return
@@ -150,7 +153,7 @@ def ensure_scout(G, agent):
     if settled_agent is None or settled_agent.state['leader']!= agent.state['leader'] or agent.state['leader'].currentnode != agent.currentnode:
         print(f"Help mismatch {agent.currentnode}")
         agent.help_port = None
-        home_node = G.nodes[agent.currentnode]['port_map'][agent.help_return_port]
+        home_node = G.graph[PORT_GRAPH_KEY].neighbor(agent.currentnode, agent.help_return_port)
         if home_node is None:
             raise Exception("No home node found for agent")
         else:
@@ -173,7 +176,7 @@ def helper_return(G, agent):
     if agent.help_port is None:
         agent.state['role'] = AgentRole['FOLLOWER']
         print(f"Agent {agent.id} is not a helper anymore")
-    home_node = G.nodes[agent.currentnode]['port_map'][agent.help_return_port]
+    home_node = G.graph[PORT_GRAPH_KEY].neighbor(agent.currentnode, agent.help_return_port)
     if home_node is None:
         raise Exception("No home node found for agent")
     else:
@@ -211,7 +214,7 @@ def scout_forward(G, agent):
                 print(f"Parent port {scout_port} is not assigned to agent {a.id} at node {agent.currentnode}")
                 scout_port += 1
                 checked_port += 1
-            if scout_port < G.degree[agent.currentnode]:
+            if scout_port < G.graph[PORT_GRAPH_KEY].degree(agent.currentnode):
                 a.scout_port = scout_port
                 a.scout_forward = True
                 print(f"Unsettled agent {a.id} at node {agent.currentnode} assigned scout port {a.scout_port}")
@@ -220,7 +223,7 @@ def scout_forward(G, agent):
             else:
                 print(f"Unsettled agent {a.id} at node {agent.currentnode} not assigned a scout port as it exceeds degree")
                 a.scout_port = None
-                settled_agent.max_scouted_port = G.degree[agent.currentnode] - 1
+                settled_agent.max_scouted_port = G.graph[PORT_GRAPH_KEY].degree(agent.currentnode) - 1
                 break
     return
 
@@ -230,13 +233,14 @@ def scout_neighbor(G, agent):
     if agent.scout_port is None:
         return
     if agent.scout_port is not None:
-        neighbor = G.nodes[agent.currentnode]["port_map"][agent.scout_port]
+        ports = G.graph[PORT_GRAPH_KEY]
+        neighbor = ports.neighbor(agent.currentnode, agent.scout_port)
         if neighbor is None:
             raise Exception("No neighbor found for scout port")
         else:
             print(f"Agent {agent.id} moved to neighbor {neighbor} via scout port {agent.scout_port}")
             # move to the neighbor
-            agent.pin = G[agent.currentnode][neighbor][f"port_{neighbor}"]
+            agent.pin = ports.arrival_port(agent.currentnode, agent.scout_port)
             G.nodes[agent.currentnode]['agents'].remove(agent)
             agent.currentnode = neighbor
             G.nodes[neighbor]['agents'].add(agent)
@@ -260,7 +264,7 @@ def scout_neighbor(G, agent):
     return
 
 def scout_return(G, agent):
-    home = G.nodes[agent.currentnode]['port_map'][agent.scout_return_port]
+    home = G.graph[PORT_GRAPH_KEY].neighbor(agent.currentnode, agent.scout_return_port)
     if home is None:
         raise Exception("No home found for scout return port")
     else:
@@ -285,11 +289,12 @@ def chase_leader(G, agent):
             agent.state['role'] = AgentRole['FOLLOWER']
         else:
             print(f"Chasing leader {agent.state['leader'].id} by moving to next node by port {settled_agent.next}")
-            next_node = G.nodes[agent.currentnode]['port_map'][settled_agent.next]
+            ports = G.graph[PORT_GRAPH_KEY]
+            next_node = ports.neighbor(agent.currentnode, settled_agent.next)
             if next_node is None:
                 raise Exception("No next node found for agent")
             else:
-                agent.pin = G[agent.currentnode][next_node][f"port_{next_node}"]
+                agent.pin = ports.arrival_port(agent.currentnode, settled_agent.next)
                 G.nodes[agent.currentnode]['agents'].remove(agent)
                 agent.currentnode = next_node
                 G.nodes[next_node]['agents'].add(agent)
@@ -322,7 +327,7 @@ def check_scout_result(G, agent):
     else:
         print(f"Leader agent {agent.id} found no empty port at node {agent.currentnode} and {settled_agent.max_scouted_port} is the max scouted port. Update checked port!!")
         empty_port = None
-        if settled_agent.max_scouted_port < G.degree[agent.currentnode] - 1:
+        if settled_agent.max_scouted_port < G.graph[PORT_GRAPH_KEY].degree(agent.currentnode) - 1:
             settled_agent.checked_port = settled_agent.max_scouted_port
         else:
             settled_agent.checked_port = None
@@ -352,13 +357,14 @@ def follow_leader(G, agent):
         print(f"Unsettled agents at node {agent.currentnode}: {[a.id for a in unsettled_agents]} follow leader {agent.id} to port {agent.next}")
         settled_agent.next = agent.next
         # all unsettled agents including the leader to the next port
-        next_node = G.nodes[agent.currentnode]['port_map'][agent.next]
+        ports = G.graph[PORT_GRAPH_KEY]
+        next_node = ports.neighbor(agent.currentnode, agent.next)
         if next_node is None:
             raise Exception("No next node found for agent")
         else:
             for a in unsettled_agents:
                 print(f"Follow leader Agent {a.id} moved to next node {next_node} from node {a.currentnode} via port {agent.next}. Leader is {agent.id} at node {agent.currentnode}")
-                a.pin = G[a.currentnode][next_node][f"port_{next_node}"]
+                a.pin = ports.arrival_port(a.currentnode, agent.next)
                 G.nodes[a.currentnode]['agents'].remove(a)
                 a.currentnode = next_node
                 G.nodes[next_node]['agents'].add(a)
@@ -427,6 +433,7 @@ def run_simulation(G, agents, max_degree, rounds, starting_positions):
         return positions, statuses
 
     # Initialization (outside main loop, before starting rounds)
+    attach_port_graph(G)
     for node in G.nodes():
         G.nodes[node]['last_election_round'] = -1
 
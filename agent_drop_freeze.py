@@ -1,5 +1,7 @@
 from collections import defaultdict
 
+from port_graph import PORT_GRAPH_KEY, attach_port_graph
+
 AgentStatus = {
     "SETTLED": 0,
     "UNSETTLED": 1,
@@ -34,13 +36,9 @@ class Agent:
         self.entry_pin = None  
 
 
-def _ordered_ports(G, u):
-    port_map = G.nodes[u]["port_map"]
-    nbr_to_port_u = G.nodes[u]["nbr_to_port"]
-
+def _ordered_ports(ports, u):
     def rank(p):
-        v = port_map[p]
-        p_vu = G.nodes[v]["nbr_to_port"][u]
+        p_vu = ports.arrival_port(u, p)
         local_is_p1  = (p == 0)
         remote_is_p1 = (p_vu == 0)
         if (not local_is_p1) and remote_is_p1:
@@ -49,7 +47,7 @@ def _ordered_ports(G, u):
             return (1, p)
         return (2, p)
 
-    return sorted(port_map.keys(), key=rank)
+    return sorted(range(ports.degree(u)), key=rank)
 
 
 
@@ -101,6 +99,7 @@ def _probe_out(G, node_to_agents):
     All UNSETTLED (non-settled) agents at each node fan out to distinct ports.
     One agent per port (up to degree).
     """
+    ports = G.graph[PORT_GRAPH_KEY]
     moves = []  # list of (agent, src, dst, port)
 
     for u, agents_here in node_to_agents.items():
@@ -117,19 +116,16 @@ def _probe_out(G, node_to_agents):
         if settled is None and len(unsettled) == 1:
             continue
 
-        deg = G.degree[u]
-        if deg == 0:
+        if ports.degree(u) == 0:
             continue
 
         sa = G.nodes[u].get("settled_agent")
-        ports = _ordered_ports(G, u)
+        order = _ordered_ports(ports, u)
 
         start = sa.next_port_to_try if sa is not None else 0
-        ports_to_probe = ports[start:]
+        ports_to_probe = order[start:]
         for a, port in zip(unsettled, ports_to_probe):
-            v = G.nodes[u]["port_map"].get(port)
-            if v is None:
-                continue
+            v = ports.neighbor(u, port)
             a.probe_home = u
             a.probe_port = port
             a.probe_result_empty = None
@@ -137,7 +133,6 @@ def _probe_out(G, node_to_agents):
             moves.append((a, u, v, port))
 
     for a, u, v, _port in moves:
-        back_port = G[u][v][f"port_{v}"]
         G.nodes[u]["agents"].remove(a)
         a.currentnode = v
         G.nodes[v]["agents"].add(a)
@@ -164,13 +159,13 @@ def _probe_back(G, agents):
 
     # execute returns simultaneously
     for a, src, home in moves:
-        back_port = G[src][home][f"port_{home}"]
         G.nodes[src]["agents"].remove(a)
         a.currentnode = home
         G.nodes[home]["agents"].add(a)
         a.state["status"] = AgentStatus["UNSETTLED"]
 
 def _move_out(G, node_to_agents):
+    ports = G.graph[PORT_GRAPH_KEY]
     planned_moves = []
     unsettled_by_node = {}
     AS = AgentStatus
@@ -195,10 +190,7 @@ def _move_out(G, node_to_agents):
 
             # Parent is the port used to enter this node (if valid)
             to_settle.parent_port = to_settle.entry_pin
-            pnode = G.nodes[u]["port_map"].get(to_settle.parent_port)
-            if pnode is None:
-                to_settle.parent_port = None
-            if to_settle.parent_port not in G.nodes[u]["port_map"]:
+            if ports.neighbor(u, to_settle.parent_port) is None:
                 to_settle.parent_port = None
 
             G.nodes[u]["settled_agent"] = to_settle
@@ -214,13 +206,13 @@ def _move_out(G, node_to_agents):
         if sa is None:
             continue
 
-        port_map = G.nodes[u]["port_map"]
-        ports = _ordered_ports(G, u)
-        if not ports:
+        deg = ports.degree(u)
+        order = _ordered_ports(ports, u)
+        if not order:
             continue
 
         cursor_idx = sa.next_port_to_try if sa.next_port_to_try is not None else 0
-        port_to_idx = {p:i for i,p in enumerate(ports)}
+        port_to_idx = {p:i for i,p in enumerate(order)}
 
         # 1) Prefer ports confirmed empty by probe results (this round)
         probe_empty_ports = []
@@ -234,7 +226,7 @@ def _move_out(G, node_to_agents):
             if a.probe_home != u or a.probe_result_empty is not True:
                 continue
             p = a.probe_port
-            if p in port_map and p not in seen :
+            if p is not None and 0 <= p < deg and p not in seen :
                 seen.add(p)
                 probe_empty_ports.append(p)
 
@@ -251,10 +243,9 @@ def _move_out(G, node_to_agents):
 
         # Forward DFS move: ALL movers go together
         if chosen_port is not None:
-            v = port_map[chosen_port]
             sa.next_port_to_try = port_to_idx[chosen_port] + 1
             for a in movers:
-                planned_moves.append((a, u, v))
+                planned_moves.append((a, u, chosen_port))
             continue
 
 
@@ -265,21 +256,20 @@ def _move_out(G, node_to_agents):
                 if a.probe_home == u and a.probe_port is not None
             ]
             probed_count = len(set(probed_ports))
-            sa.next_port_to_try = min(len(ports), cursor_idx + probed_count)
-            if sa.next_port_to_try < len(ports):
+            sa.next_port_to_try = min(deg, cursor_idx + probed_count)
+            if sa.next_port_to_try < deg:
                 continue  
 
 
         # 3) No empty neighbor left -> backtrack to parent as a group
-        if sa.parent_port is not None and sa.parent_port in port_map:
-            v = port_map[sa.parent_port]
-            sa.next_port_to_try = len(ports)
+        if ports.neighbor(u, sa.parent_port) is not None:
+            sa.next_port_to_try = deg
             for a in movers:
-                planned_moves.append((a, u, v))
+                planned_moves.append((a, u, sa.parent_port))
 
     # Execute moves (your original logic)
-    for a, u, v in planned_moves:
-        back_port = G.nodes[v]["nbr_to_port"][u]
+    for a, u, port in planned_moves:
+        v, back_port = ports.traverse(u, port)
         G.nodes[u]["agents"].remove(a)
 
         a.currentnode = v
@@ -298,6 +288,7 @@ def run_simulation(G, agents, rounds):
         G.nodes[node]["settled_agent"] = None
         G.nodes[node]["node_status"] = NodeStatus["EMPTY"]
     _init_ports(G)
+    attach_port_graph(G)
     for a in agents:
         a.state["status"] = AgentStatus["UNSETTLED"]
         a.probe_home = None
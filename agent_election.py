@@ -1,12 +1,14 @@
 from __future__ import annotations
-import math, random
+import math, random, time
 import itertools
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Dict, List, Tuple, Optional, Sequence, Set, Union
 
 import networkx as nx
 import numpy as np
 
+from port_graph import PortGraph
+
 def _pyseed(x):
     """Return a native `int` or `None` suitable for RNG seeding."""
     try:
@@ -59,10 +61,13 @@ def randomize_ports(G: nx.Graph, seed: int) -> None:
                     G[u][v] = {}
                 G[u][v][f"port_{u}"] = p
 
+    # neighbour → port per node, so each edge is relabelled in O(1)
+    port_of = {u: {x: p for p, x in G.nodes[u]["port_map"].items()}
+               for u in G.nodes() if "port_map" in G.nodes[u]}
     for u, v in G.edges():
-        if "port_map" in G.nodes[u] and "port_map" in G.nodes[v]:
-            u_port = next((p for p, x in G.nodes[u]["port_map"].items() if x == v), None)
-            v_port = next((p for p, x in G.nodes[v]["port_map"].items() if x == u), None)
+        if u in port_of and v in port_of:
+            u_port = port_of[u].get(v)
+            v_port = port_of[v].get(u)
             if u_port is not None:
                 G[u][v][f"port_{u}"] = u_port
             if v_port is not None:
@@ -117,7 +122,7 @@ class Agent:
 
 
 # ──────────────────  Mobility: “bit‑controlled schedule”  ─────────────────
-def decide_and_move(ag: Agent, round_idx: int, G: nx.Graph) -> None:
+def decide_and_move(ag: Agent, round_idx: int, ports: PortGraph) -> None:
     if ag.delta == 0:
         return
     CYCLE = 2 * ag.delta
@@ -141,7 +146,7 @@ def decide_and_move(ag: Agent, round_idx: int, G: nx.Graph) -> None:
         return
 
     if in_out == 0:
-        dest = get_neighbor_by_port(G, ag.current_node, port_k)
+        dest = ports.neighbor(ag.current_node, port_k)
         if dest is not None:
             ag.origin_node   = ag.current_node
             ag.current_node  = dest
@@ -199,6 +204,11 @@ def update_agent_phase_state(ag: Agent, current_round: int, agents: Dict[int, Ag
     ag.rounds_in_current_phase += 1
     if ag.rounds_in_current_phase < ag.phase_duration:
         return
+    end_phase(ag)
+
+
+def end_phase(ag: Agent) -> None:
+    """Phase-boundary step of one agent: parent stability and vote decision."""
     ag.rounds_in_current_phase = 0
     ag.phase_index += 1
 
@@ -209,12 +219,6 @@ def update_agent_phase_state(ag: Agent, current_round: int, agents: Dict[int, Ag
         ag.parent_stable_phases = 0
     ag._parent_last_phase = ag.parent
 
-    # helper checks
-    def all_yes():
-        return ag.children and all(ag.incoming_votes.get(c) == "yes" for c in ag.children)
-    def any_und():
-        return any(v == "undecided" for v in ag.incoming_votes.values())
-
     # if already learned leader → just keep informing
     if ag.aware_of_leader:
         ag.vote_to_parent = None
@@ -246,11 +250,11 @@ def update_agent_phase_state(ag: Agent, current_round: int, agents: Dict[int, Ag
                 ag.aware_of_leader = True
                 ag.vote_to_parent = None
         else:
-            if all_yes() and not any_und():
-                ag.vote_to_parent = "yes"
-            else:
-                ag.vote_to_parent = "undecided"
-            if ag.id == ag.global_max_id and all_yes() and not any_und():
+            votes = ag.incoming_votes
+            agreed = ("undecided" not in votes.values()
+                      and all(votes.get(c) == "yes" for c in ag.children))
+            ag.vote_to_parent = "yes" if agreed else "undecided"
+            if agreed and ag.id == ag.global_max_id:
                 ag.is_leader = True
                 ag.aware_of_leader = True
                 ag.vote_to_parent = None
@@ -259,11 +263,51 @@ def update_agent_phase_state(ag: Agent, current_round: int, agents: Dict[int, Ag
     ag.incoming_votes.clear()
 
 
+def end_phase_all(agents: Dict[int, Agent]) -> None:
+    """Phase boundary for every agent; agents sharing a phase clock call this
+    once per phase instead of `update_agent_phase_state` every round."""
+    for ag in agents.values():
+        end_phase(ag)
+
+
 # ─────────────────────────────  Main election loop  ─────────────────────────
-def run_leader_election(G: nx.Graph,
+# rounds between two looks at the clock when a run has a deadline
+DEADLINE_CHECK_ROUNDS = 64
+
+
+def election_round_bound(delta: int, num_nodes: int, diameter: int) -> int:
+    """Rounds an election is expected to need: (diameter + bit width + 2)
+    phases of 2·Δ·bit_width rounds.  An empirical bound, not a proven one;
+    every run of the default sweep families finishes within it."""
+    width = id_bit_width(num_nodes)
+    return max(1, 2 * delta * width) * (diameter + width + 2)
+
+
+def run_leader_election(G: Union[nx.Graph, PortGraph],
                         agents: Dict[int, Agent],
-                        max_rounds: int = 200_000
+                        max_rounds: int = 200_000,
+                        event_driven: bool = False,
+                        deadline: Optional[float] = None,
+                        counters: Optional[Dict[str, int]] = None
                        ) -> Tuple[Optional[int], int, bool]:
+    """Run the election until the max-ID agent is leader or ``max_rounds`` pass.
+
+    With a ``deadline`` (a `time.monotonic` value) the run also stops once
+    that time has passed; it then returns ``(None, rounds_done, True)`` with
+    ``rounds_done < max_rounds``.
+
+    ``G`` is a port-labelled networkx graph, or a `PortGraph` whose node
+    indices the agents' positions already refer to.
+
+    With ``event_driven=True`` only the rounds in which agents meet and the
+    phase boundaries are simulated (see `_run_event_driven`); results are the
+    same as the round-by-round loop.
+
+    With a ``counters`` dict the round-by-round loop runs instrumented and
+    adds its `STAGE_COUNTERS` to the dict (see `_run_rounds_counted`).
+    """
+    if counters is not None and event_driven:
+        raise ValueError("stage counters need the round-by-round loop")
     if not agents:
         return None, 0, False
 
@@ -277,37 +321,333 @@ def run_leader_election(G: nx.Graph,
         only.is_leader = True
         return only.id, 0, False
 
+    if isinstance(G, PortGraph):
+        # agents already stand on node indices
+        return _run_engine(G, agents, global_max, max_rounds, deadline,
+                           event_driven, counters)
+
+    # the engines walk a PortGraph, so agent positions are node indices
+    # while they run and are mapped back to G's labels afterwards
+    ports = PortGraph.from_networkx(G)
+    _relabel_positions(agents, ports.index)
+    try:
+        return _run_engine(ports, agents, global_max, max_rounds, deadline,
+                           event_driven, counters)
+    finally:
+        _relabel_positions(agents, ports.labels)
+
+
+def _run_engine(ports: PortGraph,
+                agents: Dict[int, Agent],
+                global_max: int,
+                max_rounds: int,
+                deadline: Optional[float],
+                event_driven: bool,
+                counters: Optional[Dict[str, int]]) -> Tuple[Optional[int], int, bool]:
+    if event_driven:
+        return _run_event_driven(ports, agents, global_max, max_rounds, deadline)
+    if counters is None:
+        return _run_rounds(ports, agents, global_max, max_rounds, deadline)
+    return _run_rounds_counted(ports, agents, global_max, max_rounds, deadline, counters)
+
+
+def _relabel_positions(agents: Dict[int, Agent], mapping) -> None:
+    for ag in agents.values():
+        ag.current_node = mapping[ag.current_node]
+        if ag.origin_node is not None:
+            ag.origin_node = mapping[ag.origin_node]
+
+
+def _run_rounds(ports: PortGraph,
+                agents: Dict[int, Agent],
+                global_max: int,
+                max_rounds: int,
+                deadline: Optional[float] = None) -> Tuple[Optional[int], int, bool]:
+    # All agents normally share one phase clock (same Δ and bit width, all
+    # started together), so phase boundaries fall on the same rounds for
+    # everyone and the phase state machine only has to run at those rounds.
+    leader = agents[global_max]
+    clocks = {(ag.phase_duration, ag.rounds_in_current_phase) for ag in agents.values()}
+    shared = len(clocks) == 1
+    duration, clock = next(iter(clocks))
+
+    rounds = max_rounds
     for r in range(max_rounds):
+        if deadline is not None and not r % DEADLINE_CHECK_ROUNDS and time.monotonic() > deadline:
+            rounds = r
+            break
         for ag in agents.values():
-            decide_and_move(ag, r, G)
+            decide_and_move(ag, r, ports)
 
         buckets: Dict[int, List[Agent]] = {}
         for ag in agents.values():
             buckets.setdefault(ag.current_node, []).append(ag)
 
         exchange_and_update_state(buckets, agents)
-        for ag in agents.values():
-            update_agent_phase_state(ag, r, agents)
+        if not shared:
+            for ag in agents.values():
+                update_agent_phase_state(ag, r, agents)
+        else:
+            clock += 1
+            if clock < duration:
+                continue
+            clock = 0
+            end_phase_all(agents)
 
-        leader = agents[global_max]
         if leader.is_leader:
             return leader.id, r + 1, False
 
-    return None, max_rounds, True
+    if shared:
+        for ag in agents.values():
+            ag.rounds_in_current_phase = clock
+    return None, rounds, True
+
+
+# ─────────────────────  Instrumented round loop  ───────────────────────────
+# `_run_rounds` with a nanosecond timer around each stage of a round and
+# counters of what the stages did.  It is a separate copy so that the plain
+# loop pays nothing for it; the bookkeeping for the event counters happens
+# outside the timed stages.
+STAGES = ("move", "bucket", "exchange", "phase")
+STAGE_COUNTERS = tuple(f"{stage}_ns" for stage in STAGES) + (
+    "rounds",           # rounds simulated
+    "meetings",         # (round, node) pairs with two or more agents
+    "meeting_agents",   # agents in those meetings
+    "max_meeting",      # most agents in one meeting (a maximum, not a sum)
+    "parent_changes",   # agents that took a new parent
+    "votes",            # child→parent votes delivered
+    "phase_ends",       # phase boundaries passed, summed over agents
+)
+
+
+def _run_rounds_counted(ports: PortGraph,
+                        agents: Dict[int, Agent],
+                        global_max: int,
+                        max_rounds: int,
+                        deadline: Optional[float],
+                        counters: Dict[str, int]) -> Tuple[Optional[int], int, bool]:
+    for name in STAGE_COUNTERS:
+        counters.setdefault(name, 0)
+    clock_ns = time.perf_counter_ns
+    move_ns = bucket_ns = exchange_ns = phase_ns = 0
+    meetings = meeting_agents = max_meeting = parent_changes = votes = 0
+    phases_before = sum(ag.phase_index for ag in agents.values())
+
+    leader = agents[global_max]
+    clocks = {(ag.phase_duration, ag.rounds_in_current_phase) for ag in agents.values()}
+    shared = len(clocks) == 1
+    duration, clock = next(iter(clocks))
+
+    result: Tuple[Optional[int], int, bool] = (None, max_rounds, True)
+    r = -1
+    for r in range(max_rounds):
+        if deadline is not None and not r % DEADLINE_CHECK_ROUNDS and time.monotonic() > deadline:
+            result = (None, r, True)
+            r -= 1
+            break
+        t0 = clock_ns()
+        for ag in agents.values():
+            decide_and_move(ag, r, ports)
+        t1 = clock_ns()
+        buckets: Dict[int, List[Agent]] = {}
+        for ag in agents.values():
+            buckets.setdefault(ag.current_node, []).append(ag)
+        t2 = clock_ns()
+        move_ns += t1 - t0
+        bucket_ns += t2 - t1
+
+        # only agents that share a node can change parent or deliver a vote
+        met = [(ag, ag.parent, ag.vote_to_parent)
+               for here in buckets.values() if len(here) > 1 for ag in here]
+        t0 = clock_ns()
+        exchange_and_update_state(buckets, agents)
+        exchange_ns += clock_ns() - t0
+        if met:
+            sizes = [len(here) for here in buckets.values() if len(here) > 1]
+            meetings += len(sizes)
+            meeting_agents += len(met)
+            max_meeting = max(max_meeting, max(sizes))
+            for ag, parent, vote in met:
+                parent_changes += ag.parent != parent
+                votes += bool(vote) and ag.vote_to_parent is None
+
+        t0 = clock_ns()
+        if not shared:
+            for ag in agents.values():
+                update_agent_phase_state(ag, r, agents)
+        else:
+            clock += 1
+            if clock >= duration:
+                clock = 0
+                end_phase_all(agents)
+        phase_ns += clock_ns() - t0
+
+        if leader.is_leader:
+            result = (leader.id, r + 1, False)
+            break
+    if shared and result[2]:
+        for ag in agents.values():
+            ag.rounds_in_current_phase = clock
+
+    counters["move_ns"] += move_ns
+    counters["bucket_ns"] += bucket_ns
+    counters["exchange_ns"] += exchange_ns
+    counters["phase_ns"] += phase_ns
+    counters["rounds"] += r + 1
+    counters["meetings"] += meetings
+    counters["meeting_agents"] += meeting_agents
+    counters["max_meeting"] = max(counters["max_meeting"], max_meeting)
+    counters["parent_changes"] += parent_changes
+    counters["votes"] += votes
+    counters["phase_ends"] += sum(ag.phase_index for ag in agents.values()) - phases_before
+    return result
+
+
+# ─────────────────────  Event-driven fast-forward  ─────────────────────────
+# An agent only ever steps to a neighbour and back, so outside an excursion it
+# is always on its start ("rest") node.  Where every agent stands in round r
+# therefore depends only on r mod phase_duration (= 2·Δ·bit_width, one full
+# pass over all ID bits and ports), and the meetings of a phase form a fixed
+# schedule.  Rounds without meetings change nothing but the phase counter and
+# edge_traversals, both of which can be applied in bulk.
+def _meeting_schedule(ports: PortGraph, agents: Dict[int, Agent]) -> List[Tuple[int, List[List[Agent]]]]:
+    """``(slot, groups)`` for every slot of a phase in which agents share a node."""
+    sample = next(iter(agents.values()))
+    delta, width, duration = sample.delta, sample.bit_width, sample.phase_duration
+
+    at_rest: Dict[int, List[Agent]] = {}
+    for ag in agents.values():
+        at_rest.setdefault(ag.current_node, []).append(ag)
+    rest_groups = [grp for grp in at_rest.values() if len(grp) > 1]
+    if delta == 0:
+        return [(0, rest_groups)] if rest_groups else []
+
+    cycle = 2 * delta
+    schedule = []
+    for slot in range(duration):
+        port_k, in_out = divmod(slot % cycle, 2)
+        if in_out == 1:
+            if rest_groups:
+                schedule.append((slot, rest_groups))
+            continue
+        bit_idx = slot // cycle
+        away: Dict[int, List[Agent]] = {}
+        for ag in agents.values():
+            if ag.id_bits[bit_idx]:
+                dest = ports.neighbor(ag.current_node, port_k)
+                if dest is not None:
+                    away.setdefault(dest, []).append(ag)
+        if not away:
+            if rest_groups:
+                schedule.append((slot, rest_groups))
+            continue
+        gone = {ag.id for grp in away.values() for ag in grp}
+        groups = []
+        for node in at_rest.keys() | away.keys():
+            here = [ag for ag in at_rest.get(node, ()) if ag.id not in gone]
+            here += away.get(node, ())
+            if len(here) > 1:
+                groups.append(here)
+        if groups:
+            schedule.append((slot, groups))
+    return schedule
+
+
+def _excursions(ports: PortGraph, ag: Agent, rounds: int) -> int:
+    """Edge traversals of a fresh agent over the first ``rounds`` rounds."""
+    if ag.delta == 0:
+        return 0
+    cycle = 2 * ag.delta
+    deg = ports.degree(ag.current_node)
+    per_block = min(deg, ag.delta)
+    full, rest = divmod(rounds, ag.phase_duration)
+    moves = full * sum(ag.id_bits[:ag.bit_width]) * per_block
+    blocks, tail = divmod(rest, cycle)
+    moves += sum(ag.id_bits[:blocks]) * per_block
+    if tail and ag.id_bits[blocks % ag.bit_width]:
+        moves += min(deg, (tail + 1) // 2)
+    return moves
+
+
+def _run_event_driven(ports: PortGraph,
+                      agents: Dict[int, Agent],
+                      global_max: int,
+                      max_rounds: int,
+                      deadline: Optional[float] = None) -> Tuple[Optional[int], int, bool]:
+    sample = next(iter(agents.values()))
+    for ag in agents.values():
+        if ag.pending_return or ag.rounds_in_current_phase:
+            raise ValueError("event-driven election needs agents at the start of a phase")
+        if (ag.delta, ag.bit_width) != (sample.delta, sample.bit_width):
+            raise ValueError("event-driven election needs a common delta and bit width")
+
+    duration = sample.phase_duration
+    schedule = _meeting_schedule(ports, agents)
+    leader = agents[global_max]
+    result: Tuple[Optional[int], int, bool] = (None, max_rounds, True)
+    rounds = max_rounds
+    for base in range(0, max_rounds, duration):
+        if deadline is not None and time.monotonic() > deadline:
+            rounds = base
+            result = (None, rounds, True)
+            break
+        for slot, groups in schedule:
+            if base + slot >= max_rounds:
+                break
+            exchange_and_update_state(dict(enumerate(groups)), agents)
+        if base + duration > max_rounds:
+            break
+        end_phase_all(agents)
+        if leader.is_leader:
+            rounds = base + duration
+            result = (leader.id, rounds, False)
+            break
+
+    # bulk bookkeeping for the skipped rounds; leave every agent where the
+    # round-by-round loop would have left it after the last round
+    last = rounds - 1
+    for ag in agents.values():
+        ag.edge_traversals += _excursions(ports, ag, rounds)
+        ag.rounds_in_current_phase = rounds % duration
+        if ag.delta == 0 or last < 0:
+            continue
+        port_k, in_out = divmod(last % (2 * ag.delta), 2)
+        bit = ag.id_bits[(last // (2 * ag.delta)) % ag.bit_width]
+        dest = ports.neighbor(ag.current_node, port_k)
+        if in_out == 0 and bit and dest is not None:
+            ag.origin_node, ag.current_node = ag.current_node, dest
+            ag.pending_return = True
+    return result
 
 
 # ───────────────────  Scatter helper  ────────────────────────────────────────
-def scatter_one_agent_per_node(G: nx.Graph, seed: int = 0) -> Dict[int, Agent]:
-    rng   = random.Random(_pyseed(seed))
-    nodes = list(G.nodes())
-    if not nodes:
-        return {}
-    ids   = list(range(1, len(nodes) + 1))
+def scatter_ids(num_nodes: int, seed: int = 0) -> List[int]:
+    """IDs 1..n in the order they are placed on ``G.nodes()`` by the scatter helper."""
+    rng = random.Random(_pyseed(seed))
+    ids = list(range(1, num_nodes + 1))
     rng.shuffle(ids)
+    return ids
+
+
+def id_bit_width(num_nodes: int) -> int:
+    return math.ceil(math.log2(num_nodes)) if num_nodes > 1 else 1
+
 
-    width = math.ceil(math.log2(len(nodes))) if len(nodes) > 1 else 1
+def scatter_one_agent_per_node(G: nx.Graph, seed: int = 0) -> Dict[int, Agent]:
+    if not G:
+        return {}
     delta = G.graph.get("delta", max(dict(G.degree()).values()))
     G.graph["delta"] = delta
+    return scatter_agents(list(G.nodes()), delta, seed)
+
+
+def scatter_agents(nodes: Sequence, delta: int, seed: int = 0) -> Dict[int, Agent]:
+    """One agent per node of ``nodes`` (a graph of max degree ``delta``),
+    placed as `scatter_one_agent_per_node` places them."""
+    if not nodes:
+        return {}
+    ids   = scatter_ids(len(nodes), seed)
+    width = id_bit_width(len(nodes))
 
     agents: Dict[int, Agent] = {}
     for node, aid in zip(nodes, ids):
@@ -333,6 +673,8 @@ def build_graph(kind: str, n: int, seed: int, param: int = 3) -> nx.Graph:
     def _connected(g: nx.Graph) -> bool:
         return n <= 1 or nx.is_connected(g)
 
+    rng = random.Random(_pyseed(seed))  # joins components; the global RNG is unseeded
+
     if kind == "regular":
         d = param  # Degree for regular graph
         if d >= n or (n * d) % 2:
@@ -350,8 +692,8 @@ def build_graph(kind: str, n: int, seed: int, param: int = 3) -> nx.Graph:
                 # Connect components by adding edges between them
                 for i in range(len(components) - 1):
                     # Pick one node from each component
-                    node1 = random.choice(list(components[i]))
-                    node2 = random.choice(list(components[i + 1]))
+                    node1 = rng.choice(list(components[i]))
+                    node2 = rng.choice(list(components[i + 1]))
                     G.add_edge(node1, node2)
 
 
@@ -370,8 +712,8 @@ def build_graph(kind: str, n: int, seed: int, param: int = 3) -> nx.Graph:
                 # Connect components by adding edges between them
                 for i in range(len(components) - 1):
                     # Pick one node from each component
-                    node1 = random.choice(list(components[i]))
-                    node2 = random.choice(list(components[i + 1]))
+                    node1 = rng.choice(list(components[i]))
+                    node2 = rng.choice(list(components[i + 1]))
                     G.add_edge(node1, node2)
 
     elif kind == "grid":
@@ -0,0 +1,539 @@
+from __future__ import annotations
+import copy
+import random
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import networkx as nx
+import numpy as np
+
+from port_graph import PortGraph
+from agent_election import (Agent, scatter_ids, id_bit_width, id_to_bits,
+                            DEADLINE_CHECK_ROUNDS, _pyseed)
+
+# Vote encoding used by the array engine (Agent.vote_to_parent / incoming_votes)
+NO_VOTE, VOTE_YES, VOTE_UNDECIDED = 0, 1, 2
+_VOTE_STR = {NO_VOTE: None, VOTE_YES: "yes", VOTE_UNDECIDED: "undecided"}
+_VOTE_CODE = {v: k for k, v in _VOTE_STR.items()}
+
+# (leader, rounds, timeout, per-agent edge traversals in ascending ID order)
+BatchResult = Tuple[Optional[int], int, bool, np.ndarray]
+
+
+# ──────────────────────────────  Graph helpers  ──────────────────────────────
+def port_table(G: Union[nx.Graph, PortGraph], width: int = 0) -> Tuple[List, Dict, np.ndarray]:
+    """Dense port→neighbour table of a port-labelled graph.
+
+    Returns ``(nodes, index, table)`` where ``table[i, p]`` is the index of the
+    node reached from ``nodes[i]`` through port ``p`` (``-1`` if the port does
+    not exist).  ``G`` is a networkx graph or already a `PortGraph`; the table
+    has at least ``width`` columns.
+    """
+    ports = G if isinstance(G, PortGraph) else PortGraph.from_networkx(G)
+    offsets = np.frombuffer(ports.offsets, dtype=np.int64)
+    degree = np.diff(offsets)
+    delta = max(int(degree.max(initial=0)), width, 1)
+    table = np.full((len(ports), delta), -1, dtype=np.int32)
+    rows = np.repeat(np.arange(len(ports)), degree)
+    cols = np.arange(len(ports.nbr)) - np.repeat(offsets[:-1], degree)
+    table[rows, cols] = np.frombuffer(ports.nbr, dtype=np.intc)
+    return ports.labels, ports.index, table
+
+
+def _python_mt(seed: int) -> np.random.MT19937:
+    """MT19937 bit generator in the state of ``random.Random(seed)``."""
+    state = random.Random(seed).getstate()[1]
+    bg = np.random.MT19937()
+    bg.state = {"bit_generator": "MT19937",
+                "state": {"key": np.array(state[:-1], dtype=np.uint32),
+                          "pos": state[-1]}}
+    return bg
+
+
+def neighbour_csr(G: nx.Graph) -> Tuple[List, np.ndarray, np.ndarray]:
+    """``(nodes, offsets, nbr)``: G's adjacency in ``G.neighbors`` order as CSR
+    (node ``i`` owns ``nbr[offsets[i]:offsets[i+1]]``, node indices into
+    ``nodes``)."""
+    nodes = list(G.nodes())
+    index = {u: i for i, u in enumerate(nodes)}
+    offsets = np.concatenate(([0], np.cumsum([len(G[u]) for u in nodes], dtype=np.int64)))
+    nbr = np.fromiter((index[v] for u in nodes for v in G.neighbors(u)),
+                      dtype=np.int32, count=int(offsets[-1]))
+    return nodes, offsets, nbr
+
+
+def shuffled_ports(degree: np.ndarray, seeds: Sequence[int]) -> np.ndarray:
+    """Ports ``randomize_ports(G, seed)`` gives every neighbour slot of a graph
+    with these degrees, for each seed: shape (len(seeds), degree.sum()).
+
+    ``random.shuffle`` is replayed exactly on the raw MT19937 stream of
+    ``random.Random(seed)``: the swap targets are drawn per labelling, then
+    the swaps themselves are applied to all labellings and all nodes at once,
+    one position at a time (O(Δ) array steps).
+    """
+    degree = np.asarray(degree, dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(degree)))
+
+    # Fisher-Yates steps of all nodes in stream order: node, position i and
+    # the draw j = randbelow(i + 1) that position is swapped with
+    step_node = np.repeat(np.arange(len(degree)), np.maximum(degree - 1, 0))
+    step_i = np.concatenate([np.arange(d - 1, 0, -1) for d in degree.tolist()] + [[]]).astype(np.int64)
+    bounds = (step_i + 1).tolist()
+    j = np.array([_randbelow_steps(_python_mt(_pyseed(s)), bounds) for s in seeds],
+                 dtype=np.int64).reshape(len(seeds), len(bounds))
+
+    runs = len(seeds)
+    rows = np.arange(runs)[:, None]
+    ports = np.tile(np.arange(offsets[-1], dtype=np.int64) - np.repeat(offsets[:-1], degree),
+                    (runs, 1))
+    # swaps at position i of different nodes are independent, so replay them
+    # for all nodes at once, from the highest position down
+    for i in range(int(degree.max(initial=0)) - 1, 0, -1):
+        sel = np.flatnonzero(step_i == i)
+        a = offsets[step_node[sel]] + i
+        b = offsets[step_node[sel]] + j[:, sel]
+        swap = ports[rows, a].copy()
+        ports[rows, a] = ports[rows, b]
+        ports[rows, b] = swap
+    return ports.astype(np.int32)
+
+
+def _randbelow_steps(stream: np.random.MT19937, bounds: List[int]) -> List[int]:
+    """``random.Random._randbelow(b)`` for every bound ``b`` in turn.
+
+    A draw is ``getrandbits(k)`` -- the top ``k = b.bit_length()`` bits of one
+    raw 32-bit output -- repeated while it is ``>= b``.  Where a draw starts
+    depends on every earlier rejection, so this is a scan per stream.
+    """
+    chunk = 2 * len(bounds) + 64
+    raw = stream.random_raw(chunk).tolist()
+    out = []
+    p = 0
+    for b in bounds:
+        shift = 32 - b.bit_length()
+        while True:
+            if p == len(raw):
+                raw += stream.random_raw(chunk).tolist()
+            r = raw[p] >> shift
+            p += 1
+            if r < b:
+                break
+        out.append(r)
+    return out
+
+
+def random_port_labelings(G: nx.Graph,
+                          seeds: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Port labellings of ``randomize_ports(G, seed)`` for many seeds at once.
+
+    Returns ``(offsets, nbr, ports)``: the `neighbour_csr` slots of G and
+    ``ports`` of shape (len(seeds), slots) with the port each labelling gives
+    every slot (see `shuffled_ports`).  Nothing is written to ``G``.
+    """
+    nodes, offsets, nbr = neighbour_csr(G)
+    degree = np.diff(offsets)
+    ports = shuffled_ports(degree, seeds)
+
+    # randomize_ports keeps an existing single-port map
+    for u in np.flatnonzero(degree == 1).tolist():
+        pm = G.nodes[nodes[u]].get("port_map")
+        if pm:
+            ports[:, offsets[u]] = next(iter(pm))
+    return offsets, nbr, ports
+
+
+def labelled_port_tables(offsets: np.ndarray, nbr: np.ndarray,
+                         ports: np.ndarray, width: int = 0) -> np.ndarray:
+    """`port_table` of each labelling in ``ports`` (rows as returned by
+    `shuffled_ports`), shape (len(ports), n, max(Δ, width, 1))."""
+    degree = np.diff(offsets)
+    delta = max(int(degree.max(initial=0)), width, 1)
+    tables = np.full((len(ports), len(degree), delta), -1, dtype=np.int32)
+    owner = np.repeat(np.arange(len(degree)), degree)
+    tables[np.arange(len(ports))[:, None], owner, ports] = nbr
+    return tables
+
+
+def random_port_tables(G: nx.Graph, seeds: Sequence[int], width: int = 0) -> np.ndarray:
+    """`port_table` of ``randomize_ports(G, seed)`` for every seed, shape
+    (len(seeds), n, max(Δ, width, 1)), without touching ``G``."""
+    return labelled_port_tables(*random_port_labelings(G, seeds), width)
+
+
+def agent_homes(n: int, agent_seeds: Sequence[int]) -> np.ndarray:
+    """Start nodes of ``scatter_one_agent_per_node`` for each seed, shape
+    (len(agent_seeds), n): ``homes[i, j]`` hosts the agent with ID ``j + 1``."""
+    homes = np.empty((len(agent_seeds), n), dtype=np.int64)
+    for i, ag in enumerate(agent_seeds):
+        homes[i, np.array(scatter_ids(n, ag)) - 1] = np.arange(n)
+    return homes
+
+
+def prepare_runs(G0: nx.Graph,
+                 port_seeds: Sequence[int],
+                 agent_seeds: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Port tables and agent placements for several runs on one base graph.
+
+    Run ``i`` gets the labelling of ``randomize_ports(G, port_seeds[i])`` and
+    the placement of ``scatter_one_agent_per_node(G, agent_seeds[i])``.
+    Returns ``tables`` of shape (runs, n, Δ) and ``homes`` of shape
+    (runs, n) where ``homes[i, j]`` is the start node of the agent with ID
+    ``j + 1``.
+    """
+    delta = G0.graph.get("delta", max(dict(G0.degree()).values(), default=0))
+    return (random_port_tables(G0, port_seeds, delta),
+            agent_homes(G0.number_of_nodes(), agent_seeds))
+
+
+# ───────────────────────────────  Agent arrays  ──────────────────────────────
+class ElectionArrays:
+    """Struct-of-arrays election state for R runs of the same k agent IDs.
+
+    Every per-agent field is an (R, k) array with agents in ascending ID
+    order, so "smallest ID" comparisons in the exchange step become
+    "smallest index" comparisons.  Parent pointers are agent indices within
+    the run (``-1`` for ``None``); node references index the run's port table.
+    """
+
+    _ROW_FIELDS = ("tables", "run", "cur", "origin", "pending", "known",
+                   "parent", "last_parent", "vote", "stable", "undecided",
+                   "phase_index", "traversals", "aware", "is_leader",
+                   "delivered_to", "delivered_vote")
+
+    def __init__(self, ids: np.ndarray, delta: int, bit_width: int,
+                 tables: np.ndarray, cur: np.ndarray) -> None:
+        runs, k = cur.shape
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.delta = delta
+        self.bit_width = bit_width
+        self.phase_duration = max(1, 2 * delta * bit_width)
+        self.phase_clock = 0
+        self.bits = np.array([id_to_bits(int(i), bit_width) for i in self.ids],
+                             dtype=bool).reshape(k, -1)
+        # bit-1 agents for every bit index of the movement schedule
+        self.movers_by_bit = [np.flatnonzero(self.bits[:, b]) for b in range(self.bits.shape[1])]
+
+        self.starts_distinct = False
+        self.tables = tables
+        self.run = np.arange(runs)
+        self.rows = self.run[:, None]
+        self.cur = np.array(cur, dtype=np.int64)
+        self.origin = np.full((runs, k), -1, dtype=np.int64)
+        self.pending = np.zeros((runs, k), dtype=bool)
+        self.known = np.tile(self.ids, (runs, 1))
+        self.parent = np.full((runs, k), -1, dtype=np.int64)
+        self.last_parent = np.full((runs, k), -1, dtype=np.int64)
+        self.vote = np.zeros((runs, k), dtype=np.int8)
+        self.stable = np.zeros((runs, k), dtype=np.int64)
+        self.undecided = np.zeros((runs, k), dtype=np.int64)
+        self.phase_index = np.zeros((runs, k), dtype=np.int64)
+        self.traversals = np.zeros((runs, k), dtype=np.int64)
+        self.aware = np.zeros((runs, k), dtype=bool)
+        self.is_leader = np.zeros((runs, k), dtype=bool)
+        # votes received this phase, keyed by the *sender*: a child delivers at
+        # most one vote per phase since delivery clears its vote_to_parent
+        self.delivered_to = np.full((runs, k), -1, dtype=np.int64)
+        self.delivered_vote = np.zeros((runs, k), dtype=np.int8)
+
+    @classmethod
+    def from_agents(cls, agents: Dict[int, Agent], index: Dict,
+                    table: np.ndarray) -> "ElectionArrays":
+        """Single-run (R = 1) state loaded from existing `Agent` objects."""
+        ids = sorted(agents)
+        order = [agents[i] for i in ids]
+        rank = {aid: i for i, aid in enumerate(ids)}
+        first = order[0]
+        if any(a.delta != first.delta or a.bit_width != first.bit_width for a in order):
+            raise ValueError("vectorised engine needs a common delta and bit width for all agents")
+        if any(a.rounds_in_current_phase != first.rounds_in_current_phase for a in order):
+            raise ValueError("vectorised engine needs agents with a common phase clock")
+
+        def _opt(x, m):
+            return -1 if x is None else m[x]
+
+        st = cls(np.array(ids), first.delta, first.bit_width, table[None],
+                 np.array([[index[a.current_node] for a in order]]))
+        st.bits = np.array([a.id_bits[:max(1, first.bit_width)] for a in order],
+                           dtype=bool).reshape(len(order), -1)
+        st.movers_by_bit = [np.flatnonzero(st.bits[:, b]) for b in range(st.bits.shape[1])]
+        st.phase_clock = first.rounds_in_current_phase
+        for name, values in (
+            ("origin",      [_opt(a.origin_node, index) for a in order]),
+            ("pending",     [a.pending_return for a in order]),
+            ("known",       [a.known_max_id for a in order]),
+            ("parent",      [_opt(a.parent, rank) for a in order]),
+            ("last_parent", [_opt(a._parent_last_phase, rank) for a in order]),
+            ("vote",        [_VOTE_CODE[a.vote_to_parent] for a in order]),
+            ("stable",      [a.parent_stable_phases for a in order]),
+            ("undecided",   [a.undecided_phases_left for a in order]),
+            ("phase_index", [a.phase_index for a in order]),
+            ("traversals",  [a.edge_traversals for a in order]),
+            ("aware",       [a.aware_of_leader for a in order]),
+            ("is_leader",   [a.is_leader for a in order]),
+        ):
+            getattr(st, name)[0] = values
+        for p, a in enumerate(order):
+            for c, v in a.incoming_votes.items():
+                if c in rank:
+                    st.delivered_to[0, rank[c]] = p
+                    st.delivered_vote[0, rank[c]] = _VOTE_CODE[v]
+        return st
+
+    def select(self, rows: np.ndarray) -> "ElectionArrays":
+        """Copy of the state restricted to the given runs (boolean mask or indices)."""
+        st = copy.copy(self)
+        for name in self._ROW_FIELDS:
+            setattr(st, name, getattr(self, name)[rows])
+        st.rows = np.arange(len(st.run))[:, None]
+        return st
+
+    def write_back(self, agents: Dict[int, Agent], nodes: List) -> None:
+        """Store run 0 back into the `Agent` objects it was loaded from."""
+        ids = [int(i) for i in self.ids]
+
+        def _opt(x, m):
+            return None if x < 0 else m[x]
+
+        children: Dict[int, set] = {aid: set() for aid in ids}
+        for c, p in enumerate(self.parent[0]):
+            if p >= 0:
+                children[ids[p]].add(ids[c])
+        votes: Dict[int, Dict[int, str]] = {aid: {} for aid in ids}
+        for c, p in enumerate(self.delivered_to[0]):
+            if p >= 0:
+                votes[ids[p]][ids[c]] = _VOTE_STR[int(self.delivered_vote[0, c])]
+
+        for i, aid in enumerate(ids):
+            a = agents[aid]
+            a.current_node = nodes[self.cur[0, i]]
+            a.origin_node = _opt(self.origin[0, i], nodes)
+            a.pending_return = bool(self.pending[0, i])
+            a.known_max_id = int(self.known[0, i])
+            a.parent = _opt(self.parent[0, i], ids)
+            a._parent_last_phase = _opt(self.last_parent[0, i], ids)
+            a.children = children[aid]
+            a.incoming_votes = votes[aid]
+            a.vote_to_parent = _VOTE_STR[int(self.vote[0, i])]
+            a.parent_stable_phases = int(self.stable[0, i])
+            a.undecided_phases_left = int(self.undecided[0, i])
+            a.phase_index = int(self.phase_index[0, i])
+            a.rounds_in_current_phase = self.phase_clock
+            a.edge_traversals = int(self.traversals[0, i])
+            a.aware_of_leader = bool(self.aware[0, i])
+            a.is_leader = bool(self.is_leader[0, i])
+
+
+# ──────────────────  Mobility: “bit‑controlled schedule”  ─────────────────
+def move_all(st: ElectionArrays, round_idx: int) -> None:
+    """Array version of `agent_election.decide_and_move` for every agent."""
+    if st.delta == 0:
+        return
+    cycle = 2 * st.delta
+    port_k, in_out = divmod(round_idx % cycle, 2)
+
+    if in_out == 1:
+        back = st.pending & (st.origin >= 0)
+        np.copyto(st.cur, st.origin, where=back)
+        np.copyto(st.origin, -1, where=back)
+        st.pending &= ~back
+        return
+
+    m = st.movers_by_bit[(round_idx // cycle) % st.bit_width]
+    if not len(m):
+        return
+    cur = st.cur[:, m]
+    dest = st.tables[st.rows, cur, port_k]
+    ok = (dest >= 0) & ~st.pending[:, m]
+    st.origin[:, m] = np.where(ok, cur, st.origin[:, m])
+    st.cur[:, m] = np.where(ok, dest, cur)
+    st.pending[:, m] |= ok
+    st.traversals[:, m] += ok
+
+
+# ─────────────────  Message exchange (every round) ─────────────────
+def exchange_all(st: ElectionArrays) -> None:
+    """Array version of `agent_election.exchange_and_update_state`.
+
+    Co-located agents are found by sorting (run, node) keys; nothing happens
+    in rounds where every agent is alone on its node.  Flat indices
+    ``run * k + agent`` address the (R, k) arrays.
+    """
+    # an agent that is not away is always on its start node, so once the
+    # start nodes are known to be pairwise distinct, all-home rounds are idle
+    if st.starts_distinct and not st.pending.any():
+        return
+    runs, k = st.cur.shape
+    key = (st.cur + st.rows * st.tables.shape[1]).ravel()
+    order = np.argsort(key, kind="stable")
+    pos = key[order]
+    boundary = np.empty(len(pos), dtype=bool)
+    boundary[0] = True
+    np.not_equal(pos[1:], pos[:-1], out=boundary[1:])
+    if boundary.all():
+        st.starts_distinct |= not st.pending.any()
+        return
+    starts = np.flatnonzero(boundary)
+    sizes = np.diff(np.append(starts, len(pos)))
+
+    # broadcast highest known_id; the smallest broadcaster becomes parent
+    known = st.known.take(order)
+    local_max = np.repeat(np.maximum.reduceat(known, starts), sizes)
+    broadcaster = known == local_max
+    first_bc = np.minimum.reduceat(np.where(broadcaster, order, len(order)), starts)
+    np.put(st.known, order, local_max)
+    followers = ~broadcaster
+    np.put(st.parent, order[followers], np.repeat(first_bc, sizes)[followers] % k)
+
+    # child→parent vote delivery
+    voters = np.flatnonzero((st.vote != NO_VOTE) & (st.parent >= 0))
+    if len(voters):
+        parents = st.parent.take(voters)
+        here = st.cur.take(voters - voters % k + parents) == st.cur.take(voters)
+        voters, parents = voters[here], parents[here]
+        np.put(st.delivered_to, voters, parents)
+        np.put(st.delivered_vote, voters, st.vote.take(voters))
+        np.put(st.vote, voters, NO_VOTE)
+
+
+# ─────────────────────  Phase‑state updates ───────────────────────────────
+def end_phase_all(st: ElectionArrays) -> None:
+    """Array version of the phase-boundary branch of `update_agent_phase_state`."""
+    runs, k = st.cur.shape
+    st.phase_index += 1
+
+    # track parent stability
+    same = (st.parent == st.last_parent) & (st.parent >= 0)
+    st.stable = np.where(same, st.stable + 1, 0)
+    st.last_parent = st.parent.copy()
+
+    # if already learned leader → just keep informing
+    st.vote[st.aware] = NO_VOTE
+    promote = st.is_leader & ~st.aware
+    st.aware |= promote
+    live = ~st.aware & ~st.is_leader & ~promote
+
+    proposal = live & (st.phase_index == 0)
+    undecided = live & ~proposal & (st.undecided > 0)
+    waiting = live & ~proposal & ~undecided
+
+    ready = proposal & (st.stable >= 2) & (st.parent >= 0)
+    st.undecided[ready] = 2
+    st.vote[ready] = VOTE_UNDECIDED
+    st.undecided[undecided] -= 1
+    st.vote[undecided] = VOTE_UNDECIDED
+
+    # per-recipient counts over flat indices run * k + agent
+    base = (np.arange(runs) * k)[:, None]
+    size = runs * k
+    has_parent = st.parent >= 0
+    nchild = np.bincount((st.parent + base)[has_parent], minlength=size).reshape(runs, k)
+    yes = has_parent & (st.delivered_to == st.parent) & (st.delivered_vote == VOTE_YES)
+    nyes = np.bincount((st.parent + base)[yes], minlength=size).reshape(runs, k)
+    und = (st.delivered_to >= 0) & (st.delivered_vote == VOTE_UNDECIDED)
+    any_und = np.bincount((st.delivered_to + base)[und], minlength=size).reshape(runs, k) > 0
+    ok = (nchild > 0) & (nyes == nchild) & ~any_und
+    ok |= nchild == 0   # leaves always vote yes
+
+    st.vote[waiting] = np.where(ok[waiting], VOTE_YES, VOTE_UNDECIDED)
+    win = waiting[:, -1] & ok[:, -1]    # the global max ID is the last agent
+    st.is_leader[win, -1] = True
+    st.aware[win, -1] = True
+    st.vote[win, -1] = NO_VOTE
+
+    # clear for next phase (votes held by aware agents are never read again)
+    st.delivered_to[:] = -1
+    st.delivered_vote[:] = NO_VOTE
+
+
+def _advance(st: ElectionArrays, start: int, max_rounds: int,
+             deadline: Optional[float] = None) -> Tuple[int, np.ndarray]:
+    """Run rounds ``start..`` until some run elects its leader, the cap is hit
+    or ``deadline`` (a `time.monotonic` value) passes.
+
+    Returns the number of completed rounds and the mask of runs that finished.
+    """
+    duration = st.phase_duration
+    for r in range(start, max_rounds):
+        if deadline is not None and not r % DEADLINE_CHECK_ROUNDS and time.monotonic() > deadline:
+            return r, np.zeros(len(st.run), dtype=bool)
+        move_all(st, r)
+        exchange_all(st)
+        st.phase_clock += 1
+        if st.phase_clock < duration:
+            continue
+        st.phase_clock = 0
+        end_phase_all(st)
+        won = st.is_leader[:, -1]
+        if won.any():
+            return r + 1, won
+    return max_rounds, np.zeros(len(st.run), dtype=bool)
+
+
+# ─────────────────────────────  Main election loop  ─────────────────────────
+def run_leader_election_np(G: Union[nx.Graph, PortGraph],
+                           agents: Dict[int, Agent],
+                           max_rounds: int = 200_000,
+                           deadline: Optional[float] = None
+                          ) -> Tuple[Optional[int], int, bool]:
+    """Drop-in replacement for `agent_election.run_leader_election`.
+
+    Same rounds, leader and per-agent ``edge_traversals``; the final agent
+    state is written back into ``agents``.  ``deadline`` as there.
+    """
+    if not agents:
+        return None, 0, False
+
+    global_max = max(agents)
+    for ag in agents.values():
+        ag.global_max_id = global_max
+        ag.phase_duration = max(1, 2 * ag.delta * ag.bit_width)
+
+    if len(agents) == 1:
+        only = next(iter(agents.values()))
+        only.is_leader = True
+        return only.id, 0, False
+
+    nodes, index, table = port_table(G, max(a.delta for a in agents.values()))
+    st = ElectionArrays.from_agents(agents, index, table)
+    rounds, won = _advance(st, 0, max_rounds, deadline)
+    st.write_back(agents, nodes)
+    if won[0]:
+        return global_max, rounds, False
+    return None, rounds, True
+
+
+def run_leader_election_batch(tables: np.ndarray,
+                              homes: np.ndarray,
+                              delta: int,
+                              max_rounds: int = 200_000,
+                              deadline: Optional[float] = None
+                             ) -> List[BatchResult]:
+    """Run R independent elections on the same base graph in one array pass.
+
+    ``tables`` and ``homes`` are as returned by `prepare_runs`: run ``i``
+    places the agent with ID ``j + 1`` on node ``homes[i, j]`` of the port
+    table ``tables[i]``.  Runs that elect their leader are dropped from the
+    arrays while the others continue.  Each run's result equals that of
+    `agent_election.run_leader_election` on the same labelling and placement.
+    Past ``deadline`` the runs still going stop with ``rounds < max_rounds``.
+    """
+    runs, k = homes.shape
+    if k == 0:
+        return [(None, 0, False, np.zeros(0, dtype=np.int64))] * runs
+    if k == 1:
+        return [(1, 0, False, np.zeros(1, dtype=np.int64))] * runs
+
+    st = ElectionArrays(np.arange(1, k + 1), delta, id_bit_width(tables.shape[1]),
+                        tables, homes)
+    results: List[Optional[BatchResult]] = [None] * runs
+    r = 0
+    while len(st.run) and r < max_rounds:
+        r, won = _advance(st, r, max_rounds, deadline)
+        if not won.any():
+            break
+        for i in np.flatnonzero(won):
+            results[st.run[i]] = (k, r, False, st.traversals[i].copy())
+        st = st.select(~won)
+    for i, run in enumerate(st.run):
+        results[run] = (None, r, True, st.traversals[i].copy())
+    return results
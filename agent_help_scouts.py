@@ -1,154 +1,75 @@
 from typing import List
-import copy
+
+from port_graph import PORT_GRAPH_KEY, attach_port_graph
+from sorted_ids import IDUnion, SortedIDs
+from trace_recorder import RECORD_LEVELS, TraceRecorder
 
 BOTTOM = None
 PORT_ONE = 0
 
-class SIM_DATA:
-    def __init__(self):
-        self.all_positions = []
-        self.all_statuses = []
-        self.all_node_states = []
-        self.all_homes = []
-        self.all_tree_edges = []
-        self.rounds = 0
-    def clearr(self):
-        self.all_positions = []
-        self.all_statuses = []
-        self.all_node_states = []
-        self.all_homes = []
-        self.all_tree_edges = []
-        self.rounds = 0
-
-simmer = SIM_DATA()
-
-def _compute_tree_edges(G, arr):
-    edges = []
-    seen = set()
-    for a in arr:
-        if a.state not in ("settled", "settledScout"):
-            continue
-        if a.home is None or a.home is BOTTOM:
-            continue
-        if a.parentPort is None or a.parentPort is BOTTOM:
-            continue
+# trace of the running simulation (see `run_simulation`); None if not recorded
+simmer = None
+# P1Tree of the running simulation, kept by `_touch`
+p1tree = None
+# indexes of the running simulation, kept by `_touch` and `_step`: home vertex
+# -> ID of its owner (the agent settled there), and node -> IDs of the agents
+# there that `_xi_id` counts as settled at it, bar those attached to the group
+_owners = {}
+_settled_at = {}
+# the scouts of the running simulation, moved as one (see `_Group`)
+_group = None
+
+
+def _trace_cell(ports, names, a):
+    """What the trace shows of agent ``a``: position, status, home and the
+    tree edge to its parent (None unless it is settled with a parent);
+    ``names`` maps node labels to their strings."""
+    edge = None
+    if a.state in ("settled", "settledScout") and a.home is not BOTTOM and a.parentPort is not BOTTOM:
         u = int(a.home) if str(a.home).isdigit() else a.home
-        v = _port_neighbor(G, u, a.parentPort)
-        key = (min(u, v), max(u, v))
-        if key in seen:
-            continue
-        seen.add(key)
-        edges.append({
-            "u": str(u),
-            "v": str(v),
-            "srcPort": a.parentPort,
-            "dstPort": _port(G, v, u),
-        })
-    return edges
-
-def _snapshot(label, G, agents, round_number, agent_id=-1):
-    # print(label)
-    arr = [agents[k] for k in sorted(agents.keys())]
-    cur_positions = [[str(a.node)] for a in arr]
-    cur_statuses = [[str(a.state)] for a in arr]
-    cur_homes = [[str(a.home)] for a in arr]
-    cur_tree_edges = _compute_tree_edges(G, arr)
-    simmer.rounds = len(simmer.all_positions)
-
-    def _agent_index_in_arr(aid):
-        for i, a in enumerate(arr):
-            if a.ID == aid:
-                return i
-
-    def _get_agent_value(container, aid):
-        if isinstance(container, dict):
-            return container[aid]
-        if isinstance(container, (list, tuple)):
-            idx = _agent_index_in_arr(aid)
-            return container[idx]
-
-    def _set_agent_value(container, aid, value):
-        if isinstance(container, dict):
-            container[aid] = value
-            return container
-        if isinstance(container, list):
-            idx = _agent_index_in_arr(aid)
-            container[idx] = value
-            return container
-        if isinstance(container, tuple):
-            tmp = list(container)
-            idx = _agent_index_in_arr(aid)
-            tmp[idx] = value
-            return tuple(tmp)
-
-    def _update_label_at(idx, new_label):
-        simmer.all_positions[idx]   = (new_label, simmer.all_positions[idx][1])
-        simmer.all_statuses[idx]    = (new_label, simmer.all_statuses[idx][1])
-        simmer.all_node_states[idx] = (new_label, simmer.all_node_states[idx][1])
-        simmer.all_homes[idx]     = (new_label, simmer.all_homes[idx][1])
-        simmer.all_tree_edges[idx]      = (new_label, simmer.all_tree_edges[idx][1])
-
-    def _insert_new_round(new_label, base_positions, base_statuses, base_node_states, base_homes, base_tree_edges):
-        simmer.all_positions.append((new_label, base_positions))
-        simmer.all_statuses.append((new_label, base_statuses))
-        simmer.all_node_states.append((new_label, base_node_states))
-        simmer.all_homes.append((new_label, base_homes))
-        simmer.all_tree_edges.append((new_label, base_tree_edges))
-        simmer.rounds = len(simmer.all_positions)
-    
-    if round_number > simmer.rounds:
-        raise ValueError(f"round_number={round_number} > simmer.rounds={simmer.rounds}")
-
-    if agent_id == -1:
-        if round_number < simmer.rounds:
-            _update_label_at(round_number, label)
-            simmer.all_tree_edges[round_number]  = (label, cur_tree_edges)
-        elif round_number == simmer.rounds:
-            base_positions = copy.deepcopy(cur_positions)
-            base_statuses = copy.deepcopy(cur_statuses)
-            base_node_states = []
-            base_homes = copy.deepcopy(cur_homes)
-            base_tree_edges = copy.deepcopy(cur_tree_edges)
-            _insert_new_round(label, base_positions, base_statuses, base_node_states, base_homes, base_tree_edges)
-        return
-    
-    if round_number < simmer.rounds:
-        _update_label_at(round_number, label)
-        stored_positions = copy.deepcopy(simmer.all_positions[round_number][1])
-        stored_statuses  = copy.deepcopy(simmer.all_statuses[round_number][1])
-        stored_homes  = copy.deepcopy(simmer.all_homes[round_number][1])
-        new_agent_pos = _get_agent_value(cur_positions, agent_id)
-        new_agent_sta = _get_agent_value(cur_statuses, agent_id)
-        new_agent_hom = _get_agent_value(cur_homes, agent_id)
-        stored_positions = _set_agent_value(stored_positions, agent_id, new_agent_pos)
-        stored_statuses  = _set_agent_value(stored_statuses, agent_id, new_agent_sta)
-        stored_homes  = _set_agent_value(stored_homes, agent_id, new_agent_hom)
-        simmer.all_positions[round_number] = (label, stored_positions)
-        simmer.all_statuses[round_number]  = (label, stored_statuses)
-        simmer.all_homes[round_number]  = (label, stored_homes)
-        simmer.all_tree_edges[round_number]  = (label, cur_tree_edges)
-
-    elif round_number == simmer.rounds:
-        base_positions   = copy.deepcopy(cur_positions)
-        base_statuses    = copy.deepcopy(cur_statuses)
-        base_node_states = []
-        base_homes       = copy.deepcopy(cur_homes)
-        base_tree_edges = copy.deepcopy(cur_tree_edges)
-        new_agent_pos = _get_agent_value(cur_positions, agent_id)
-        new_agent_sta = _get_agent_value(cur_statuses, agent_id)
-        new_agent_hom = _get_agent_value(cur_homes, agent_id)
-        base_positions = _set_agent_value(base_positions, agent_id, new_agent_pos)
-        base_statuses  = _set_agent_value(base_statuses, agent_id, new_agent_sta)
-        base_homes  = _set_agent_value(base_homes, agent_id, new_agent_hom)
-        _insert_new_round(label, base_positions, base_statuses, base_node_states, base_homes, base_tree_edges)
-
-    
+        v = _port_neighbor(ports, u, a.parentPort)
+        edge = ((min(u, v), max(u, v)), names[u], names[v],
+                a.parentPort, ports.arrival_port(u, a.parentPort))
+    home = names[a.home] if a.home is not BOTTOM else str(a.home)
+    return names[a.node], str(a.state), home, edge
+
+
+def _snapshot(round_number, moved, label, *args):
+    # a new round records every agent; an earlier round only those that moved.
+    # The label is formatted only if the trace is read.
+    if simmer is not None:
+        simmer.snapshot(label, round_number, moved, args)
+
+
+def _settled_here(a):
+    return a.state == "settled" or (a.state == "settledScout" and a.home == a.node)
+
+
+def _index(a):
+    if a._group is None:    # the group's members are in no per-node index
+        here = _settled_at[a.node]
+        if _settled_here(a):
+            here.add(a.ID)
+        else:
+            here.discard(a.ID)
+    if a.home is not BOTTOM and a.state in ("settled", "settledScout"):
+        _owners.setdefault(a.home, a.ID)
+    p1tree.update(a)
+
+
+def _touch(a):
+    # a's state, home or parent changed
+    _index(a)
+    if simmer is not None:
+        simmer.touch(a.ID)
+
 
 class Agent:
     def __init__(self, id: int, start_node: int):
 
         self.ID = id
-        self.node = start_node
+        self._node = start_node
+        self._group = None          # the _Group it travels with, if attached
         self.state = "unsettled"
         self.home = BOTTOM
 
@@ -157,7 +78,7 @@ class Agent:
         self.parentID = BOTTOM
         self.parentPort = BOTTOM
         self.portAtParent = None
-        self.arrivalPort = BOTTOM
+        self._arrivalPort = BOTTOM
         self.vacatedNeighbor = False
 
         # DFS-head breadcrumbs (carried by the lowest-ID scout)
@@ -178,19 +99,104 @@ class Agent:
     def aid(self) -> int:
         return self.ID
 
+    # an attached agent is wherever its group is, having arrived as it did
+    @property
+    def node(self):
+        return self._node if self._group is None else self._group.node
+
+    @node.setter
+    def node(self, node):
+        self._node = node
+
+    @property
+    def arrivalPort(self):
+        return self._arrivalPort if self._group is None else self._group.arrivalPort
+
+    @arrivalPort.setter
+    def arrivalPort(self, port):
+        self._arrivalPort = port
+
+
+class _Group:
+    """The scouts (unsettled and vacated agents), which travel together.
+
+    A member with the group is attached: it takes the group's position and
+    arrival port and is in no per-node index, so the group moves in O(1)
+    however many it carries.  A member that walks off on its own (a probing
+    scout) or joins away from the group (a vacated parent) is loose, and
+    steps along and attaches at the next group move."""
+
+    def __init__(self, node):
+        self.node = node
+        self.arrivalPort = BOTTOM
+        self.loose = set()      # IDs of the members not attached
+
+
+def _join(a):
+    # a became a scout
+    if a._group is None:
+        _group.loose.add(a.ID)
 
-def _port(G, u, v):
-    return G[u][v][f"port_{u}"]
 
-def _port_neighbor(G, u, port=PORT_ONE):
-    pm = G.nodes[u]["port_map"]
-    if (port not in pm.keys()):
-        raise RuntimeError(f"tried to access port {port} at node {u}, ports = {pm.keys()}")
-    return pm[port]
+def _leave(G, a):
+    # a is no longer a scout; it stays where it is
+    if a._group is not None:
+        _detach(G, a)
+    _group.loose.discard(a.ID)
 
-def edge_type(G, u, v):
-    puv = _port(G, u, v)
-    pvu = _port(G, v, u)
+
+def _detach(G, a):
+    g, a._group = a._group, None
+    a._node, a._arrivalPort = g.node, g.arrivalPort
+    G.nodes[a._node]["agents"].add(a.ID)
+    if _settled_here(a):
+        _settled_at[a._node].add(a.ID)
+    g.loose.add(a.ID)
+
+
+def _attach(G, a):
+    G.nodes[a._node]["agents"].discard(a.ID)
+    _settled_at[a._node].discard(a.ID)
+    a._group = _group
+
+
+class P1Tree:
+    """The tree the settled agents span: per agent its parent and the port
+    at its own vertex leading there (``parentPort``), per agent its children
+    and the port at its vertex leading to each (their ``portAtParent``).
+    Follows the agents' own fields; `update` re-reads one agent."""
+
+    def __init__(self):
+        self.parent = {}      # aid -> (parent aid, parentPort)
+        self.children = {}    # aid -> {child aid: child's portAtParent}
+
+    def update(self, a):
+        old = self.parent.pop(a.ID, None)
+        if old is not None:
+            del self.children[old[0]][a.ID]
+        if a.parentID is not BOTTOM and a.home is not BOTTOM and a.state in ("settled", "settledScout"):
+            self.parent[a.ID] = (a.parentID, a.parentPort)
+            self.children.setdefault(a.parentID, {})[a.ID] = a.portAtParent
+
+    def neighbors(self, aid):
+        """``(agent, port at aid's vertex leading to its vertex)`` for the
+        parent of ``aid`` (first) and its children, in ID order."""
+        nbrs = [self.parent[aid]] if aid in self.parent else []
+        kids = self.children.get(aid)
+        if kids:
+            nbrs.extend(sorted(kids.items()))
+        return nbrs
+
+
+def _port_neighbor(ports, u, port=PORT_ONE):
+    v = ports.neighbor(u, port)
+    if v is None:
+        raise RuntimeError(f"tried to access port {port} at node {u}, ports = {list(range(ports.degree(u)))}")
+    return v
+
+def edge_type(ports, u, puv):
+    # type of the edge leaving u through port puv
+    pvu = ports.arrival_port(u, puv)
     u_is_1 = (puv == PORT_ONE)
     v_is_1 = (pvu == PORT_ONE)
     if u_is_1 and v_is_1:
@@ -215,8 +221,7 @@ def update_node_type_after_probe(G, x, psi_x, scout_results):
         psi_x.nodeType = "fullyVisited"
         return
     if psi_x.parentPort is not None:
-        parent_node = _port_neighbor(G, x, psi_x.parentPort)
-        parent_edge_type = edge_type(G, x, parent_node)
+        parent_edge_type = edge_type(G.graph[PORT_GRAPH_KEY], x, psi_x.parentPort)
         if parent_edge_type == "tpq" and all(r[1] == "tpq" for r in empty):
             psi_x.nodeType = "partiallyVisited"
             return
@@ -229,6 +234,7 @@ def reconfigure_if_needed(agents, psi_x, port_to_w, psi_w, arrival_port_at_w):
         psi_w.portAtParent = port_to_w
         psi_w.parentPort = arrival_port_at_w
         psi_w.nodeType = "visited"
+        _touch(psi_w)
 
 def _candidate_rank(scout_result):
     pxy, etype, ntype, _ = scout_result
@@ -244,61 +250,94 @@ def _candidate_rank(scout_result):
 
 
 def _xi_id(G, w, exclude_ids=None, agents=None):
-    # returns the ID of an agent settled at w else none
-    exclude_ids = exclude_ids or set()
-    agents_here = [aid for aid in G.nodes[w]["agents"] if ((aid not in exclude_ids) and ((agents[aid].state=="settled") or (agents[aid].state=="settledScout" and agents[aid].home==w)))]
-    return agents_here[0] if agents_here else None
+    # returns the ID of an agent settled at w (present there: settled, or a settledScout whose
+    # home is w) else none
+    for aid in _settled_at[w]:
+        if not exclude_ids or aid not in exclude_ids:
+            return aid
+    # a vacated scout passing its home with the group is settled there too
+    aid = _owners.get(w)
+    if aid is not None and agents[aid]._group is not None and _settled_here(agents[aid]):
+        if not exclude_ids or aid not in exclude_ids:
+            return aid
+    return None
 
 
 def _owner(agents, w, exclude=None):
     # ID of the agent whose HOME is w (settled there, or vacated and travelling with the group);
     # None only when w is empty/unvisited. Unlike _xi_id this does not require physical presence,
     # so a vacated node's settler is still found -- paper Sec 4.1: psi_x.P1Neighbor = psi(w).
-    exclude = exclude or set()
-    for aid, a in agents.items():
-        if aid in exclude:
-            continue
-        if a.home == w and a.state in ("settled", "settledScout"):
-            return aid
-    return None
+    aid = _owners.get(w)
+    if aid is None or (exclude and aid in exclude):
+        return None
+    return aid
+
+
+def _step(G, agents, agent_ids, from_node, out_port):
+    # move the agents agent_ids, all at from_node, through out_port; the edge and
+    # the per-node sets are looked up once for all of them
+    ports = G.graph[PORT_GRAPH_KEY]
+    to_node = _port_neighbor(ports, from_node, out_port)
+    in_port = ports.arrival_port(from_node, out_port)
+    left, entered = G.nodes[from_node]["agents"], G.nodes[to_node]["agents"]
+    settled_left, settled_entered = _settled_at[from_node], _settled_at[to_node]
+    for aid in agent_ids:
+        a = agents[aid]
+        if a._group is not None:
+            _detach(G, a)
+        if a.node != from_node:
+            raise RuntimeError(f"Agent {aid} not at {from_node}, at {a.node}")
+        left.discard(aid)
+        entered.add(aid)
+        settled_left.discard(aid)
+        a.node = to_node
+        a.arrivalPort = in_port
+        if _settled_here(a):
+            settled_entered.add(aid)
+    return to_node, in_port
 
 
 def _move_agent(G, agents, agent_id, from_node, out_port, round_number):
-    if agents[agent_id].node != from_node:
-        raise RuntimeError(f"Agent {agent_id} not at {from_node}, at {agents[agent_id].node}")
-    to_node = _port_neighbor(G, from_node, out_port)
-    if to_node is None:
-        raise ValueError(f"Invalid port {out_port} at node {from_node}")
-
-    G.nodes[from_node]["agents"].discard(agent_id)
-    G.nodes[to_node]["agents"].add(agent_id)
-
-    a = agents[agent_id]
-    a.node = to_node
-    a.arrivalPort = _port(G, to_node, from_node)
-
-    _snapshot(f"move_agent(a={agent_id},from={from_node},p={out_port},to={to_node})", G, agents, round_number, agent_id)
-
-    in_port = G[to_node][from_node][f"port_{to_node}"]
+    to_node, in_port = _step(G, agents, (agent_id,), from_node, out_port)
+    _snapshot(round_number, (agent_id,), "move_agent(a={},from={},p={},to={})",
+              agent_id, from_node, out_port, to_node)
     return to_node, in_port
 
 
 def _move_group(G, agents, agent_ids, from_node, out_port, round_number):
-    to_node = _port_neighbor(G, from_node, out_port)
+    # recorded as one step: the round ends up as if each agent's move had
+    # been recorded on its own
+    moved = list(agent_ids)
+    to_node, _ = _step(G, agents, moved, from_node, out_port)
+
+    _snapshot(round_number, moved, "move_group(from={},p={},to={},|A|={})",
+              from_node, out_port, to_node, len(moved))
+    return to_node
 
-    for aid in list(agent_ids):
-        _move_agent(G, agents, aid, from_node, out_port, round_number)
 
-    _snapshot(f"move_group(from={from_node},p={out_port},to={to_node},|A|={len(agent_ids)})", G, agents, round_number)
+def _move_scouts(G, agents, scouts, from_node, out_port, round_number):
+    # move the group carrying ``scouts`` (all its members): O(1) for the
+    # attached ones; the loose ones step along and attach
+    g = _group
+    if g.node != from_node and len(scouts) > len(g.loose):
+        raise RuntimeError(f"Scout group not at {from_node}, at {g.node}")
+    to_node, g.arrivalPort = _step(G, agents, g.loose, from_node, out_port)
+    g.node = to_node
+    for aid in g.loose:
+        _attach(G, agents[aid])
+    g.loose.clear()
+
+    _snapshot(round_number, scouts, "move_group(from={},p={},to={},|A|={})",
+              from_node, out_port, to_node, len(scouts))
     return to_node
 
 
 def can_vacate(G, agents: List["Agent"], x, psi_x, A_vacated, round_number):
-    _snapshot(f"can_vacate:enter(x={x}, psi={psi_x.ID})", G, agents, round_number)
+    _snapshot(round_number, (), "can_vacate:enter(x={}, psi={})", x, psi_x.ID)
     round_number+=1
 
     if psi_x.parentPort is None:
-        _snapshot(f"can_vacate:exit(x={x})", G, agents, round_number)
+        _snapshot(round_number, (), "can_vacate:exit(x={})", x)
         return "settled", 2
 
     # (V2) a visited node vacates iff its port-1 neighbour is occupied; (V3) a fullyVisited node
@@ -311,12 +350,12 @@ def can_vacate(G, agents: List["Agent"], x, psi_x, A_vacated, round_number):
             agents[xi_w_id].vacatedNeighbor = True
             state = "settledScout"
         _move_agent(G, agents, psi_x.ID, w, p_wx, round_number+1)
-        _snapshot(f"can_vacate:exit(x={x})", G, agents, round_number+2)
+        _snapshot(round_number+2, (), "can_vacate:exit(x={})", x)
         return state, 4
 
     # (V4) a partiallyVisited node always vacates
     if psi_x.nodeType == "partiallyVisited":
-        _snapshot(f"can_vacate:exit(x={x})", G, agents, round_number)
+        _snapshot(round_number, (), "can_vacate:exit(x={})", x)
         return "settledScout", 2
 
     # (V5) if x reaches its parent z via z's port 1 and z has no vacated dependent, z vacates and
@@ -326,37 +365,39 @@ def can_vacate(G, agents: List["Agent"], x, psi_x, A_vacated, round_number):
         psi_z_id = _xi_id(G, z, {psi_x.ID}, agents)
         if psi_z_id is None:
             _move_agent(G, agents, psi_x.ID, z, psi_x.portAtParent, round_number+1)
-            _snapshot(f"can_vacate:exit(x={x})", G, agents, round_number+2)
+            _snapshot(round_number+2, (), "can_vacate:exit(x={})", x)
             return "settled", 4
         psi_z = agents[psi_z_id]
         if psi_z.vacatedNeighbor==False:
             psi_z.state = "settledScout"
+            _touch(psi_z)
             A_vacated.add(psi_z.ID)
+            _join(psi_z)
             _move_group(G, agents, {psi_x.ID, psi_z.ID}, z, psi_x.portAtParent, round_number+1)
             psi_x.vacatedNeighbor = True
-            _snapshot(f"can_vacate:exit(x={x})", G, agents, round_number+2)
+            _snapshot(round_number+2, (), "can_vacate:exit(x={})", x)
             return "settled", 4
         else:
             _move_agent(G, agents, psi_x.ID, z, psi_x.portAtParent, round_number+1)
-            _snapshot(f"can_vacate:exit(x={x})", G, agents, round_number+2)
+            _snapshot(round_number+2, (), "can_vacate:exit(x={})", x)
             return "settled", 4
 
-    _snapshot(f"can_vacate:exit(x={x})", G, agents, round_number)
+    _snapshot(round_number, (), "can_vacate:exit(x={})", x)
     return "settled", 2
 
 
 def parallel_probe(G, agents: List["Agent"], x, psi_x, A_scout, round_number_og_og):
-    _snapshot(f"parallel_probe:enter(x={x})", G, agents, round_number_og_og)
+    _snapshot(round_number_og_og, (), "parallel_probe:enter(x={})", x)
     round_number_og_og+=1
 
     psi_x.probeResultsByPort = {}
     psi_x.probeResult = None
     psi_x.checked = 0
-    delta_x = G.degree[x]
+    ports = G.graph[PORT_GRAPH_KEY]
+    delta_x = ports.degree(x)
     rounds_max = 0
     while psi_x.checked < delta_x:
-        A_scout = sorted(A_scout)
-        s = len(A_scout)
+        s = len(A_scout)    # A_scout[i]: the i-th lowest scout ID
         Delta_prime = min(s, delta_x - psi_x.checked)
         j = 0
         jk = 0
@@ -372,7 +413,7 @@ def parallel_probe(G, agents: List["Agent"], x, psi_x, A_scout, round_number_og_
             a.scoutPort = port
             y, a.returnPort = _move_agent(G, agents, a.ID, x, a.scoutPort, round_number)
             round_number+=1
-            a.scoutEdgeType = edge_type(G, x, y)
+            a.scoutEdgeType = edge_type(ports, x, a.scoutPort)
             # Identify y. In the paper a scout distinguishes empty / vacated / occupied with a
             # multi-hop walk along port-1 edges; in this centralised simulation that is exactly the
             # owner of y (the agent whose home is y -- present if occupied, away if vacated, absent
@@ -380,8 +421,8 @@ def parallel_probe(G, agents: List["Agent"], x, psi_x, A_scout, round_number_og_
             psi_y_id = _owner(agents, y)
             _move_agent(G, agents, a.ID, y, a.returnPort, round_number)
             round_number+=1
-            a.scoutResult = (G[x][y][f"port_{x}"], a.scoutEdgeType, (agents[psi_y_id].nodeType if psi_y_id is not None else "unvisited"), psi_y_id)
-            psi_x.probeResultsByPort[G[x][y][f"port_{x}"]] = a.scoutResult
+            a.scoutResult = (a.scoutPort, a.scoutEdgeType, (agents[psi_y_id].nodeType if psi_y_id is not None else "unvisited"), psi_y_id)
+            psi_x.probeResultsByPort[a.scoutPort] = a.scoutResult
             j+=1
             jk+=1
             rounds_max = max(rounds_max, round_number-round_number_og_og)
@@ -394,43 +435,36 @@ def parallel_probe(G, agents: List["Agent"], x, psi_x, A_scout, round_number_og_
         else:
             psi_x.probeResult = best
 
-    _snapshot(f"parallel_probe:exit", G, agents, round_number_og_og+rounds_max)
+    _snapshot(round_number_og_og+rounds_max, (), "parallel_probe:exit")
     return (psi_x.probeResult[0] if psi_x.probeResult is not None else None), (rounds_max+2)
 
 
 def retrace(G, agents, A_vacated, round_number, max_rounds):
     # Re-settle every vacated scout at its home vertex by walking the P1Tree
-    # (reconstructed from parent pointers) in DFS order and dropping each scout
+    # (`p1tree`) in DFS order and dropping each scout
     # when the group reaches its home vertex. The scouts travel as one group.
-    _snapshot("retrace:enter", G, agents, round_number)
+    _snapshot(round_number, (), "retrace:enter")
     round_number += 1
     if not A_vacated:
-        _snapshot("retrace:exit", G, agents, round_number)
+        _snapshot(round_number, (), "retrace:exit")
         return round_number + 1
 
-    # owner agent of each tree vertex, keyed by its home vertex
-    owners = {a.home: a for a in agents.values()
-              if a.home is not None and a.state in ("settled", "settledScout")}
-
+    # tree vertices are the keys of _owners (the owner agent of each, by home vertex)
     def tree_neighbors(h):
         # (neighbor_home, port_at_h_leading_to_neighbor) for the parent and children of vertex h
-        a = owners[h]
-        nbrs = []
-        if a.parentID is not None and a.parentID in agents and agents[a.parentID].home is not None:
-            nbrs.append((agents[a.parentID].home, a.parentPort))
-        for c in agents.values():
-            if c.parentID == a.ID and c.home in owners:
-                nbrs.append((c.home, c.portAtParent))
-        return nbrs
+        return [(agents[b].home, port) for b, port in p1tree.neighbors(_owners[h])
+                if b in agents and agents[b].home is not None]
 
     def settle_here(h):
-        a = owners[h]
+        a = agents[_owners[h]]
         if a.ID in A_vacated:
             a.state = "settled"
             A_vacated.discard(a.ID)
+            _leave(G, a)
+            _touch(a)
 
-    cur = agents[min(A_vacated)].node
-    if cur not in owners:
+    cur = agents[A_vacated[0]].node
+    if cur not in _owners:
         raise RuntimeError(f"retrace: scout group at vertex {cur}, which is not part of the tree")
     visited = {cur}
     settle_here(cur)
@@ -445,7 +479,7 @@ def retrace(G, agents, A_vacated, round_number, max_rounds):
         if i < len(nbrs):
             frames[-1][2] = i + 1
             nh, port = nbrs[i]
-            _move_group(G, agents, A_vacated, h, port, round_number)
+            _move_scouts(G, agents, A_vacated, h, port, round_number)
             round_number += 1
             visited.add(nh)
             settle_here(nh)
@@ -456,33 +490,34 @@ def retrace(G, agents, A_vacated, round_number, max_rounds):
             if frames and A_vacated:
                 parent_vertex = frames[-1][0]
                 back_port = next(p for (nb, p) in tree_neighbors(h) if nb == parent_vertex)
-                _move_group(G, agents, A_vacated, h, back_port, round_number)
+                _move_scouts(G, agents, A_vacated, h, back_port, round_number)
                 round_number += 1
 
     if A_vacated:
         raise RuntimeError(f"retrace finished but scouts still unsettled: {sorted(A_vacated)}")
-    _snapshot("retrace:exit", G, agents, round_number)
+    _snapshot(round_number, (), "retrace:exit")
     return round_number + 1
 
 
 def rooted_async(G, agents, root_node, max_rounds):
-    _snapshot(f"rooted_async:enter(root={root_node})", G, agents, 0)
+    _snapshot(0, (), "rooted_async:enter(root={})", root_node)
     round_number = 1
-    A = set(agents.keys())
-    A_unsettled = set(A)
-    A_vacated = set()
+    A_unsettled = SortedIDs(agents, agents)
+    A_vacated = SortedIDs(agents)
+    A_scout = IDUnion(A_unsettled, A_vacated)    # live: follows both pools
+    _group.loose.update(A_unsettled)
     while A_unsettled:
         if round_number>max_rounds:
             raise RuntimeError("Round limit exceeded in rooted async")
-        v = agents[min(A_unsettled | A_vacated)].node
-        A_scout = set(A_unsettled) | set(A_vacated)
-        amin = agents[min(A_scout)]
+        amin = agents[A_scout[0]]
+        v = amin.node
         psi_v_id = _xi_id(G, v, {}, agents)
         if psi_v_id is None:
-            candidates = [aid for aid in A_unsettled if agents[aid].node == v]
-            if not candidates:
+            # the highest-ID unsettled agent at v (they all travel with the group, so
+            # normally the first one looked at)
+            psi_v_id = next((aid for aid in reversed(A_unsettled) if agents[aid].node == v), None)
+            if psi_v_id is None:
                 raise RuntimeError(f"No unsettled agent at v={v} to settle (this breaks invariants).")
-            psi_v_id = max(candidates)
             psi_v = agents[psi_v_id]
             psi_v.state = "settled"
             psi_v.home = psi_v.node
@@ -506,8 +541,9 @@ def rooted_async(G, agents, root_node, max_rounds):
                 psi_v.portAtParent = amin.childPort
             amin.childPort = None
             A_unsettled.remove(psi_v_id)
-            A_scout = set(A_unsettled) | set(A_vacated)
-            _snapshot(f"rooted_async:settled(psi={psi_v_id},v={v})", G, agents, round_number)
+            _leave(G, psi_v)
+            _touch(psi_v)
+            _snapshot(round_number, (), "rooted_async:settled(psi={},v={})", psi_v_id, v)
             round_number+=1
             if not A_unsettled:
                 break
@@ -523,17 +559,18 @@ def rooted_async(G, agents, root_node, max_rounds):
         if psi_v.state=="settled":
             A_unsettled.discard(psi_v.ID)
             A_vacated.discard(psi_v.ID)
-            A_scout = set(A_unsettled) | set(A_vacated)
+            _leave(G, psi_v)
         if psi_v.state == "settledScout":
             A_vacated.add(psi_v.ID)
-            A_scout = set(A_unsettled) | set(A_vacated)
+            _join(psi_v)
+        _touch(psi_v)
         
         if nextPort is not None:
             # forward: descend through nextPort; leave a breadcrumb so the child records its parent
             psi_v.recentPort = nextPort
             amin.childPort = nextPort
-            w = _move_group(G, agents, A_scout, v, nextPort, round_number)
-            _snapshot(f"rooted_async:move_forward(v={v},p={nextPort})", G, agents, round_number)
+            w = _move_scouts(G, agents, A_scout, v, nextPort, round_number)
+            _snapshot(round_number, (), "rooted_async:move_forward(v={},p={})", v, nextPort)
             round_number+=1
             # Algorithm 2 (line 15): a partiallyVisited node reached via a port-1 edge is re-entered
             # and re-parented into the tree (reconfigure) so its remaining subtree gets explored.
@@ -548,32 +585,61 @@ def rooted_async(G, agents, root_node, max_rounds):
                 )
             amin.childPort = None
             psi_v.recentPort = psi_v.parentPort
-            _move_group(G, agents, A_scout, v, psi_v.parentPort, round_number)
-            _snapshot(f"rooted_async:backtrack(v={v},p={psi_v.parentPort})", G, agents, round_number)
+            _move_scouts(G, agents, A_scout, v, psi_v.parentPort, round_number)
+            _snapshot(round_number, (), "rooted_async:backtrack(v={},p={})", v, psi_v.parentPort)
             round_number+=1
 
     round_number = retrace(G, agents, A_vacated, round_number, max_rounds)
-    _snapshot("rooted_async:exit", G, agents, round_number)
+    _snapshot(round_number, (), "rooted_async:exit")
     round_number+=1
 
 
-def run_simulation(G, agents, max_rounds=-1):
+def run_simulation(G, agents, max_rounds=-1, record="full", record_agents=None):
+    """Disperse ``agents`` over ``G`` from the lowest-ID agent's node.
+
+    Returns ``(all_positions, all_statuses, all_node_states, all_homes,
+    all_tree_edges)``, one ``(label, value)`` per round, as
+    `trace_recorder.TraceSeries` that are rebuilt from a delta-encoded trace
+    when read (``list()`` them for JSON).
+
+    ``record`` is the recording level: ``"full"`` records every step,
+    ``"rounds"`` one state per round (the one the round is opened with) and
+    ``"none"`` nothing -- five empty lists are returned and only the agents'
+    final states tell the outcome.  ``record_agents`` limits the trace to
+    those agent IDs (the values list them in ID order; tree edges are
+    those of the recorded agents).
+    """
+    global simmer, p1tree, _owners, _settled_at, _group
+    if record not in RECORD_LEVELS:
+        raise ValueError(f"record={record!r}, expected one of {RECORD_LEVELS}")
     if len(agents)>len(G):
         raise RuntimeError("Agents should not be more than nodes")
     max_rounds = 40*len(agents)
-    simmer.clearr()
+    ports = attach_port_graph(G)
     for u in G.nodes():
         G.nodes[u]["agents"] = set()
     if isinstance(agents, list):
         agents = {a.ID: a for a in agents}
     for aid, a in agents.items():
         G.nodes[a.node]["agents"].add(aid)
+    _owners, _settled_at = {}, {u: set() for u in G.nodes()}
+    p1tree = P1Tree()
+    for a in agents.values():
+        _index(a)
+    simmer = None
+    if record != "none":
+        traced = agents if record_agents is None else {aid: agents[aid] for aid in record_agents}
+        names = {u: str(u) for u in G.nodes()}
+        simmer = TraceRecorder(traced, lambda a: _trace_cell(ports, names, a), record)
 
     root_node = agents[sorted(agents.keys())[0]].node #For rooted only
+    _group = _Group(root_node)
     rooted_async(G, agents, root_node, max_rounds)
     # try:
     #     rooted_async(G, agents, root_node, max_rounds)
     # except:
     #     pass
 
-    return (simmer.all_positions, simmer.all_statuses, simmer.all_node_states, simmer.all_homes, simmer.all_tree_edges)
\ No newline at end of file
+    if simmer is None:
+        return [], [], [], [], []
+    return simmer.series()
\ No newline at end of file
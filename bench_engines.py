@@ -0,0 +1,310 @@
+# bench_engines.py
+"""
+Wall time, throughput and memory of the simulation engines.
+
+Times `agent_election.run_leader_election`, the dispersion engines
+`agent_help_scouts.run_simulation` and `agent_drop_freeze.run_simulation`,
+and the legacy `agent.run_simulation` on fixed seeded graphs (built by
+`agent_election.build_graph`) of several families and sizes.  The dispersion
+engines place one agent per node, all on one start node.  Per case: the best
+wall time of at least ``--repeat`` runs (more for fast cases, until
+``--min-time`` seconds have been timed), rounds and agent moves per second, and the
+peak memory the run allocates (tracemalloc, in one extra run so that tracing
+does not slow the timed ones).  Graph and agent setup is not timed.
+
+Rounds are the election's rounds and, for the dispersion engines, the
+recorded steps of their position history.  Moves are the election's edge
+traversals and, for the dispersion engines, the agents' position changes
+between recorded steps.  A case whose engine raises is kept with its error.
+
+`run` writes the results to a JSON baseline; `compare` checks a later result
+file against it and flags every case whose time or memory grew by more than
+``--threshold`` (exit status 1; growth below ``--min-delta`` seconds or
+`MIN_DELTA_BYTES` is timer and allocator noise), and every case whose rounds
+or moves changed.
+
+Usage:
+    python bench_engines.py run --output baseline.json
+    python bench_engines.py run --engines election drop_freeze --sizes 256 1024 --output new.json
+    python bench_engines.py compare baseline.json new.json --threshold 0.10
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import agent
+import agent_drop_freeze
+import agent_election
+import agent_help_scouts
+import graph_utils
+from agent_election import build_graph, run_leader_election, scatter_one_agent_per_node
+
+FORMAT = 1
+DEFAULT_OUTPUT = "bench_engines.json"
+DEFAULT_FAMILIES = ("erdos", "regular", "barabasi", "grid")
+DEFAULT_SEED = 7
+# sizes for a run of a few minutes; help_scouts snapshots every move, so its
+# time grows fastest
+DEFAULT_SIZES = {
+    "election":    (64, 256),
+    "help_scouts": (32, 64),
+    "drop_freeze": (64, 256),
+    "agent":       (32, 64),
+}
+KEY_FIELDS = ("engine", "family", "nodes", "seed")
+MIN_DELTA_BYTES = 64 * 1024
+
+
+# ─────────────────────────────  Engines  ──────────────────────────────────
+# setup(family, n, seed) -> (call, count): ``call()`` runs the engine once on
+# fresh state, ``count(result)`` turns its result into (rounds, moves, agents)
+
+def _position_moves(all_positions):
+    moves = 0
+    for (_, before), (_, after) in zip(all_positions, all_positions[1:]):
+        moves += sum(p != q for p, q in zip(before, after))
+    return moves
+
+
+def _dispersion_graph(family, n, seed):
+    G = build_graph(family, n, seed)
+    rng = random.Random(seed)
+    graph_utils.randomize_ports(G, seed, rng)
+    return G, rng.choice(list(G.nodes()))
+
+
+def _election(family, n, seed):
+    G = build_graph(family, n, seed)
+    agent_election.randomize_ports(G, seed)
+    agents = scatter_one_agent_per_node(G, seed + 1)
+
+    def call():
+        return run_leader_election(G, agents)
+
+    def count(result):
+        _, rounds, _ = result
+        return rounds, sum(a.edge_traversals for a in agents.values()), len(agents)
+    return call, count
+
+
+def _help_scouts(family, n, seed):
+    G, start = _dispersion_graph(family, n, seed)
+    agents = [agent_help_scouts.Agent(i, start) for i in range(len(G))]
+
+    def call():
+        return agent_help_scouts.run_simulation(G, agents)
+
+    def count(result):
+        positions = result[0]
+        return len(positions) - 1, _position_moves(positions), len(agents)
+    return call, count
+
+
+def _drop_freeze(family, n, seed):
+    G, start = _dispersion_graph(family, n, seed)
+    agents = [agent_drop_freeze.Agent(i, start) for i in range(len(G))]
+
+    def call():
+        return agent_drop_freeze.run_simulation(G, agents, 40 * len(agents))
+
+    def count(result):
+        positions = result[0]
+        return len(positions) - 1, _position_moves(positions), len(agents)
+    return call, count
+
+
+def _agent(family, n, seed):
+    G, start = _dispersion_graph(family, n, seed)
+    for u in G.nodes():
+        G.nodes[u]["agents"] = set()
+        G.nodes[u]["settled_agent"] = None
+    agents = [agent.Agent(i, start) for i in range(len(G))]
+
+    def call():
+        # the legacy engine prints every step
+        with contextlib.redirect_stdout(io.StringIO()):
+            return agent.run_simulation(G, agents, G.graph["delta"], 40 * len(agents), 1)
+
+    def count(result):
+        positions = result[0]
+        return len(positions) - 1, _position_moves(positions), len(agents)
+    return call, count
+
+
+ENGINES = {
+    "election":    _election,
+    "help_scouts": _help_scouts,
+    "drop_freeze": _drop_freeze,
+    "agent":       _agent,
+}
+
+
+# ─────────────────────────────  Measuring  ────────────────────────────────
+def _timed(setup, family, n, seed):
+    call, count = setup(family, n, seed)
+    gc.collect()
+    t0 = time.perf_counter()
+    result = call()
+    return time.perf_counter() - t0, count(result)
+
+
+def _peak_memory(setup, family, n, seed):
+    call, _ = setup(family, n, seed)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(engine, family, n, seed, repeat, min_time=0.0):
+    """One result entry of the benchmark."""
+    entry = {"engine": engine, "family": family, "nodes": n, "seed": seed,
+             "agents": None, "repeat": repeat, "wall_s": None, "rounds": None,
+             "moves": None, "rounds_per_s": None, "moves_per_s": None,
+             "peak_bytes": None, "error": None}
+    setup = ENGINES[engine]
+    try:
+        best, runs, total = None, 0, 0.0
+        while runs < repeat or total < min_time:
+            dt, counts = _timed(setup, family, n, seed)
+            best = dt if best is None else min(best, dt)
+            runs += 1
+            total += dt
+        rounds, moves, agents = counts
+        entry.update(agents=agents, repeat=runs, wall_s=best, rounds=rounds, moves=moves,
+                     rounds_per_s=rounds / best if best else None,
+                     moves_per_s=moves / best if best else None,
+                     peak_bytes=_peak_memory(setup, family, n, seed))
+    except Exception as e:
+        entry["error"] = f"{type(e).__name__}: {e}"
+    return entry
+
+
+def _print_entry(e):
+    head = f"  {e['engine']:<12} {e['family']:<9} n={e['nodes']:<6}"
+    if e["error"]:
+        print(f"{head} error: {e['error']}")
+        return
+    print(f"{head} {e['wall_s']:9.3f} s  {e['rounds']:8d} rounds  "
+          f"{e['rounds_per_s']:11.0f} rounds/s  {e['moves_per_s']:11.0f} moves/s  "
+          f"{e['peak_bytes'] / 2**20:8.2f} MiB")
+
+
+def cmd_run(args):
+    cases = []
+    for engine in args.engines:
+        for family in args.families:
+            for n in args.sizes or DEFAULT_SIZES[engine]:
+                cases.append((engine, family, n))
+    print(f"{len(cases)} cases, best of >= {args.repeat} runs")
+    results = []
+    for engine, family, n in cases:
+        entry = measure(engine, family, n, args.seed, args.repeat, args.min_time)
+        _print_entry(entry)
+        results.append(entry)
+
+    out = {"format": FORMAT,
+           "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+           "python": platform.python_version(),
+           "machine": platform.machine(),
+           "results": results}
+    out_dir = os.path.dirname(args.output) or "."
+    os.makedirs(out_dir, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(out, f, indent=2)
+    print(f"wrote {args.output}")
+
+
+# ─────────────────────────────  Comparing  ────────────────────────────────
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("format") != FORMAT:
+        raise SystemExit(f"{path}: unsupported benchmark format {data.get('format')}")
+    return {tuple(e[k] for k in KEY_FIELDS): e for e in data["results"]}
+
+
+def compare(base, new, threshold, min_delta=0.005):
+    """Printable findings and the number of regressions of ``new`` against
+    ``base`` (both `_load` results)."""
+    lines, regressions = [], 0
+    for key in sorted(base.keys() & new.keys()):
+        b, n = base[key], new[key]
+        name = "{} {} n={} seed={}".format(*key)
+        if b["error"] or n["error"]:
+            if bool(b["error"]) != bool(n["error"]):
+                lines.append(f"{name}: error {b['error']!r} -> {n['error']!r}")
+                regressions += bool(n["error"])
+            continue
+        notes = []
+        for field, label, floor in (("wall_s", "time", min_delta),
+                                    ("peak_bytes", "memory", MIN_DELTA_BYTES)):
+            if b[field]:
+                change = n[field] / b[field] - 1
+                if change > threshold and n[field] - b[field] > floor:
+                    regressions += 1
+                    notes.append(f"{label} +{change:.0%} REGRESSION")
+                elif change < -threshold:
+                    notes.append(f"{label} {change:.0%}")
+        for field in ("rounds", "moves"):
+            if b[field] != n[field]:
+                notes.append(f"{field} {b[field]} -> {n[field]} CHANGED")
+        lines.append(f"{name}: {b['wall_s']:.3f} s -> {n['wall_s']:.3f} s"
+                     + ("  " + ", ".join(notes) if notes else ""))
+    for key in sorted(base.keys() - new.keys()):
+        lines.append("{} {} n={} seed={}: not in the new results".format(*key))
+    for key in sorted(new.keys() - base.keys()):
+        lines.append("{} {} n={} seed={}: not in the baseline".format(*key))
+    return lines, regressions
+
+
+def cmd_compare(args):
+    lines, regressions = compare(_load(args.baseline), _load(args.results),
+                                 args.threshold, args.min_delta)
+    print("\n".join(lines))
+    print(f"{regressions} regression(s) above {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    sub = p.add_subparsers(dest="command", required=True)
+
+    r = sub.add_parser("run", help="run the benchmarks and write a result file")
+    r.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    r.add_argument("--families", nargs="+", default=list(DEFAULT_FAMILIES))
+    r.add_argument("--sizes", nargs="+", type=int, default=None,
+                   help="node counts for every engine (default: per engine)")
+    r.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    r.add_argument("--repeat", type=int, default=3, help="timed runs per case (best counts)")
+    r.add_argument("--min-time", type=float, default=0.5,
+                   help="keep repeating a case until this many seconds are timed")
+    r.add_argument("--output", default=DEFAULT_OUTPUT)
+    r.set_defaults(func=cmd_run)
+
+    c = sub.add_parser("compare", help="flag regressions against a baseline")
+    c.add_argument("baseline")
+    c.add_argument("results")
+    c.add_argument("--threshold", type=float, default=0.10,
+                   help="relative increase in time or memory that counts as a regression")
+    c.add_argument("--min-delta", type=float, default=0.005, metavar="SECONDS",
+                   help="smaller increases in time are not regressions")
+    c.set_defaults(func=cmd_compare)
+
+    args = p.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# bench_phase_state.py
+"""
+Micro-benchmark of the election's phase-state step.
+
+"per-agent" is the old loop body: `update_agent_phase_state` for every agent
+in every round.  "phase clock" is what `run_leader_election` does now: one
+shared counter per round and `end_phase_all` only at phase boundaries.
+
+Usage:
+    python bench_phase_state.py --kind erdos --nodes 256 --phases 5
+"""
+import argparse
+import copy
+import time
+
+from agent_election import (build_graph, randomize_ports, scatter_one_agent_per_node,
+                            run_leader_election, update_agent_phase_state, end_phase_all)
+
+
+def _warm_agents(kind, n, seed):
+    # agents in mid-election state (parents, children, votes) so the boundary
+    # branch does real work
+    G = build_graph(kind, n, seed)
+    randomize_ports(G, seed)
+    agents = scatter_one_agent_per_node(G, seed + 1)
+    duration = next(iter(agents.values())).phase_duration
+    run_leader_election(G, agents, max_rounds=2 * duration)
+    return agents, duration
+
+
+def per_agent(agents, rounds):
+    for r in range(rounds):
+        for ag in agents.values():
+            update_agent_phase_state(ag, r, agents)
+
+
+def phase_clock(agents, rounds):
+    duration = next(iter(agents.values())).phase_duration
+    clock = 0
+    for r in range(rounds):
+        clock += 1
+        if clock < duration:
+            continue
+        clock = 0
+        end_phase_all(agents)
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    p.add_argument("--kind", default="erdos")
+    p.add_argument("--nodes", type=int, default=256)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--phases", type=int, default=5)
+    args = p.parse_args()
+
+    agents, duration = _warm_agents(args.kind, args.nodes, args.seed)
+    rounds = duration * args.phases
+    print(f"{args.kind} n={args.nodes}: {len(agents)} agents, "
+          f"phase = {duration} rounds, timing {rounds} rounds")
+
+    for name, fn in [("per-agent", per_agent), ("phase clock", phase_clock)]:
+        state = copy.deepcopy(agents)
+        t0 = time.perf_counter()
+        fn(state, rounds)
+        dt = time.perf_counter() - t0
+        print(f"  {name:<12} {dt * 1e6 / rounds:9.2f} µs/round   ({dt:.3f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# bench_port_graph.py
+"""
+Port lookups: networkx attribute dicts vs the CSR `PortGraph`.
+
+"dict" is what the agent modules used to do per move -- the neighbour from
+``G.nodes[u]["port_map"][p]`` and the arrival port from
+``G[u][v][f"port_{v}"]``.  "PortGraph" is ``neighbor`` + ``arrival_port``.
+Memory is what building the port data allocates, per undirected edge.
+
+Usage:
+    python bench_port_graph.py --nodes 2000 --degree 8 --lookups 500000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+import networkx as nx
+
+from graph_utils import randomize_ports
+from port_graph import PortGraph
+
+
+def _dict_ports(G):
+    # the attributes graph_utils puts on a graph, on top of the bare topology
+    for u in G.nodes():
+        G.nodes[u]["port_map"] = {p: v for p, v in enumerate(G.neighbors(u))}
+        for p, v in enumerate(G.neighbors(u)):
+            G[u][v][f"port_{u}"] = p
+
+
+def dict_lookups(G, queries):
+    acc = 0
+    for u, p in queries:
+        v = G.nodes[u]["port_map"][p]
+        acc += G[u][v][f"port_{v}"]
+    return acc
+
+
+def port_graph_lookups(pg, queries):
+    acc = 0
+    for u, p in queries:
+        pg.neighbor(u, p)
+        acc += pg.arrival_port(u, p)
+    return acc
+
+
+def _allocated(fn):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    p.add_argument("--nodes", type=int, default=2000)
+    p.add_argument("--degree", type=int, default=8)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--lookups", type=int, default=500_000)
+    args = p.parse_args()
+
+    G = nx.random_regular_graph(args.degree, args.nodes, seed=args.seed)
+    m = G.number_of_edges()
+
+    # memory: port attributes on a bare graph vs the arrays of a PortGraph
+    _, dict_bytes = _allocated(lambda: _dict_ports(G))
+    randomize_ports(G, args.seed)
+    pg, pg_bytes = _allocated(lambda: PortGraph.from_networkx(G))
+
+    rng = random.Random(args.seed)
+    queries = [(u, rng.randrange(G.degree[u]))
+               for u in (rng.randrange(args.nodes) for _ in range(args.lookups))]
+    assert dict_lookups(G, queries) == port_graph_lookups(pg, queries)
+
+    print(f"random {args.degree}-regular, n={args.nodes}, m={m}, "
+          f"{args.lookups} lookups (neighbour + arrival port)")
+    for name, fn, graph, nbytes in [("dict", dict_lookups, G, dict_bytes),
+                                    ("PortGraph", port_graph_lookups, pg, pg_bytes)]:
+        t0 = time.perf_counter()
+        fn(graph, queries)
+        dt = time.perf_counter() - t0
+        print(f"  {name:<10} {args.lookups / dt / 1e6:6.2f} M lookups/s   "
+              f"{nbytes / m:8.1f} B/edge allocated")
+    print(f"  PortGraph arrays alone: {pg.nbytes() / m:.1f} B/edge")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# bench_scouts_scaling.py
+"""
+How `agent_help_scouts.run_simulation` scales with k = n.
+
+Every agent starts on node 0 of a random d-regular graph; the run records
+nothing (``record="none"``), so the time is the engine's own.  "index" is the
+engine as it is, with the settled owner of a vertex and the settled agent at
+a node read from the indexes it maintains; "scan" swaps in lookups that scan
+every agent -- `_owner` for the one whose home it is, `_xi_id` for one
+settled at the node -- which cost O(k) per scouted port.  Reported per size:
+wall time, time per agent and the growth exponent against the previous size
+(1 is linear).
+
+The scouts move as one group whatever its size (only those that walked off
+to probe step along), so in "index" mode a DFS step costs O(Δ log k) and the
+total is near-linear in k; the exponents are noisy at the larger sizes,
+where the garbage collector's passes over the agents show.
+
+Usage:
+    python bench_scouts_scaling.py --sizes 1000 2000 4000 8000 --degree 8
+    python bench_scouts_scaling.py --sizes 500 1000 2000 --modes index scan
+"""
+import argparse
+import contextlib
+import math
+import time
+
+import networkx as nx
+
+import agent_help_scouts
+from graph_utils import randomize_ports
+
+MODES = ("index", "scan")
+
+
+def _scan_xi_id(G, w, exclude_ids=None, agents=None):
+    # the scouts travelling with the group are in no per-node set: scan them all
+    exclude_ids = exclude_ids or set()
+    for aid, a in agents.items():
+        if a.node == w and aid not in exclude_ids and (a.state == "settled" or (a.state == "settledScout" and a.home == w)):
+            return aid
+    return None
+
+
+def _scan_owner(agents, w, exclude=None):
+    exclude = exclude or set()
+    for aid, a in agents.items():
+        if aid not in exclude and a.home == w and a.state in ("settled", "settledScout"):
+            return aid
+    return None
+
+
+@contextlib.contextmanager
+def _lookups(mode):
+    if mode == "index":
+        yield
+        return
+    saved = agent_help_scouts._xi_id, agent_help_scouts._owner
+    agent_help_scouts._xi_id, agent_help_scouts._owner = _scan_xi_id, _scan_owner
+    try:
+        yield
+    finally:
+        agent_help_scouts._xi_id, agent_help_scouts._owner = saved
+
+
+def run(n, degree, seed, mode):
+    G = nx.convert_node_labels_to_integers(nx.random_regular_graph(degree, n, seed=seed))
+    randomize_ports(G, seed)
+    agents = [agent_help_scouts.Agent(i, 0) for i in range(n)]
+    with _lookups(mode):
+        t0 = time.perf_counter()
+        agent_help_scouts.run_simulation(G, agents, record="none")
+        dt = time.perf_counter() - t0
+    if any(a.state != "settled" for a in agents):
+        raise SystemExit(f"n={n} {mode}: not every agent settled")
+    return dt
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    p.add_argument("--sizes", nargs="+", type=int, default=[1000, 2000, 4000])
+    p.add_argument("--degree", type=int, default=8)
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--modes", nargs="+", choices=MODES, default=["index"])
+    args = p.parse_args()
+
+    print(f"random {args.degree}-regular graphs, k = n agents on node 0")
+    for mode in args.modes:
+        prev = None
+        for n in sorted(args.sizes):
+            dt = run(n, args.degree, args.seed, mode)
+            growth = f"n^{math.log(dt / prev[1]) / math.log(n / prev[0]):.2f}" if prev else ""
+            print(f"  {mode:<6} n={n:<7} {dt:9.2f} s  {dt / n * 1e6:9.1f} us/agent  {growth}")
+            prev = (n, dt)
+
+
+if __name__ == "__main__":
+    main()
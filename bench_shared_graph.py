@@ -0,0 +1,89 @@
+# bench_shared_graph.py
+"""
+Per-run cost of getting the base graph into a simulation_parallel worker.
+
+"rebuild" builds the graph and its diameter in every task, "cache" loads it
+from the graph cache and deep-copies it per run, "shared" attaches to the one
+copy the coordinator published in shared memory.  Every task is a
+`simulation_parallel._run_single` run with a small round budget, so the graph
+handling dominates.  Reported per mode: mean task latency and the peak RSS of
+the workers, summed (pages of the shared block count in every worker that
+touched them, so "shared" is if anything overstated).
+
+Usage:
+    python bench_shared_graph.py --kind erdos --nodes 5000 --runs 32 --workers 4
+    python bench_shared_graph.py --nodes 1000 --modes rebuild cache shared
+"""
+import argparse
+import os
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from graph_cache import DEFAULT_CACHE_DIR, cached_graph
+from shared_graph import SharedGraph, start_tracker
+import simulation_parallel as sp
+
+MODES = ("rebuild", "cache", "shared")
+
+
+def _measured(config):
+    t0 = time.perf_counter()
+    entry = sp._run_single(config)
+    dt = time.perf_counter() - t0
+    return dt, os.getpid(), resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, entry
+
+
+def run_mode(mode, args):
+    graph = None
+    if mode == "shared":
+        start_tracker()
+        offsets, nbr, delta, metrics = sp._graph_arrays(
+            (args.kind, args.nodes, args.seed, args.graph_cache))
+        graph = SharedGraph.publish(offsets, nbr, delta, metrics)
+    cache_dir = None if mode == "rebuild" else args.graph_cache
+    shared = graph.descriptor if graph is not None else None
+    configs = [(args.kind, args.nodes, args.seed, run_idx, args.max_rounds,
+                "python", cache_dir, shared, None, None, False)
+               for run_idx in range(args.runs)]
+    try:
+        t0 = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            out = list(pool.map(_measured, configs))
+        wall = time.perf_counter() - t0
+    finally:
+        if graph is not None:
+            graph.unlink()
+
+    peak = {}
+    for _, pid, rss, _ in out:
+        peak[pid] = max(peak.get(pid, 0), rss)
+    latency = sum(dt for dt, *_ in out) / len(out)
+    print(f"  {mode:<8} {latency * 1e3:9.1f} ms/run   {wall:7.2f} s wall   "
+          f"{sum(peak.values()) / 1024:8.1f} MiB worker RSS")
+    return [e for *_, e in out]
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    p.add_argument("--kind", default="erdos")
+    p.add_argument("--nodes", type=int, default=5000)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--runs", type=int, default=32)
+    p.add_argument("--max-rounds", type=int, default=1)
+    p.add_argument("--workers", type=int, default=4)
+    p.add_argument("--graph-cache", default=DEFAULT_CACHE_DIR, metavar="DIR")
+    p.add_argument("--modes", nargs="+", choices=MODES, default=["cache", "shared"])
+    args = p.parse_args()
+
+    # build (and cache) the graph up front so that no mode pays for it
+    cached_graph(args.kind, args.nodes, args.seed, cache_dir=args.graph_cache)
+    print(f"{args.kind}, n={args.nodes}, {args.runs} runs of <= {args.max_rounds} "
+          f"rounds on {args.workers} workers")
+    results = {mode: run_mode(mode, args) for mode in args.modes}
+    if "cache" in results and "shared" in results:
+        assert results["cache"] == results["shared"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# cost_model.py
+"""
+Runtime estimates for the tasks of an election sweep.
+
+A run of the election on a graph with n nodes, max degree Δ and diameter d
+is predicted to cost ``scale[engine] * n * election_round_bound(Δ, n, d)``
+seconds: every agent acts once per round, and the round bound grows with Δ,
+the ID bit width and d.  ``scale`` is fitted per engine from earlier sweeps,
+and configs that ran before use their measured time per run instead.  Both
+live in a small JSON history file that every sweep updates, so estimates
+improve from sweep to sweep.
+"""
+import json
+import math
+import os
+import statistics
+import tempfile
+
+from agent_election import election_round_bound
+
+DEFAULT_HISTORY = ".sweep_costs.json"
+HISTORY_FORMAT = 1
+
+# seconds per agent-round before any history exists (python engine, roughly)
+DEFAULT_SCALE = 2e-7
+# weight of the newest sweep when merging into the history
+HISTORY_WEIGHT = 0.5
+
+
+def run_work(n, metrics=None):
+    """Predicted agent-rounds of one run; ``metrics`` holds the graph's
+    ``max_degree_actual`` and ``diameter`` (n² is the guess without them)."""
+    if not metrics or metrics.get("diameter") is None:
+        return float(n * n)
+    return float(n * election_round_bound(max(1, metrics["max_degree_actual"]),
+                                          n, metrics["diameter"]))
+
+
+def _config_id(engine, kind, n, gseed):
+    return f"{engine} {kind} {n} {gseed}"
+
+
+class CostModel:
+    """Seconds-per-run estimates for one engine, from the history at ``path``
+    (None: no history, nothing saved)."""
+
+    def __init__(self, engine, path=DEFAULT_HISTORY):
+        self.engine = engine
+        self.path = path
+        self.history = {"format": HISTORY_FORMAT, "scale": {}, "configs": {}}
+        if path:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    history = json.load(f)
+                if history.get("format") == HISTORY_FORMAT:
+                    self.history = history
+            except (OSError, ValueError):
+                pass
+        self.scale = self.history["scale"].get(engine, DEFAULT_SCALE)
+        self._seen = {}             # config id -> [seconds, runs, work per run]
+
+    def run_seconds(self, kind, n, gseed, metrics=None):
+        """Expected wall time of one run of a config."""
+        known = self.history["configs"].get(_config_id(self.engine, kind, n, gseed))
+        if known is not None:
+            return known
+        return self.scale * run_work(n, metrics)
+
+    def observe(self, kind, n, gseed, metrics, seconds, runs):
+        """Record that ``runs`` runs of a config took ``seconds``."""
+        if runs <= 0:
+            return
+        seen = self._seen.setdefault(_config_id(self.engine, kind, n, gseed),
+                                     [0.0, 0, run_work(n, metrics)])
+        seen[0] += seconds
+        seen[1] += runs
+
+    def save(self):
+        """Merge this sweep's measurements into the history file."""
+        if not self.path or not self._seen:
+            return
+        configs = self.history["configs"]
+        ratios = []
+        for cid, (seconds, runs, work) in self._seen.items():
+            per_run = seconds / runs
+            old = configs.get(cid)
+            configs[cid] = per_run if old is None else (
+                HISTORY_WEIGHT * per_run + (1 - HISTORY_WEIGHT) * old)
+            ratios.append(per_run / work)
+        scale = statistics.median(ratios)
+        old = self.history["scale"].get(self.engine)
+        self.history["scale"][self.engine] = scale if old is None else (
+            HISTORY_WEIGHT * scale + (1 - HISTORY_WEIGHT) * old)
+
+        out_dir = os.path.dirname(self.path) or "."
+        os.makedirs(out_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=out_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.history, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+        self._seen.clear()
+
+
+def format_eta(seconds):
+    """``h:mm:ss`` / ``m:ss`` of a duration."""
+    if seconds is None or not math.isfinite(seconds):
+        return "?"
+    s = int(round(seconds))
+    h, s = divmod(s, 3600)
+    m, s = divmod(s, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
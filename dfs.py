@@ -1,3 +1,5 @@
+from port_graph import PORT_GRAPH_KEY
+
 
 def settle_dfs_rooted(self, G, agents):
     # if there is no settled agent among the colocated agents, settle the highest ID agent
@@ -26,11 +28,12 @@ def move_dfs_rooted(self, G, round_number):
         return
     # remove agent from current node
     G.nodes[self.currentnode]['agents'].remove(self)
-    next_node = G.nodes[self.currentnode]['port_map'].get(self.next_port)
+    ports = G.graph[PORT_GRAPH_KEY]
+    next_node = ports.neighbor(self.currentnode, self.next_port)
     if next_node is None:
         raise ValueError(f"Agent {self.id} tried to move through invalid port {self.next_port} at node {self.currentnode} in round number {round_number}")
 
-    self.arrival_port = G[self.currentnode][next_node][f'port_{next_node}']
+    self.arrival_port = ports.arrival_port(self.currentnode, self.next_port)
     print(f'agent {self.id} moved via port {self.next_port} at node {self.currentnode} to reach {next_node} using {self.arrival_port}')
     self.currentnode = next_node
     # add agent to the corresponding node in graph
@@ -0,0 +1,182 @@
+# graph_cache.py
+"""
+On-disk cache of the election sweep's base graphs and their metrics.
+
+One ``.npz`` file per ``(kind, n, seed, param)`` holds the node labels, the
+adjacency in ``G.neighbors`` order (CSR), Δ, the diameter and the edge count,
+so a worker gets the graph back without running the generator or
+``nx.diameter``.  File names are a hash of the key (plus the cache format and
+networkx version), and families that ignore the seed share one file.
+
+Files are written to a temporary name and renamed into place, so processes
+racing on a miss at worst build the same graph twice; a reader never sees a
+partial file.
+"""
+import hashlib
+import os
+import tempfile
+from collections import deque
+
+import networkx as nx
+import numpy as np
+
+from agent_election import build_graph
+
+DEFAULT_CACHE_DIR = ".graph_cache"
+CACHE_FORMAT = 2                # 2: build_graph joins components with a seeded RNG
+
+# build_graph families whose output does not depend on the seed
+DETERMINISTIC_KINDS = {"complete", "hypercube", "grid", "tree"}
+
+
+def cache_key(kind, n, seed, param=3):
+    """Canonical key; deterministic families map every seed to 0."""
+    return (kind, int(n), 0 if kind in DETERMINISTIC_KINDS else int(seed), int(param))
+
+
+def cache_path(cache_dir, kind, n, seed, param=3):
+    key = cache_key(kind, n, seed, param)
+    blob = repr((CACHE_FORMAT, nx.__version__) + key).encode()
+    name = f"{key[0]}-{key[1]}-{hashlib.sha1(blob).hexdigest()[:16]}.npz"
+    return os.path.join(cache_dir, name)
+
+
+# ──────────────────────────  (de)serialisation  ───────────────────────────
+def _edge_order(offsets, nbr):
+    """Edges (u, v) in an order that, replayed through ``add_edge``, gives
+    every node its neighbours in CSR order.
+
+    networkx keeps each adjacency dict in insertion order and ``add_edge``
+    inserts into both endpoints at once, so the edge that comes k-th in u's
+    list must be added after the (k-1)-th one; any topological order of
+    these constraints works.  Graphs built only by adding (and removing)
+    edges always admit one.
+    """
+    n = len(offsets) - 1
+    slot = {}                     # (u, v) -> position of v in u's list
+    for u in range(n):
+        for k in range(offsets[u], offsets[u + 1]):
+            slot[u, nbr[k]] = k - offsets[u]
+
+    waiting = {}                  # edge -> endpoints whose predecessor is not added yet
+    ready = deque()
+    for u in range(n):
+        for k in range(offsets[u], offsets[u + 1]):
+            v = nbr[k]
+            if u < v:
+                w = (k > offsets[u]) + (slot[v, u] > 0)
+                if w:
+                    waiting[u, v] = w
+                else:
+                    ready.append((u, v))
+
+    order = []
+    while ready:
+        u, v = ready.popleft()
+        order.append((u, v))
+        for a, b in ((u, v), (v, u)):
+            k = offsets[a] + slot[a, b] + 1
+            if k < offsets[a + 1]:
+                c = nbr[k]
+                e = (a, c) if a < c else (c, a)
+                waiting[e] -= 1
+                if not waiting[e]:
+                    del waiting[e]
+                    ready.append(e)
+    if waiting:
+        raise ValueError("graph cache: adjacency order cannot be replayed")
+    return order
+
+
+def save_graph(path, G, diameter):
+    """Write G (labels, CSR adjacency) and its metrics to ``path`` atomically."""
+    labels = list(G.nodes())
+    index = {u: i for i, u in enumerate(labels)}
+    degree = [len(G[u]) for u in labels]
+    offsets = np.concatenate(([0], np.cumsum(degree, dtype=np.int64)))
+    nbr = np.fromiter((index[v] for u in labels for v in G.neighbors(u)),
+                      dtype=np.int32, count=int(offsets[-1]))
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez_compressed(f,
+                                labels=np.array(labels, dtype=np.int64),
+                                offsets=offsets, nbr=nbr,
+                                delta=G.graph.get("delta", max(degree, default=0)),
+                                diameter=diameter,
+                                num_edges=G.number_of_edges())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_graph(path):
+    """``(G, metrics)`` from a cache file; ``metrics`` has the keys
+    ``delta``, ``diameter`` and ``num_edges``."""
+    with np.load(path) as z:
+        labels = z["labels"]
+        offsets = z["offsets"].tolist()
+        nbr = z["nbr"].tolist()
+        metrics = {"delta":     int(z["delta"]),
+                   "diameter":  int(z["diameter"]),
+                   "num_edges": int(z["num_edges"])}
+    # hypercube nodes are bit tuples, stored as rows
+    labels = [tuple(r) for r in labels.tolist()] if labels.ndim == 2 else labels.tolist()
+
+    adj = [nbr[offsets[u]:offsets[u + 1]] for u in range(len(labels))]
+
+    # adding every node's edges in its own neighbour order (what G.copy()
+    # does; edges to earlier nodes already exist) reproduces most
+    # generators; otherwise replay a consistent order
+    G = nx.Graph()
+    G.add_nodes_from(labels)
+    G.add_edges_from((labels[u], labels[v]) for u, nbrs in enumerate(adj) for v in nbrs if v > u)
+    if any(list(G[labels[u]]) != [labels[v] for v in nbrs] for u, nbrs in enumerate(adj)):
+        G = nx.Graph()
+        G.add_nodes_from(labels)
+        G.add_edges_from((labels[u], labels[v]) for u, v in _edge_order(offsets, nbr))
+    G.graph["delta"] = metrics["delta"]
+    return G, metrics
+
+
+def load_arrays(path):
+    """``(offsets, nbr, metrics)`` of a cache file without building the graph."""
+    with np.load(path) as z:
+        return (z["offsets"], z["nbr"],
+                {"delta":     int(z["delta"]),
+                 "diameter":  int(z["diameter"]),
+                 "num_edges": int(z["num_edges"])})
+
+
+# ─────────────────────────────  Entry points  ─────────────────────────────
+def cached_graph(kind, n, seed, param=3, cache_dir=DEFAULT_CACHE_DIR):
+    """`build_graph(kind, n, seed, param)` plus its metrics, from the cache if
+    present, otherwise built and stored.  Build errors propagate uncached."""
+    path = cache_path(cache_dir, kind, n, seed, param)
+    try:
+        return load_graph(path)
+    except FileNotFoundError:
+        pass
+
+    kind_, n_, seed_, param_ = cache_key(kind, n, seed, param)
+    G = build_graph(kind_, n_, seed_, param_)
+    diameter = nx.diameter(G)
+    save_graph(path, G, diameter)
+    return G, {"delta":     G.graph["delta"],
+               "diameter":  diameter,
+               "num_edges": G.number_of_edges()}
+
+
+def cached_arrays(kind, n, seed, param=3, cache_dir=DEFAULT_CACHE_DIR):
+    """Like `cached_graph`, but only the CSR adjacency: ``(offsets, nbr,
+    metrics)``."""
+    path = cache_path(cache_dir, kind, n, seed, param)
+    try:
+        return load_arrays(path)
+    except FileNotFoundError:
+        pass
+    cached_graph(kind, n, seed, param, cache_dir)
+    return load_arrays(path)
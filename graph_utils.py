@@ -19,14 +19,18 @@ def create_port_labeled_graph(nodes, max_degree, seed):
             G[u][v][f'port_{u}'] = p
     return G
 
-def randomize_ports(G, seed):
-    """Shuffle each node’s ports, updating both edge data and node.port_map."""
-    random.seed(seed)
+def randomize_ports(G, seed, rng=None):
+    """Shuffle each node’s ports, updating both edge data and node.port_map.
+
+    Draws from ``rng`` if given, else from a fresh ``random.Random(seed)``;
+    the global ``random`` state is left alone.
+    """
+    rng = rng or random.Random(seed)
     for u in G.nodes():
         neighs = list(G.neighbors(u))
         if not neighs:
             continue
-        new_ports = random.sample(range(len(neighs)), len(neighs))
+        new_ports = rng.sample(range(len(neighs)), len(neighs))
         port_map = {}
         for v, p in zip(neighs, new_ports):
             G[u][v][f'port_{u}'] = p
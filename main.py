@@ -14,7 +14,7 @@ def main():
     agents = [agent_help_scouts.Agent(i, 0) for i in range(agent_count)]
 
     # ─── run ───
-    agent_help_scouts.run_simulation(G, agents)
+    agent_help_scouts.run_simulation(G, agents, record="none")
 
     print("\nAgent final states:")
     for a in agents:
@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
-import os, json, argparse, warnings
-import pandas as pd, seaborn as sns, matplotlib.pyplot as plt
+import os, json, time, signal, argparse, warnings
+import numpy as np, pandas as pd, seaborn as sns, matplotlib.pyplot as plt
 from concurrent.futures import ProcessPoolExecutor
 
+from matplotlib.patches import Patch
+
+from results_columnar import is_columnar, iter_chunks, read_schema
+from results_log import iter_records
+from run_stats import t_quantile_975
+
 # Set a visually appealing seaborn theme
 sns.set_theme(style="whitegrid", palette="muted")
 
@@ -17,30 +23,229 @@ YY = [
     ("total_traversals_per_edge", "Total Trav./Edge")
 ]
 
-def load(path: str) -> pd.DataFrame:
-    if not os.path.exists(path): raise FileNotFoundError(f"{path} not found")
-    with open(path) as f: data = json.load(f)
+NUMERIC = ["num_nodes", "num_edges", "max_degree_actual", "rounds", "edge_traversals", "max_edge_traversals", "target_degree"]
+# raw columns the plots need
+PLOT_COLUMNS = ["graph_type", "graph_seed"] + NUMERIC
+# bump when the aggregate tables change shape
+AGG_FORMAT = 2
+
+def _derive(df):
+    # Calculate derived metrics
+    if {"num_edges", "num_nodes"} <= set(df): df["avg_degree"] = 2 * df["num_edges"] / df["num_nodes"]
+    if {"rounds", "num_nodes"} <= set(df): df["rounds_per_node"] = df["rounds"] / df["num_nodes"]
+    if {"edge_traversals", "num_edges"} <= set(df): df["total_traversals_per_edge"] = df["edge_traversals"] / df["num_edges"]
+    return df
+
+def _load_columnar(path, columns):
+    """Finished runs of a columnar result set, one part at a time: failed
+    runs are dropped and only ``columns`` kept before anything is assembled."""
+    kinds = read_schema(path)["columns"]
+    columns = [c for c in kinds if columns is None or c in columns]
+    frames = []
+    for chunk in iter_chunks(path, list(dict.fromkeys(columns + ["error", "timeout"]))):
+        ok = None
+        if "error" in chunk:
+            # no mask: nothing missing, i.e. every run failed
+            valid = chunk["error"][1]
+            ok = ~valid if valid is not None else np.zeros(len(chunk["error"][0]), bool)
+        if "timeout" in chunk:
+            ok = ~chunk["timeout"][0] if ok is None else ok & ~chunk["timeout"][0]
+        cols = {}
+        for c in columns:
+            values, valid = chunk[c]
+            if ok is not None: values, valid = values[ok], (valid[ok] if valid is not None else None)
+            if kinds[c] == "int" and valid is not None:
+                values = np.where(valid, values, np.nan)
+            elif kinds[c] == "str":
+                values = values.astype(object)
+                if valid is not None: values[~valid] = None
+            elif kinds[c] == "json":
+                ok_c = valid if valid is not None else np.ones(len(values), bool)
+                values = np.array([json.loads(v) if k else None for v, k in zip(values.tolist(), ok_c)]
+                                  + [None], dtype=object)[:-1]
+            cols[c] = values
+        frames.append(pd.DataFrame(cols))
+    df = pd.concat(frames, ignore_index=True)
+    if "graph_type" in df: df["graph_type"] = df["graph_type"].astype("category")
+    return df
+
+def _from_records(data, columns=None) -> pd.DataFrame:
+    """Finished runs among result records, as `load` returns them."""
     df = pd.DataFrame(data)
-    if df.empty: raise ValueError("No data in file")
+    if df.empty: return df
 
     # Convert relevant columns to numeric
-    for col in ["num_nodes", "num_edges", "max_degree_actual", "rounds", "edge_traversals", "max_edge_traversals", "target_degree"]:
+    for col in NUMERIC:
         if col in df: df[col] = pd.to_numeric(df[col], errors="coerce")
 
-    # Calculate derived metrics
-    df["avg_degree"] = 2 * df["num_edges"] / df["num_nodes"]
-    df["rounds_per_node"] = df["rounds"] / df["num_nodes"]
-    df["total_traversals_per_edge"] = df["edge_traversals"] / df["num_edges"]
+    df = _derive(df)
     df = df[df["error"].isna()]
-    if "timeout" in df: df = df[~df["timeout"]]
+    if "timeout" in df: df = df[~df["timeout"].astype(bool)]
+    if columns is not None:
+        keep = set(columns) | {"avg_degree", "rounds_per_node", "total_traversals_per_edge"}
+        df = df[[c for c in df if c in keep]]
     return df
 
-def scatter(df, x, xlab, y, ylab, out, fmt):
-    if any(col not in df for col in [x, y, "graph_type"]): return
-    h = "target_degree" if "target_degree" in df else None
-    # Create scatter plot with faceting
-    g = sns.relplot(data=df, x=x, y=y, col="graph_type", hue=h, kind="scatter", col_wrap=3,
-                    size="num_nodes" if "num_nodes" in df else None, sizes=(30, 200), alpha=0.7, s=40,
+def load(path: str, columns=None) -> pd.DataFrame:
+    """Finished runs (no error, no timeout) of a sweep, with derived metrics.
+    ``path`` is a JSON result list, a sweep journal (``.jsonl``) or a
+    columnar result set (directory); ``columns`` restricts the raw columns
+    that are kept (default: all)."""
+    if not os.path.exists(path): raise FileNotFoundError(f"{path} not found")
+    if is_columnar(path):
+        df = _load_columnar(path, columns)
+        if df.empty: raise ValueError("No data in file")
+        return _derive(df)
+
+    if path.endswith(".jsonl"):
+        data = list(iter_records(path))
+    else:
+        with open(path) as f: data = json.load(f)
+    if not data: raise ValueError("No data in file")
+    return _from_records(data, columns)
+
+# ─────────────────────────────  Aggregation  ──────────────────────────────
+# Every plot is drawn from a small table of per-(graph_type, x) statistics,
+# computed once per results file; their size depends on the configurations,
+# not on the number of runs.
+
+def _bins(s):
+    # Bin x if too many unique values, otherwise use exact values (None)
+    return pd.cut(s, bins=10, retbins=True)[1] if s.nunique() > 15 else None
+
+def _box_x(s, edges):
+    return pd.cut(s, bins=edges) if edges is not None else s
+
+def _rows_in(df, cols, rows):
+    """Mask of the rows of df whose ``cols`` values occur among ``rows``."""
+    return pd.MultiIndex.from_frame(df[cols]).isin(pd.MultiIndex.from_frame(rows[cols]))
+
+def _merge(old, part, keys):
+    """``old`` with the groups recomputed in ``part`` replaced."""
+    if old is None: return part
+    stale = _rows_in(old, keys, part)
+    return pd.concat([old[~stale], part]).sort_values(keys).reset_index(drop=True)
+
+def _line_stats(d, keys, y):
+    g = d.groupby(keys, observed=True)[y]
+    t = g.agg(["count", "mean", "std"]).reset_index()
+    half = np.array([t_quantile_975(k - 1) for k in t["count"]]) * t["std"] / np.sqrt(t["count"])
+    t["ci_lo"], t["ci_hi"] = t["mean"] - half, t["mean"] + half
+    return t
+
+def _box_stats(d, keys, y):
+    g = d.groupby(keys, observed=True)[y]
+    q = g.quantile([.25, .5, .75]).unstack()
+    q.columns = ["q1", "med", "q3"]
+    # whiskers: the most extreme values within 1.5 IQR of the box
+    lim = d[keys].join(q, on=keys)
+    iqr = lim["q3"] - lim["q1"]
+    inside = d[y].where((d[y] >= lim["q1"] - 1.5 * iqr) & (d[y] <= lim["q3"] + 1.5 * iqr))
+    w = inside.groupby([d[k] for k in keys], observed=True).agg(["min", "max"])
+    w.columns = ["whislo", "whishi"]
+    t = q.join(w)
+    # as matplotlib: whiskers never end inside the box
+    t["whislo"], t["whishi"] = np.minimum(t["whislo"], t["q1"]), np.maximum(t["whishi"], t["q3"])
+    return t.reset_index()
+
+def _groups(df, x):
+    """The (graph_type, x) groups the rows of ``df`` fall in."""
+    return set(df[["graph_type", x]].dropna().drop_duplicates().itertuples(index=False, name=None))
+
+def _order(values, edges):
+    """Box position of each x value: its bin code, or the value itself."""
+    bx = _box_x(values, edges)
+    return pd.Series(bx.cat.codes if edges is not None else bx, index=values.index)
+
+def aggregate(df, new=None, prev=None) -> dict:
+    """Tables for every plot: ``scatter[x]`` the mean of every y per
+    configuration, ``box[x, y]`` quartiles and whiskers and ``line[x, y]``
+    mean and 95% CI per (graph_type, x).
+
+    With ``prev`` (the tables before the runs ``new`` were added) ``df`` is
+    the `_Runs` of every run so far, ``new`` included, and only the groups
+    ``new`` falls in are recomputed -- all boxes of an x only when its bin
+    edges moved, and everything when ``new`` brought a column."""
+    incremental = prev is not None
+    if incremental and prev.get("columns") != list(df.columns):
+        return aggregate(df.all())
+    style = ["target_degree"] if "target_degree" in df.columns else []
+    cfg = [k for k in ("graph_type", "num_nodes", "graph_seed") if k in df.columns] + style
+    ys = [y for y, _ in YY if y in df.columns]
+    agg = {"scatter": {}, "box": {}, "line": {}, "edges": {}, "columns": list(df.columns)}
+    old = prev or {"scatter": {}, "box": {}, "line": {}, "edges": {}}
+    for x, _ in XY:
+        if x not in df.columns or "graph_type" not in df.columns: continue
+        # every group of a configuration shares its x, so recomputing the
+        # (graph_type, x) groups of the new rows covers their configurations
+        groups = _groups(new, x) if incremental else None
+        sub = df.rows(x, groups) if incremental else df
+        keys = list(dict.fromkeys(cfg + [x]))
+        agg["scatter"][x] = _merge(old["scatter"].get(x),
+                                   sub.groupby(keys, observed=True)[ys].mean().reset_index(), keys)
+        # box plots group by bin (code), labelled once aggregated; the edges
+        # depend on the distinct x values only, and new edges mean every box
+        # moves
+        edges = agg["edges"][x] = _bins(df.values(x) if incremental else df[x])
+        prev_edges = old["edges"].get(x, None) if incremental else None
+        same_bins = incremental and (edges is None) == (prev_edges is None) and \
+            (edges is None or np.array_equal(edges, prev_edges))
+        bsub = df
+        if same_bins:
+            # the groups sharing a box (graph_type, bin) with a new run
+            known = list(df.groups[x])
+            code = dict(zip(known, _order(pd.Series([v for _, v in known], dtype=float), edges)))
+            cells = {(g, code[g, v]) for g, v in groups}
+            bsub = df.rows(x, [(g, v) for g, v in known if (g, code[g, v]) in cells])
+        elif incremental:
+            bsub = df.all()
+        bx = _box_x(bsub[x], edges)
+        order = _order(bsub[x], edges)
+        for y in ys:
+            d = sub[["graph_type", x, y] + style].dropna(subset=[y])
+            lkeys = ["graph_type", x] + style
+            agg["line"][x, y] = _merge(old["line"].get((x, y)), _line_stats(d, lkeys, y), lkeys)
+            d = bsub[["graph_type", y]].dropna(subset=[y])
+            d = pd.DataFrame({"graph_type": d["graph_type"], "x_order": order[d.index], y: d[y]})
+            t = _box_stats(d, ["graph_type", "x_order"], y)
+            t["x_box"] = (np.asarray(bx.cat.categories.astype(str))[t["x_order"]] if edges is not None
+                          else t["x_order"].astype(str))
+            agg["box"][x, y] = _merge(old["box"].get((x, y)) if same_bins else None,
+                                      t, ["graph_type", "x_order"])
+    return agg
+
+def _stamp(path):
+    st = os.stat(os.path.join(path, "schema.json") if is_columnar(path) else path)
+    return st.st_size, st.st_mtime_ns
+
+def aggregates(path: str, cache=True) -> dict:
+    """`aggregate` of the results at ``path``, cached next to them in
+    ``<path>.agg.pkl`` until the results change."""
+    cache_path = path.rstrip("/") + ".agg.pkl"
+    if cache:
+        try:
+            cached = pd.read_pickle(cache_path)
+            if cached["format"] == AGG_FORMAT and cached["source"] == _stamp(path):
+                return cached["tables"]
+        except Exception:
+            pass
+    agg = aggregate(load(path, PLOT_COLUMNS))
+    if cache:
+        tmp = cache_path + ".tmp"
+        pd.to_pickle({"format": AGG_FORMAT, "source": _stamp(path), "tables": agg}, tmp)
+        os.replace(tmp, cache_path)
+    return agg
+
+# ───────────────────────────────  Plots  ──────────────────────────────────
+def _palette(hues):
+    return dict(zip(hues, sns.color_palette(n_colors=len(hues))))
+
+def scatter(t, x, xlab, y, ylab, out, fmt):
+    if t is None or any(col not in t for col in [x, y, "graph_type"]): return
+    h = "target_degree" if "target_degree" in t else None
+    # Create scatter plot with faceting, one point per configuration
+    g = sns.relplot(data=t, x=x, y=y, col="graph_type", hue=h, kind="scatter", col_wrap=3,
+                    size="num_nodes" if "num_nodes" in t else None, sizes=(30, 200), alpha=0.7, s=40,
                     height=5, aspect=1.2)  # Adjusted size for better visibility
     g.set(xscale="log", yscale="log")
     g.set_xlabels(xlab)
@@ -48,7 +253,7 @@ def scatter(df, x, xlab, y, ylab, out, fmt):
     g.fig.suptitle(f"{ylab} vs {xlab}", y=1.03)
 
     # Add custom x-ticks and rotate labels
-    unique_x = sorted(df[x].unique())
+    unique_x = sorted(t[x].unique())
     for ax in g.axes.flat:
         ax.set_xticks(unique_x)
         ax.set_xticklabels([f"{val:.0f}" for val in unique_x], rotation=45, ha='right')
@@ -57,34 +262,48 @@ def scatter(df, x, xlab, y, ylab, out, fmt):
     g.savefig(os.path.join(out, f"scatter_{y}_vs_{x}.{fmt}"))
     plt.close()
 
-def box(df, x, xlab, y, ylab, out, fmt):
-    if any(col not in df for col in [x, y, "graph_type"]): return
+def box(t, x, xlab, y, ylab, out, fmt):
+    if t is None or t.empty: return
     plt.figure(figsize=(12, 6))  # Increased size for readability
-    # Bin x if too many unique values, otherwise use exact values
-    if df[x].nunique() > 15:
-        x_binned = pd.cut(df[x], bins=10)
-    else:
-        x_binned = df[x]
-    sns.boxplot(data=df, x=x_binned, y=y, hue="graph_type", showfliers=False)
+    ax = plt.gca()
+    xs = t[["x_order", "x_box"]].drop_duplicates().sort_values("x_order")
+    pos = {o: i for i, o in enumerate(xs["x_order"])}
+    hues = sorted(t["graph_type"].unique())
+    colors = _palette(hues)
+    w = 0.8 / len(hues)
+    for j, h in enumerate(hues):
+        rows = t[t["graph_type"] == h]
+        stats = [dict(med=r.med, q1=r.q1, q3=r.q3, whislo=r.whislo, whishi=r.whishi, fliers=[])
+                 for r in rows.itertuples()]
+        ax.bxp(stats, positions=[pos[o] - 0.4 + w * (j + 0.5) for o in rows["x_order"]],
+               widths=w * 0.9, patch_artist=True, showfliers=False,
+               boxprops=dict(facecolor=colors[h]), medianprops=dict(color="0.2"))
+    ax.set_xticks(range(len(xs)))
+    ax.set_xticklabels(xs["x_box"], rotation=45, ha='right')
     plt.yscale("log")
     plt.xlabel(xlab)
     plt.ylabel(ylab)
     plt.title(f"{ylab} vs {xlab}")
-    plt.legend(title="Graph Type", bbox_to_anchor=(1.02, 1), loc="upper left")
-
-    # Rotate x-tick labels
-    plt.xticks(rotation=45, ha='right')
+    plt.legend(handles=[Patch(facecolor=colors[h], label=h) for h in hues],
+               title="Graph Type", bbox_to_anchor=(1.02, 1), loc="upper left")
 
     plt.tight_layout(rect=[0, 0, 0.9, 1])
     plt.savefig(os.path.join(out, f"box_{y}_vs_{x}.{fmt}"))
     plt.close()
 
-def line(df, x, xlab, y, ylab, out, fmt):
-    if any(col not in df for col in [x, y, "graph_type"]): return
-    style = "target_degree" if "target_degree" in df else None
+def line(t, x, xlab, y, ylab, out, fmt):
+    if t is None or t.empty: return
+    style = "target_degree" if "target_degree" in t else None
     plt.figure(figsize=(12, 6))  # Increased size for clarity
-    # Line plot aggregates multiple runs by default
-    sns.lineplot(data=df, x=x, y=y, hue="graph_type", style=style)
+    # Mean per x with its 95% confidence band
+    hues = sorted(t["graph_type"].unique())
+    colors = _palette(hues)
+    sns.lineplot(data=t, x=x, y="mean", hue="graph_type", hue_order=hues, palette=colors,
+                 style=style, errorbar=None)
+    for keys, band in t.groupby(["graph_type"] + ([style] if style else []), observed=True):
+        band = band.sort_values(x)
+        plt.fill_between(band[x], band["ci_lo"], band["ci_hi"], color=colors[band["graph_type"].iloc[0]],
+                         alpha=0.2, linewidth=0)
     plt.xscale("log")
     plt.yscale("log")
     plt.title(f"{ylab} vs {xlab}")
@@ -93,34 +312,210 @@ def line(df, x, xlab, y, ylab, out, fmt):
     plt.legend(title="Graph Type" + (" / Degree" if style else ""), bbox_to_anchor=(1.02, 1), loc="upper left")
 
     # Add custom x-ticks and rotate labels
-    unique_x = sorted(df[x].unique())
+    unique_x = sorted(t[x].unique())
     plt.xticks(unique_x, [f"{val:.0f}" for val in unique_x], rotation=45, ha='right')
 
     plt.tight_layout(rect=[0, 0, 0.9, 1])
     plt.savefig(os.path.join(out, f"line_{y}_vs_{x}.{fmt}"))
     plt.close()
 
-def make_all_plots(df, out, fmt, max_workers=4):
+PLOTS = {"scatter": scatter, "box": box, "line": line}
+
+def _views(agg):
+    """The table every figure is drawn from, keyed by (plot, x, y)."""
+    views = {}
+    for x, _ in XY:
+        for y, _ in YY:
+            t = agg["scatter"].get(x)
+            views["scatter", x, y] = None if t is None or y not in t else \
+                t[[c for c in t if c == y or c not in dict(YY)]]
+            views["box", x, y] = agg["box"].get((x, y))
+            views["line", x, y] = agg["line"].get((x, y))
+    return views
+
+# figure tables of the current make_all_plots call, installed once in every
+# worker (inherited, not pickled, where workers are forked)
+_worker_views = {}
+
+def _install_views(views):
+    global _worker_views
+    _worker_views = views
+
+def _draw(keys, out, fmt, views=None):
+    """Render the figures ``keys`` from ``views`` (default: the worker's)."""
+    views = _worker_views if views is None else views
+    for kind, x, y in keys:
+        PLOTS[kind](views[kind, x, y], x, dict(XY)[x], y, dict(YY)[y], out, fmt)
+
+def _batches(keys, n):
+    # faceted scatter plots cost the most: dealing them out first, round
+    # robin, evens out the batches
+    keys = sorted(keys, key=lambda k: k[0] != "scatter")
+    return [keys[i::n] for i in range(min(n, len(keys)))]
+
+def make_all_plots(agg, out, fmt, max_workers=4):
+    """Render every plot from the `aggregate` tables, a batch of figures
+    per task; the tables reach each worker once, when it starts."""
     os.makedirs(out, exist_ok=True)
-    with ProcessPoolExecutor(max_workers=max_workers) as pool:
-        tasks = []
-        for x, xlab in XY:
-            for y, ylab in YY:
-                for fn in [scatter, box, line]:
-                    tasks.append(pool.submit(fn, df.copy(), x, xlab, y, ylab, out, fmt))
+    views = _views(agg)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_install_views,
+                             initargs=(views,)) as pool:
+        tasks = [pool.submit(_draw, keys, out, fmt) for keys in _batches(list(views), 2 * max_workers)]
         for t in tasks: t.result()
 
+# ──────────────────────────────  Follow mode  ─────────────────────────────
+class _Runs:
+    """The runs a follower has seen, for an incremental `aggregate`.
+
+    Kept whole, not as running sums, so that the box-plot quartiles stay
+    exact; but one frame per configuration, so that adding a batch copies
+    only the configurations it adds to, and indexed by (graph_type, x)
+    group, so that the rows of a few groups are found without a pass over
+    all of them."""
+
+    def __init__(self):
+        self.columns = []
+        self.frames = {}                    # configuration -> its runs
+        self.groups = {x: {} for x, _ in XY}  # x -> {(graph_type, x): configurations}
+        self.n = 0
+
+    def add(self, new):
+        self.columns += [c for c in new if c not in self.columns]
+        cfg = [k for k in ("graph_type", "num_nodes", "graph_seed", "target_degree") if k in new]
+        xs = [x for x, _ in XY if x in new]
+        at = {}
+        for i, row in enumerate(new[cfg + xs].itertuples(index=False, name=None)):
+            key = tuple(None if v != v else v for v in row[:len(cfg)])     # NaN -> None
+            at.setdefault(key, []).append(i)
+            for x, v in zip(xs, row[len(cfg):]):
+                if v == v: self.groups[x].setdefault((row[0], v), set()).add(key)
+        for key, pos in at.items():
+            part = new.iloc[pos]
+            self.frames[key] = part if key not in self.frames else pd.concat([self.frames[key], part])
+        self.n += len(new)
+
+    def values(self, x):
+        """The distinct values of ``x`` (per graph type)."""
+        return pd.Series([v for _, v in self.groups[x]], dtype=float)
+
+    def rows(self, x, groups):
+        """The runs in the (graph_type, x) ``groups``."""
+        groups = set(groups)
+        d = self._concat(set().union(*(self.groups[x].get(g, ()) for g in groups)))
+        return d[pd.MultiIndex.from_frame(d[["graph_type", x]]).isin(list(groups))]
+
+    def all(self):
+        return self._concat(self.frames)
+
+    def _concat(self, keys):
+        # earlier batches may lack columns that appeared later
+        frames = [self.frames[k] for k in keys]
+        return (pd.concat(frames) if frames else pd.DataFrame()).reindex(columns=self.columns)
+
+class _Tail:
+    """Records appended to a sweep journal since the last `read`.
+
+    A new sweep truncates the journal in place (or replaces the file) and
+    may have written more than was read before the next poll.  A rerun of
+    the same sweep can also start with the same first line, so a restart is
+    told by any of: another file at the path, the file being shorter than
+    what was read, or its first line or the bytes just before the read
+    offset no longer being what was read there."""
+
+    MARK = 256      # bytes before the offset checked on every read
+
+    def __init__(self, path):
+        self.path = path
+        self.pos, self.rest, self.head, self.mark, self.id = 0, b"", None, b"", None
+
+    def _same(self, f, st):
+        if (st.st_dev, st.st_ino) != self.id or st.st_size < self.pos:
+            return False
+        known = self.head if self.head is not None else self.rest
+        if f.read(len(known)) != known:
+            return False
+        f.seek(self.pos - len(self.mark))
+        return f.read(len(self.mark)) == self.mark
+
+    def read(self):
+        """``(records, restarted)``; restarted: the journal was started over."""
+        try: f = open(self.path, "rb")
+        except FileNotFoundError: return [], False
+        with f:
+            st = os.fstat(f.fileno())
+            restarted = self.id is not None and not self._same(f, st)
+            if restarted: self.pos, self.rest, self.head, self.mark = 0, b"", None, b""
+            self.id = st.st_dev, st.st_ino
+            f.seek(self.pos)
+            data = f.read()
+        self.pos += len(data)
+        self.mark = (self.mark + data)[-self.MARK:]
+        # a line is only complete once its newline is written
+        lines = (self.rest + data).split(b"\n")
+        self.rest = lines.pop()
+        if self.head is None and lines: self.head = lines[0] + b"\n"
+        records = []
+        for l in lines:
+            if not l.strip(): continue
+            try: records.append(json.loads(l))
+            except ValueError: continue     # not a record: skip it, as results_log does
+        return records, restarted
+
+def _ignore_sigint():
+    # Ctrl-C stops the follower; the figures being drawn are finished
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def follow(path, out, fmt, max_workers=4, interval=5.0):
+    """Keep the plots of a running sweep current: fold the records appended
+    to its journal into the aggregates and re-render the figures whose
+    tables changed.  Runs until interrupted."""
+    os.makedirs(out, exist_ok=True)
+    tail, runs, agg, views = _Tail(path), _Runs(), None, {}
+    print(f"Following {path} (Ctrl-C to stop)")
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_ignore_sigint) as pool:
+        while True:
+            records, restarted = tail.read()
+            if restarted: runs, agg, views = _Runs(), None, {}
+            new = _from_records(records, PLOT_COLUMNS)
+            if len(new):
+                new.index = pd.RangeIndex(runs.n, runs.n + len(new))
+                runs.add(new)
+                agg = aggregate(new) if agg is None else aggregate(runs, new, agg)
+                fresh = _views(agg)
+                dirty = {k: t for k, t in fresh.items()
+                         if t is not None and (views.get(k) is None or not t.equals(views[k]))}
+                tasks = [pool.submit(_draw, keys, out, fmt, {k: dirty[k] for k in keys})
+                         for keys in _batches(list(dirty), 2 * max_workers)]
+                for t in tasks: t.result()
+                views = fresh
+                print(f"  {runs.n} runs: {len(dirty)} figures updated")
+            time.sleep(interval)
+
 def cli():
     p = argparse.ArgumentParser()
-    p.add_argument("-i", "--input", default="simulation_results.json")
+    p.add_argument("-i", "--input", default="simulation_results.json",
+                   help="JSON results, a sweep journal (.jsonl) or a columnar "
+                        "result set (.cols directory)")
     p.add_argument("-o", "--out", default="plots_enhanced")
     p.add_argument("--format", default="png")
     p.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--no-agg-cache", action="store_true",
+                   help="Recompute the aggregate tables instead of using <input>.agg.pkl")
+    p.add_argument("--follow", action="store_true",
+                   help="Update the plots while a sweep runs, from its journal "
+                        "(INPUT, or INPUT with .json replaced by .jsonl)")
+    p.add_argument("--interval", type=float, default=5.0,
+                   help="Seconds between journal polls with --follow (default: %(default)s)")
     return p.parse_args()
 
 if __name__ == "__main__":
     args = cli()
     warnings.simplefilter("ignore")
-    df = load(args.input)
-    make_all_plots(df, args.out, args.format, args.max_workers)
+    if args.follow:
+        journal = args.input[:-len(".json")] + ".jsonl" if args.input.endswith(".json") else args.input
+        try: follow(journal, args.out, args.format, args.max_workers, args.interval)
+        except KeyboardInterrupt: print(f"Plots saved in: {args.out}")
+        raise SystemExit(0)
+    agg = aggregates(args.input, cache=not args.no_agg_cache)
+    make_all_plots(agg, args.out, args.format, args.max_workers)
     print(f"Plots saved in: {args.out}")
\ No newline at end of file
@@ -0,0 +1,110 @@
+# port_graph.py
+"""
+Compact port-labelled graph shared by the agent modules.
+
+The ports of every node are stored in three flat arrays (CSR layout): node
+``u`` owns the slots ``offsets[u] .. offsets[u + 1] - 1``, and slot
+``offsets[u] + p`` holds the neighbour behind port ``p`` (``nbr``) and the
+port at that neighbour leading back to ``u`` (``rev``).  Nodes are addressed
+by their position in ``labels``.
+
+Standard library only, so it loads in the browser (Pyodide) as well.
+"""
+from array import array
+
+# G.graph key under which `attach_port_graph` stores a graph's PortGraph
+PORT_GRAPH_KEY = "port_graph"
+
+
+class PortGraph:
+    __slots__ = ("labels", "index", "offsets", "nbr", "rev")
+
+    def __init__(self, labels, offsets, nbr, rev):
+        self.labels = list(labels)
+        self.index = {u: i for i, u in enumerate(self.labels)}
+        self.offsets = offsets
+        self.nbr = nbr
+        self.rev = rev
+
+    @classmethod
+    def from_networkx(cls, G):
+        """Build from a graph whose nodes carry a ``port_map`` (port → neighbour)
+        with ports 0..deg-1, as produced by `graph_utils` and `agent_election`.
+        Nodes without a ``port_map`` number their ports in neighbour order."""
+        labels = list(G.nodes())
+        index = {u: i for i, u in enumerate(labels)}
+        n = len(labels)
+        offsets = array("q", [0])
+        nbr = array("i")
+        for u in labels:
+            pm = G.nodes[u].get("port_map")
+            if pm is None:
+                nbr.extend(index[v] for v in G.neighbors(u))
+            else:
+                nbr.extend(index[pm[p]] for p in range(len(pm)))
+            offsets.append(len(nbr))
+
+        # port at u leading to v, keyed u * n + v, then look up the twin slot
+        port_to = {}
+        for u in range(n):
+            base = offsets[u]
+            for s in range(base, offsets[u + 1]):
+                port_to[u * n + nbr[s]] = s - base
+        rev = array("i", bytes(nbr.itemsize * len(nbr)))
+        for u in range(n):
+            for s in range(offsets[u], offsets[u + 1]):
+                rev[s] = port_to[nbr[s] * n + u]
+        return cls(labels, offsets, nbr, rev)
+
+    def __len__(self):
+        return len(self.labels)
+
+    @property
+    def num_edges(self):
+        return len(self.nbr) // 2
+
+    @property
+    def index_labelled(self):
+        """True if node ``i`` is labelled ``i`` (labels and indices coincide)."""
+        return all(u == i for i, u in enumerate(self.labels))
+
+    def degree(self, u):
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def neighbors(self, u):
+        """Neighbours of ``u`` in port order."""
+        return self.nbr[self.offsets[u]:self.offsets[u + 1]]
+
+    def neighbor(self, u, port):
+        """Node behind ``port`` of ``u``, or None if ``u`` has no such port."""
+        base = self.offsets[u]
+        if port is None or not 0 <= port < self.offsets[u + 1] - base:
+            return None
+        return self.nbr[base + port]
+
+    def arrival_port(self, u, port):
+        """Port through which an agent leaving ``u`` by ``port`` arrives."""
+        return self.rev[self.offsets[u] + port]
+
+    def traverse(self, u, port):
+        """``(neighbour, arrival port)`` of the edge behind ``port`` of ``u``."""
+        s = self.offsets[u] + port
+        return self.nbr[s], self.rev[s]
+
+    def nbytes(self):
+        """Bytes held by the port arrays."""
+        return sum(a.itemsize * len(a) for a in (self.offsets, self.nbr, self.rev))
+
+
+def attach_port_graph(G):
+    """Build G's PortGraph and keep it in ``G.graph[PORT_GRAPH_KEY]``.
+
+    The dispersion modules use node labels directly as PortGraph indices, so
+    the nodes must be labelled 0..n-1 in ``G.nodes()`` order.
+    """
+    pg = PortGraph.from_networkx(G)
+    if not pg.index_labelled:
+        raise ValueError("port graph: nodes must be labelled 0..n-1 "
+                         "(see networkx.convert_node_labels_to_integers)")
+    G.graph[PORT_GRAPH_KEY] = pg
+    return pg
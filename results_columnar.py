@@ -0,0 +1,154 @@
+# results_columnar.py
+"""
+Columnar binary format for sweep results.
+
+A result set is a directory with a ``schema.json`` and one compressed
+``.npz`` part per ``chunk_rows`` records.  Every part holds one typed array
+per column of `SCHEMA` (the keys of a `simulation_parallel` entry) plus a
+``<column>.valid`` mask for columns with missing values in that part.
+Readers load only the columns they ask for, one part at a time, so neither
+the full record list nor the unused columns are ever in memory.
+
+Column types:
+    int   int64 (a missing value is stored as 0 and masked)
+    bool  bool
+    str   fixed-width unicode
+    json  JSON text of the value (``leader`` may be an int or a label tuple,
+          ``stage_counters`` is a dict)
+"""
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+FORMAT = 1
+SCHEMA_FILE = "schema.json"
+DEFAULT_CHUNK_ROWS = 100_000
+
+# column -> type, in `simulation_parallel._new_entry` order
+SCHEMA = {
+    "graph_type":          "str",
+    "num_nodes":           "int",
+    "graph_seed":          "int",
+    "run_index":           "int",
+    "max_degree_actual":   "int",
+    "diameter":            "int",
+    "num_edges":           "int",
+    "rounds":              "int",
+    "leader":              "json",
+    "timeout":             "bool",
+    "timeout_reason":      "str",
+    "round_budget":        "int",
+    "error":               "str",
+    "edge_traversals":     "int",
+    "max_edge_traversals": "int",
+    "stage_counters":      "json",
+}
+
+_FILL = {"int": 0, "bool": False, "str": "", "json": ""}
+_DTYPE = {"int": np.int64, "bool": np.bool_, "str": np.str_, "json": np.str_}
+
+
+def is_columnar(path):
+    return os.path.isfile(os.path.join(path, SCHEMA_FILE))
+
+
+def _encode(kind, values):
+    """Typed array and validity mask (None if nothing is missing)."""
+    valid = np.fromiter((v is not None for v in values), dtype=bool, count=len(values))
+    if kind == "json":
+        values = [json.dumps(v) if v is not None else "" for v in values]
+    elif not valid.all():
+        values = [v if v is not None else _FILL[kind] for v in values]
+    return np.array(values, dtype=_DTYPE[kind]), (None if valid.all() else valid)
+
+
+def _write_part(out_dir, index, columns, schema):
+    arrays = {}
+    for name, kind in schema.items():
+        values, valid = _encode(kind, columns[name])
+        arrays[name] = values
+        if valid is not None:
+            arrays[name + ".valid"] = valid
+    part = f"part-{index:05d}.npz"
+    np.savez_compressed(os.path.join(out_dir, part), **arrays)
+    return part
+
+
+def write_columnar(records, path, chunk_rows=DEFAULT_CHUNK_ROWS, schema=SCHEMA):
+    """Write an iterable of result records to the directory ``path``
+    (replacing it; the new set is built next to it and renamed into place).
+    Returns the number of records written."""
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=parent, suffix=".tmp")
+    try:
+        parts, rows = [], 0
+        columns = {name: [] for name in schema}
+        for record in records:
+            for name, values in columns.items():
+                values.append(record.get(name))
+            if len(columns["graph_type"]) >= chunk_rows:
+                parts.append((_write_part(tmp, len(parts), columns, schema), chunk_rows))
+                rows += chunk_rows
+                columns = {name: [] for name in schema}
+        if columns["graph_type"] or not parts:
+            n = len(columns["graph_type"])
+            parts.append((_write_part(tmp, len(parts), columns, schema), n))
+            rows += n
+        with open(os.path.join(tmp, SCHEMA_FILE), "w", encoding="utf-8") as f:
+            json.dump({"format": FORMAT, "rows": rows, "columns": schema,
+                       "parts": [{"file": p, "rows": n} for p, n in parts]}, f, indent=2)
+
+        if os.path.exists(path):
+            old = tempfile.mkdtemp(dir=parent, suffix=".old")
+            os.replace(path, os.path.join(old, "set"))
+            os.replace(tmp, path)
+            shutil.rmtree(old)
+        else:
+            os.replace(tmp, path)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return rows
+
+
+def read_schema(path):
+    with open(os.path.join(path, SCHEMA_FILE), encoding="utf-8") as f:
+        schema = json.load(f)
+    if schema.get("format") != FORMAT:
+        raise ValueError(f"{path}: unsupported columnar format {schema.get('format')}")
+    return schema
+
+
+def iter_chunks(path, columns=None):
+    """``{column: (values, valid)}`` per part of the result set at ``path``,
+    restricted to ``columns`` (default: all); ``valid`` is None when no value
+    of the column is missing in that part.  ``json`` columns come back as
+    their JSON text."""
+    schema = read_schema(path)
+    names = list(schema["columns"]) if columns is None else \
+        [c for c in columns if c in schema["columns"]]
+    for part in schema["parts"]:
+        with np.load(os.path.join(path, part["file"])) as npz:
+            yield {name: (npz[name], npz[name + ".valid"] if name + ".valid" in npz.files else None)
+                   for name in names}
+
+
+def iter_columnar_records(path):
+    """Records of a result set, as written."""
+    kinds = read_schema(path)["columns"]
+    for chunk in iter_chunks(path):
+        cols = {}
+        for name, (values, valid) in chunk.items():
+            if kinds[name] == "json":
+                vals = [json.loads(v) if v else None for v in values.tolist()]
+            else:
+                vals = values.tolist()
+            if valid is not None:
+                vals = [v if ok else None for v, ok in zip(vals, valid.tolist())]
+            cols[name] = vals
+        for row in zip(*cols.values()):
+            yield dict(zip(cols, row))
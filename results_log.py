@@ -0,0 +1,192 @@
+# results_log.py
+"""
+Append-only JSONL journal of sweep results.
+
+Every finished run is appended to the journal as one JSON line as soon as its
+task completes, and the file is fsync'ed every few seconds, so an interrupted
+sweep keeps everything but its last moments.  `recorded_keys` tells a resumed
+sweep which runs it can skip, and `compact` turns the journal into the
+sweep's final JSON list, sorted by run key, with an external merge sort: only
+``chunk_size`` records are in memory at a time.
+"""
+import heapq
+import json
+import os
+import tempfile
+import time
+
+from results_columnar import is_columnar, iter_columnar_records
+
+KEY_FIELDS = ("graph_type", "num_nodes", "graph_seed", "run_index")
+
+
+def run_key(entry):
+    """``(graph_type, num_nodes, graph_seed, run_index)`` of a result entry."""
+    return tuple(entry[k] for k in KEY_FIELDS)
+
+
+def _read_records(path):
+    """Records of a journal with the byte length of the file up to and
+    including each, stopping at a torn (partially written) last line."""
+    good = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            good += len(line)
+            yield record, good
+
+
+def recorded_keys(path):
+    """Run keys already in the journal at ``path`` (empty if there is none).
+
+    A torn last line left by a crash is cut off so that appending continues
+    on a line boundary.
+    """
+    keys, good = set(), 0
+    try:
+        for record, good in _read_records(path):
+            keys.add(run_key(record))
+    except FileNotFoundError:
+        return keys
+    if good != os.path.getsize(path):
+        os.truncate(path, good)
+    return keys
+
+
+def iter_records(path):
+    """Records of a sweep output (JSON list or columnar directory) or of a
+    journal (``.jsonl``)."""
+    if is_columnar(path):
+        yield from iter_columnar_records(path)
+        return
+    if path.endswith(".jsonl"):
+        for record, _ in _read_records(path):
+            yield record
+        return
+    with open(path, encoding="utf-8") as f:
+        yield from json.load(f)
+
+
+def observed_rounds(paths):
+    """Most rounds any finished run of a configuration needed, keyed by
+    ``(graph_type, num_nodes, graph_seed)``, over the given result files."""
+    observed = {}
+    for path in paths:
+        for r in iter_records(path):
+            if r.get("error") or r.get("timeout") or r.get("rounds") is None:
+                continue
+            key = run_key(r)[:3]
+            observed[key] = max(observed.get(key, 0), r["rounds"])
+    return observed
+
+
+class ResultLog:
+    """Journal writer; ``resume=False`` starts a new journal."""
+
+    def __init__(self, path, resume=False, fsync_interval=5.0):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self._f = open(path, "a" if resume else "w", encoding="utf-8")
+        self._synced = time.monotonic()
+
+    def append(self, entries):
+        for entry in entries:
+            self._f.write(json.dumps(entry) + "\n")
+        self._f.flush()
+        if time.monotonic() - self._synced >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._synced = time.monotonic()
+
+    def close(self):
+        if not self._f.closed:
+            self.sync()
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ─────────────────────────────  Compaction  ───────────────────────────────
+def _sorted_runs(path, chunk_size, tmp_dir):
+    """Sort the journal in chunks of ``chunk_size`` records into temporary
+    JSONL files; returns their paths."""
+    runs, chunk = [], []
+
+    def flush():
+        chunk.sort(key=run_key)
+        fd, run = tempfile.mkstemp(dir=tmp_dir, suffix=".jsonl")
+        with os.fdopen(fd, "w", encoding="utf-8") as out:
+            out.writelines(json.dumps(r) + "\n" for r in chunk)
+        runs.append(run)
+        chunk.clear()
+
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break                       # torn last line
+            chunk.append(json.loads(line))
+            if len(chunk) >= chunk_size:
+                flush()
+    if chunk:
+        flush()
+    return runs
+
+
+def _records(run):
+    with open(run, encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def sorted_records(path, chunk_size=20_000, tmp_dir=None):
+    """Records of the journal at ``path`` in `run_key` order, a run recorded
+    twice only once.  A generator; its temporary files (in ``tmp_dir``) are
+    removed when it is exhausted or closed."""
+    runs = _sorted_runs(path, chunk_size, tmp_dir)
+    try:
+        last = None
+        for rec in heapq.merge(*map(_records, runs), key=run_key):
+            key = run_key(rec)
+            if key != last:
+                last = key
+                yield rec
+    finally:
+        for run in runs:
+            os.unlink(run)
+
+
+def compact(path, output, chunk_size=20_000):
+    """Write the journal at ``path`` to ``output`` as one JSON list of its
+    `sorted_records`.  Formatted like ``json.dump(records, f, indent=2)``;
+    written to a temporary file and renamed into place.  Returns the number
+    of records written."""
+    out_dir = os.path.dirname(output) or "."
+    os.makedirs(out_dir, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=out_dir, suffix=".tmp")
+    count = 0
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as out:
+            out.write("[")
+            for rec in sorted_records(path, chunk_size, out_dir):
+                body = json.dumps(rec, indent=2).replace("\n", "\n  ")
+                out.write(("," if count else "") + "\n  " + body)
+                count += 1
+            out.write("\n]" if count else "]")
+        os.replace(tmp, output)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return count
@@ -0,0 +1,162 @@
+# run_stats.py
+"""
+Streaming statistics of sweep results.
+
+`RunningStats` keeps count, mean and variance of one metric with Welford's
+update, so per-configuration statistics cost O(1) memory however many runs
+arrive.  `ConfigStats` tracks the metrics of one ``(graph_type, num_nodes,
+graph_seed)`` configuration and decides when its confidence intervals are
+narrow enough; `summarize` aggregates a stream of result records, and
+`add_counters` the stage counters of instrumented runs.
+"""
+import math
+
+# metrics whose confidence intervals decide convergence
+METRICS = ("rounds", "edge_traversals")
+# per-configuration fields copied from the first record
+GRAPH_FIELDS = ("graph_type", "num_nodes", "graph_seed",
+                "max_degree_actual", "diameter", "num_edges")
+
+_Z975 = 1.959963984540054
+# exact 97.5 % quantiles of Student's t for 1..35 degrees of freedom
+_T975 = (12.706205, 4.302653, 3.182446, 2.776445, 2.570582, 2.446912,
+         2.364624, 2.306004, 2.262157, 2.228139, 2.200985, 2.178813,
+         2.160369, 2.144787, 2.131450, 2.119905, 2.109816, 2.100922,
+         2.093024, 2.085963, 2.079614, 2.073873, 2.068658, 2.063899,
+         2.059539, 2.055529, 2.051831, 2.048407, 2.045230, 2.042272,
+         2.039513, 2.036933, 2.034515, 2.032245, 2.030108)
+
+
+def t_quantile_975(dof):
+    """97.5 % quantile of Student's t with ``dof`` degrees of freedom: exact
+    (tabulated) up to 35, above that the Cornish-Fisher expansion, whose
+    error at integer ``dof`` is at most 1e-6 (9.6e-7 at 36) and falls as
+    dof**-4."""
+    if dof <= 0:
+        return math.inf
+    if dof <= len(_T975) and dof == int(dof):
+        return _T975[int(dof) - 1]
+    z, v = _Z975, float(dof)
+    return (z + (z**3 + z) / (4 * v)
+              + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * v**2)
+              + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * v**3))
+
+
+class RunningStats:
+    """Count, mean, variance, min and max of a stream of numbers."""
+    __slots__ = ("n", "mean", "_m2", "min", "max")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = self.max = None
+
+    def add(self, x):
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self._m2 += d * (x - self.mean)
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+
+    @property
+    def variance(self):
+        """Sample variance (0 for fewer than two values)."""
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def ci_halfwidth(self):
+        """Half-width of the 95 % confidence interval of the mean."""
+        if self.n < 2:
+            return math.inf
+        return t_quantile_975(self.n - 1) * math.sqrt(self.variance / self.n)
+
+    def runs_needed(self, rel_target):
+        """Sample size at which the CI half-width would be ``rel_target``
+        times the mean, at the current variance estimate."""
+        if self.n < 2:
+            return 2
+        if self.variance == 0:
+            return self.n
+        want = rel_target * abs(self.mean)
+        if want == 0:
+            return math.inf
+        return math.ceil((t_quantile_975(self.n - 1) ** 2) * self.variance / want ** 2)
+
+    def as_dict(self):
+        return {"n": self.n, "mean": self.mean if self.n else None,
+                "std": math.sqrt(self.variance) if self.n > 1 else None,
+                "ci95": self.ci_halfwidth if self.n > 1 else None,
+                "min": self.min, "max": self.max}
+
+
+class ConfigStats:
+    """Statistics of the runs of one configuration.
+
+    Only runs that elected a leader enter the metric statistics; timeouts
+    and errors are counted separately.
+    """
+
+    def __init__(self):
+        self.graph = None
+        self.runs = self.timeouts = self.errors = 0
+        self.metrics = {m: RunningStats() for m in METRICS}
+
+    def add(self, entry):
+        if self.graph is None or self.graph.get("diameter") is None:
+            self.graph = {k: entry.get(k) for k in GRAPH_FIELDS}
+        self.runs += 1
+        if entry.get("error"):
+            self.errors += 1
+        elif entry.get("timeout"):
+            self.timeouts += 1
+        else:
+            for m, st in self.metrics.items():
+                st.add(entry[m])
+
+    def converged(self, rel_target, min_runs):
+        """Every metric's CI half-width is at most ``rel_target`` times its
+        mean, after at least ``min_runs`` runs."""
+        return self.runs >= min_runs and all(
+            st.n >= 2 and st.ci_halfwidth <= rel_target * abs(st.mean)
+            for st in self.metrics.values())
+
+    def runs_needed(self, rel_target, min_runs):
+        """Estimated total runs for convergence, counting the runs that did
+        not finish at the rate seen so far."""
+        finished = self.metrics[METRICS[0]].n
+        need = max([min_runs] + [st.runs_needed(rel_target) for st in self.metrics.values()])
+        if finished and finished < self.runs:
+            need = need * self.runs / finished
+        return need
+
+    def summary(self, rel_target=None, min_runs=0):
+        out = dict(self.graph or {})
+        out.update(runs=self.runs, timeouts=self.timeouts, errors=self.errors)
+        for m, st in self.metrics.items():
+            out[m] = st.as_dict()
+        if rel_target is not None:
+            out["converged"] = self.converged(rel_target, min_runs)
+        return out
+
+
+def summarize(records, rel_target=None, min_runs=0):
+    """Per-configuration summaries of a stream of result records, sorted by
+    configuration."""
+    stats = {}
+    for r in records:
+        key = (r["graph_type"], r["num_nodes"], r["graph_seed"])
+        stats.setdefault(key, ConfigStats()).add(r)
+    return [stats[k].summary(rel_target, min_runs) for k in sorted(stats)]
+
+
+def add_counters(total, counters):
+    """Add the stage counters of one run to ``total``; ``max_*`` counters
+    keep their maximum."""
+    for name, value in counters.items():
+        if name.startswith("max_"):
+            total[name] = max(total.get(name, value), value)
+        else:
+            total[name] = total.get(name, 0) + value
+    return total
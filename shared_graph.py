@@ -0,0 +1,136 @@
+# shared_graph.py
+"""
+Base graphs of the election sweep in shared memory.
+
+The coordinator publishes every base graph once as a `SharedGraph`: its
+adjacency in ``G.neighbors`` order (CSR ``offsets`` / ``nbr``) plus the
+``twin`` of every slot (the slot of the same edge seen from the other end)
+in a single `multiprocessing.shared_memory` block.  Workers attach to the
+block by name through the picklable `SharedGraph.descriptor` and only read
+it; the port labelling and agents of a run are derived privately from these
+arrays, so no worker builds, loads or deep-copies a networkx graph.
+
+Nodes are addressed by their index in ``G.nodes()`` order.  The results of a
+run match the networkx path (``randomize_ports`` + `scatter_one_agent_per_node`)
+because the labelling only depends on the neighbour order.
+"""
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from port_graph import PortGraph
+from agent_election_np import labelled_port_tables, shuffled_ports
+
+
+class SharedGraph:
+    """Read-only CSR view of one base graph in a shared-memory block.
+
+    ``metrics`` is a plain dict published with the graph (the sweep keeps
+    Δ, diameter and edge count there).  Only the publishing process may
+    `unlink` the block.
+    """
+
+    def __init__(self, shm, n, slots, delta, metrics, owner=False):
+        self.shm = shm
+        self.n = n
+        self.delta = delta
+        self.metrics = metrics
+        self.owner = owner
+        buf = shm.buf
+        self.offsets = np.ndarray(n + 1, dtype=np.int64, buffer=buf)
+        self.nbr = np.ndarray(slots, dtype=np.int32, buffer=buf, offset=8 * (n + 1))
+        self.twin = np.ndarray(slots, dtype=np.int32, buffer=buf, offset=8 * (n + 1) + 4 * slots)
+        if not owner:
+            for a in (self.offsets, self.nbr, self.twin):
+                a.flags.writeable = False
+
+    @classmethod
+    def publish(cls, offsets, nbr, delta, metrics=None):
+        """Copy a CSR adjacency into a new shared-memory block."""
+        offsets = np.asarray(offsets, dtype=np.int64)
+        nbr = np.asarray(nbr, dtype=np.int32)
+        n, slots = len(offsets) - 1, len(nbr)
+
+        # twin slot of (u, v) is the slot of (v, u): look it up among the
+        # sorted u * n + v keys
+        owner = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+        keys = owner * n + nbr
+        order = np.argsort(keys, kind="stable")
+        twin = order[np.searchsorted(keys, nbr.astype(np.int64) * n + owner, sorter=order)]
+
+        shm = shared_memory.SharedMemory(create=True, size=max(1, 8 * (n + 1) + 8 * slots))
+        g = cls(shm, n, slots, int(delta), dict(metrics or {}), owner=True)
+        g.offsets[:] = offsets
+        g.nbr[:] = nbr
+        g.twin[:] = twin
+        return g
+
+    @property
+    def descriptor(self):
+        """Picklable handle for `attach`."""
+        return (self.shm.name, self.n, len(self.nbr), self.delta, self.metrics)
+
+    @property
+    def degree(self):
+        return np.diff(self.offsets)
+
+    def port_graph(self, seed):
+        """`PortGraph` of ``randomize_ports(G, seed)`` (nodes 0..n-1)."""
+        ports = shuffled_ports(self.degree, [seed])[0]
+        slot = np.repeat(self.offsets[:-1], self.degree) + ports
+        nbr = np.empty_like(self.nbr)
+        rev = np.empty_like(self.nbr)
+        nbr[slot] = self.nbr
+        rev[slot] = ports[self.twin]
+        return PortGraph(range(self.n), array("q", self.offsets.tobytes()),
+                         array("i", nbr.astype(np.intc).tobytes()),
+                         array("i", rev.astype(np.intc).tobytes()))
+
+    def port_tables(self, seeds, width=0):
+        """`port_table` of ``randomize_ports(G, seed)`` for every seed, shape
+        (len(seeds), n, max(Δ, width, 1))."""
+        return labelled_port_tables(self.offsets, self.nbr,
+                                    shuffled_ports(self.degree, seeds), width)
+
+    def close(self):
+        # views must go before the mapping can be released
+        self.offsets = self.nbr = self.twin = None
+        self.shm.close()
+
+    def unlink(self):
+        self.close()
+        self.shm.unlink()
+
+
+def start_tracker():
+    """Start this process's shared-memory resource tracker.
+
+    Call it before starting the workers: they then report to the same
+    tracker, which forgets a block once `SharedGraph.unlink` runs.  Workers
+    with a tracker of their own would "clean up" (unlink) every block they
+    attached to when they exit.
+    """
+    resource_tracker.ensure_running()
+
+
+# blocks this process has attached to, by name; kept open for its lifetime
+# so that later tasks on the same graph attach for free
+_attached = {}
+
+
+def attach(descriptor):
+    """The `SharedGraph` behind a `SharedGraph.descriptor` (read-only)."""
+    name, n, slots, delta, metrics = descriptor
+    g = _attached.get(name)
+    if g is None:
+        g = _attached[name] = SharedGraph(shared_memory.SharedMemory(name=name),
+                                          n, slots, delta, metrics)
+    return g
+
+
+def detach(graph):
+    """Unmap an attached graph; `attach` maps it again when next asked."""
+    if _attached.get(graph.shm.name) is graph:
+        del _attached[graph.shm.name]
+    graph.close()
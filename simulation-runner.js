@@ -11,8 +11,11 @@ export async function runSimulation(py, nodes, max_degree, agents, rounds, seed,
   // Load all Python modules and helper script into Pyodide FS
   const pythonFiles = [
     'graph_utils.py',
+    'port_graph.py',
     'agent_drop_freeze.py',
     'agent_help_scouts.py',      // NEW: parallel greedy algorithm
+    'trace_recorder.py',         // help_scouts trace
+    'sorted_ids.py',             // help_scouts scout pools
     'simulation_wrapper.py'  // external script with core logic
   ];
   await Promise.all(pythonFiles.map(f => loadPyFile(py, f)));
@@ -9,18 +9,44 @@ library.
 
 Usage:
     python simulation_parallel.py -o simulation_results.json --workers 8
+    python simulation_parallel.py --engine event      # skip rounds without meetings
+    python simulation_parallel.py --engine numpy      # vectorised election engine
+    python simulation_parallel.py --engine batch      # all runs of a graph at once
+    python simulation_parallel.py --no-graph-cache    # rebuild every graph in every task
+    python simulation_parallel.py --no-shared-graphs  # load the graph per task, not from shared memory
+    python simulation_parallel.py --chunk-size 4      # runs of one graph per task
+    python simulation_parallel.py --resume            # continue an interrupted sweep
+    python simulation_parallel.py --round-budget adaptive --wall-limit 60
+    python simulation_parallel.py --sampling adaptive --ci-target 0.05 --runs-per-graph 64
+    python simulation_parallel.py --summary-only     # per-config statistics, no raw records
+    python simulation_parallel.py --schedule product # configs in order, not longest first
+    python simulation_parallel.py --output-format columnar   # simulation_results.cols/
+    python simulation_parallel.py --stage-counters   # where the election loop spends its time
 """
 
 from __future__ import annotations
 import os, time, json, random, argparse, itertools, math, signal, sys
+from collections import Counter, OrderedDict
 from copy import deepcopy
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
 import networkx as nx
 
 # —— your helper module: no change ————————————————————————————————
-from agent_election import (build_graph, randomize_ports,
-                            scatter_one_agent_per_node, run_leader_election)
+from agent_election import (build_graph, randomize_ports, scatter_agents,
+                            scatter_one_agent_per_node, run_leader_election,
+                            election_round_bound, STAGES)
+from agent_election_np import (run_leader_election_np, prepare_runs, agent_homes,
+                               run_leader_election_batch, neighbour_csr)
+from graph_cache import DEFAULT_CACHE_DIR, cache_key, cached_graph, cached_arrays
+from results_log import (ResultLog, compact, iter_records, observed_rounds,
+                         recorded_keys, run_key, sorted_records)
+from results_columnar import write_columnar
+from run_stats import ConfigStats, add_counters, summarize
+from cost_model import DEFAULT_HISTORY, CostModel, format_eta
+from shared_graph import (SharedGraph, start_tracker, attach as attach_shared,
+                          detach as detach_shared)
 
 # —— Defaults ————————————————————————————————————————————————————————
 DEFAULT_GRAPH_TYPES        = ["erdos", "barabasi", "smallworld",
@@ -31,20 +57,31 @@ DEFAULT_NUM_RUNS_PER_GRAPH = 8
 DEFAULT_MAX_ROUNDS         = 150_000
 DEFAULT_OUTPUT_FILE        = "simulation_results.json"
 DEFAULT_WORKERS            = os.cpu_count() or 1
+DEFAULT_ENGINE             = "python"
+DEFAULT_BATCH_SIZE         = 64
+DEFAULT_GRAPH_CACHE        = DEFAULT_CACHE_DIR
+DEFAULT_WORKER_GRAPHS      = 4
+DEFAULT_FSYNC_INTERVAL     = 5.0
+DEFAULT_BUDGET_FACTOR      = 4.0
+DEFAULT_CI_TARGET          = 0.05
+DEFAULT_MIN_RUNS           = 5
+DEFAULT_COST_HISTORY       = DEFAULT_HISTORY
+DEFAULT_TASKS_PER_WORKER   = 2
+PROGRESS_INTERVAL          = 10.0   # seconds between progress lines, at most
 
-# —— Worker function ————————————————————————————————————————————————
-def _run_single(config: tuple[str,int,int,int,int,bool,int]) -> dict:
-    """
-    One independent simulation run.
+# Election engines selectable with --engine; all return identical results.
+# "batch" simulates up to --batch-size runs of one graph in a single task.
+# Only "python" can run instrumented (--stage-counters).
+ENGINES = {
+    "python": run_leader_election,
+    "event":  partial(run_leader_election, event_driven=True),
+    "numpy":  run_leader_election_np,
+}
+BATCH_ENGINE = "batch"
 
-    Parameters (packed for pickling):
-        (graph_type, n, d, graph_seed, run_idx, max_rounds)
-    Returns:
-        dict – one entry in the results json
-    """
-    (kind, n, gseed, run_idx, max_rounds) = config
-
-    entry = {
+# —— Worker helpers —————————————————————————————————————————————————
+def _new_entry(kind: str, n: int, gseed: int, run_idx: int) -> dict:
+    return {
         "graph_type":     kind,
         "num_nodes":      n,
         "graph_seed":     gseed,
@@ -55,33 +92,158 @@ def _run_single(config: tuple[str,int,int,int,int,bool,int]) -> dict:
         "rounds":         None,
         "leader":         None,
         "timeout":        None,
+        "timeout_reason": None,
+        "round_budget":   None,
         "error":          None,
         "edge_traversals":       None,
         "max_edge_traversals":   None,
+        "stage_counters":        None,
     }
 
+
+def _run_seeds(gseed: int, run_idx: int) -> tuple[int, int]:
+    """Deterministic (port randomisation, agent placement) seeds of a run."""
+    pr_seed = (gseed * 1_000_000) ^ (run_idx * 17_031) ^ 0xA5A5
+    return pr_seed, pr_seed + 987_654_321
+
+
+def _entry_metrics(info: dict) -> dict:
+    return {"max_degree_actual": info["delta"],
+            "diameter":          info["diameter"],
+            "num_edges":         info["num_edges"]}
+
+
+def _round_cap(entry: dict, max_rounds: int, budget: tuple | None) -> int:
+    """Round cap of a run: ``max_rounds``, or with an adaptive ``budget`` =
+    ``(factor, observed)`` that factor times the rounds earlier runs of the
+    config needed (``observed``, may be None) or else times the predicted
+    `election_round_bound`; never more than ``max_rounds``."""
+    if budget is None:
+        return max_rounds
+    factor, observed = budget
+    bound = observed or election_round_bound(entry["max_degree_actual"],
+                                             entry["num_nodes"], entry["diameter"])
+    return min(max_rounds, math.ceil(factor * bound))
+
+
+def _record(entry: dict, leader, rounds: int, timeout: bool, cap: int) -> None:
+    entry.update(rounds=rounds, leader=leader, timeout=timeout, round_budget=cap)
+    if timeout:
+        entry["timeout_reason"] = "rounds" if rounds >= cap else "wall"
+
+
+def _load_graph(kind: str, n: int, gseed: int, cache_dir: str | None,
+                shared: tuple | None):
+    """``(graph, metrics)``: the `SharedGraph` the coordinator published, or
+    the networkx base graph built (or loaded from ``cache_dir``) here."""
+    if shared is not None:
+        graph = attach_shared(shared)
+        return graph, graph.metrics
+    if cache_dir:
+        G0, info = cached_graph(kind, n, gseed, cache_dir=cache_dir)
+        return G0, _entry_metrics(info)
+    G0 = build_graph(kind, n, gseed)
+    return G0, {"max_degree_actual": G0.graph.get("delta", -1),
+                "diameter":          nx.diameter(G0),
+                "num_edges":         G0.number_of_edges()}
+
+
+class _GraphLRU:
+    """Base graphs (with their metrics) a worker has recently used, so runs of
+    the same graph landing on it do not build or load it again."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.graphs: OrderedDict[tuple, tuple] = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key: tuple, load):
+        if key in self.graphs:
+            self.hits += 1
+            self.graphs.move_to_end(key)
+            return self.graphs[key]
+        self.misses += 1
+        value = load()
+        if self.size > 0:
+            self.graphs[key] = value
+            while len(self.graphs) > self.size:
+                graph, _ = self.graphs.popitem(last=False)[1]
+                if isinstance(graph, SharedGraph):
+                    detach_shared(graph)
+        return value
+
+
+# set up in every worker by `_init_worker`; without it nothing is kept
+_worker_graphs = _GraphLRU(0)
+
+
+def _init_worker(graphs_per_worker: int) -> None:
+    global _worker_graphs
+    # Ctrl-C is the coordinator's business: it stops submitting and keeps
+    # what finished, the running tasks complete
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_graphs = _GraphLRU(graphs_per_worker)
+
+
+def _base_graph(kind: str, n: int, gseed: int, entries: list[dict],
+                cache_dir: str | None = None, shared: tuple | None = None):
+    """The base graph from this worker's LRU, else built / loaded / attached
+    (see `_load_graph`); fills its metrics into every entry (None on failure)."""
     try:
-        # Build base graph inside the worker (cheap, avoids cross‑process copy)
-        G0 = build_graph(kind, n, gseed)
-        entry["max_degree_actual"] = G0.graph.get("delta", -1)
-        entry["diameter"]          = nx.diameter(G0)
-        entry["num_edges"]         = G0.number_of_edges()
+        graph, metrics = _worker_graphs.get(
+            cache_key(kind, n, gseed),
+            partial(_load_graph, kind, n, gseed, cache_dir, shared))
     except Exception as e:
-        entry["error"] = f"graph build failure: {e}"
+        for entry in entries:
+            entry["error"] = f"graph build failure: {e}"
+        return None
+    for entry in entries:
+        entry.update(metrics)
+    return graph
+
+
+# —— Worker function ————————————————————————————————————————————————
+def _run_single(config: tuple[str,int,int,int,int,str,str|None,tuple|None,tuple|None,float|None,bool]) -> dict:
+    """
+    One independent simulation run.
+
+    Parameters (packed for pickling):
+        (graph_type, n, graph_seed, run_idx, max_rounds, engine, cache_dir,
+         shared, budget, wall_limit, stage_counters) – ``shared`` is the
+        descriptor of the published base graph, or None to build / load it
+        here; ``budget`` see `_round_cap`; ``wall_limit`` in seconds, or
+        None; ``stage_counters`` runs the election instrumented
+    Returns:
+        dict – one entry in the results json
+    """
+    (kind, n, gseed, run_idx, max_rounds, engine, cache_dir, shared,
+     budget, wall_limit, stage_counters) = config
+
+    entry = _new_entry(kind, n, gseed, run_idx)
+    graph = _base_graph(kind, n, gseed, [entry], cache_dir, shared)
+    if graph is None:
         return entry
 
     # Derive deterministic seeds for this *run*
-    pr_seed = (gseed * 1_000_000) ^ (run_idx * 17_031) ^ 0xA5A5
-    ap_seed = pr_seed + 987_654_321
+    pr_seed, ap_seed = _run_seeds(gseed, run_idx)
 
     try:
-        G  = deepcopy(G0)
-        randomize_ports(G, pr_seed)
-        agents = scatter_one_agent_per_node(G, ap_seed)
-        leader, rounds, timeout = run_leader_election(
-            G, agents, max_rounds=max_rounds)
+        if shared is not None:
+            # private ports and agents over the shared, read-only arrays
+            G = graph.port_graph(pr_seed)
+            agents = scatter_agents(range(graph.n), graph.delta, ap_seed)
+        else:
+            G  = deepcopy(graph)
+            randomize_ports(G, pr_seed)
+            agents = scatter_one_agent_per_node(G, ap_seed)
+        cap = _round_cap(entry, max_rounds, budget)
+        deadline = time.monotonic() + wall_limit if wall_limit else None
+        extra = {"counters": {}} if stage_counters else {}
+        leader, rounds, timeout = ENGINES[engine](
+            G, agents, max_rounds=cap, deadline=deadline, **extra)
 
-        entry.update(rounds=rounds, leader=leader, timeout=timeout)
+        _record(entry, leader, rounds, timeout, cap)
+        entry["stage_counters"] = extra.get("counters")
 
         per_agent = [a.edge_traversals for a in agents.values()]
         entry["edge_traversals"]     = sum(per_agent)
@@ -93,69 +255,546 @@ def _run_single(config: tuple[str,int,int,int,int,bool,int]) -> dict:
     return entry
 
 
+def _run_batch(config: tuple[str,int,int,tuple[int,...],int,str|None,tuple|None,tuple|None,float|None]) -> list[dict]:
+    """
+    Several runs of one base graph simulated together by the batch engine.
+
+    Parameters (packed for pickling):
+        (graph_type, n, graph_seed, run_indices, max_rounds, cache_dir,
+         shared, budget, wall_limit) – the batch as a whole gets
+        ``wall_limit`` seconds per run
+    Returns:
+        list[dict] – one entry per run index, same schema as `_run_single`
+    """
+    (kind, n, gseed, run_indices, max_rounds, cache_dir, shared,
+     budget, wall_limit) = config
+
+    entries = [_new_entry(kind, n, gseed, run_idx) for run_idx in run_indices]
+    graph = _base_graph(kind, n, gseed, entries, cache_dir, shared)
+    if graph is None:
+        return entries
+
+    try:
+        seeds = [_run_seeds(gseed, run_idx) for run_idx in run_indices]
+        port_seeds, agent_seeds = [s[0] for s in seeds], [s[1] for s in seeds]
+        if shared is not None:
+            delta = graph.delta
+            tables = graph.port_tables(port_seeds, delta)
+            homes = agent_homes(graph.n, agent_seeds)
+        else:
+            delta = graph.graph["delta"]
+            tables, homes = prepare_runs(graph, port_seeds, agent_seeds)
+        cap = _round_cap(entries[0], max_rounds, budget)
+        deadline = (time.monotonic() + wall_limit * len(run_indices)
+                    if wall_limit else None)
+        results = run_leader_election_batch(tables, homes, delta,
+                                            max_rounds=cap, deadline=deadline)
+        for entry, (leader, rounds, timeout, per_agent) in zip(entries, results):
+            _record(entry, leader, rounds, timeout, cap)
+            entry["edge_traversals"]     = int(per_agent.sum())
+            entry["max_edge_traversals"] = int(per_agent.max()) if len(per_agent) else None
+
+    except Exception as e:
+        for entry in entries:
+            entry["error"] = str(e)
+
+    return entries
+
+
+def _run_chunk(config: tuple[str,int,int,tuple[int,...],int,str,str|None,tuple|None,tuple|None,float|None,bool]) -> list[dict]:
+    """
+    Several runs of one base graph, one after the other (`_run_single` each).
+
+    Parameters (packed for pickling):
+        (graph_type, n, graph_seed, run_indices, max_rounds, engine,
+         cache_dir, shared, budget, wall_limit, stage_counters)
+    """
+    (kind, n, gseed, run_indices, *rest) = config
+    return [_run_single((kind, n, gseed, run_idx, *rest))
+            for run_idx in run_indices]
+
+
+def _counted(fn, config) -> tuple[list[dict], int, int, float]:
+    """``fn(config)`` plus the worker's graph LRU hits and misses during it
+    and the seconds it took."""
+    hits, misses = _worker_graphs.hits, _worker_graphs.misses
+    t0 = time.perf_counter()
+    entries = fn(config)
+    return (entries, _worker_graphs.hits - hits,
+            _worker_graphs.misses - misses, time.perf_counter() - t0)
+
+
+def _warm_graph(config: tuple[str,int,int,str]) -> dict | None:
+    """Fill the graph cache for one base graph; returns its metrics (None if
+    it cannot be built, the runs then report the error themselves)."""
+    (kind, n, gseed, cache_dir) = config
+    try:
+        return _entry_metrics(cached_graph(kind, n, gseed, cache_dir=cache_dir)[1])
+    except Exception:
+        return None
+
+
+def _graph_arrays(config: tuple[str,int,int,str|None]):
+    """CSR adjacency of one base graph for the coordinator to publish:
+    ``(offsets, nbr, delta, metrics)``, or None if the graph cannot be built
+    (the runs then report the error themselves)."""
+    (kind, n, gseed, cache_dir) = config
+    try:
+        if cache_dir:
+            offsets, nbr, info = cached_arrays(kind, n, gseed, cache_dir=cache_dir)
+            return offsets, nbr, info["delta"], _entry_metrics(info)
+        G0, metrics = _load_graph(kind, n, gseed, None, None)
+        _, offsets, nbr = neighbour_csr(G0)
+        delta = G0.graph.get("delta", max(dict(G0.degree()).values(), default=0))
+        return offsets, nbr, delta, metrics
+    except Exception:
+        return None
+
+
 # —— Coordinator / CLI ——————————————————————————————————————————————
+def _chunks(items, size: int):
+    """Consecutive tuples of ``size`` items (the last may be shorter), lazily."""
+    it = iter(items)
+    while chunk := tuple(itertools.islice(it, size)):
+        yield chunk
+
+
+class _Sampler:
+    """Sequential stopping for ``--sampling adaptive``.
+
+    Keeps running statistics per config and hands out run indices only to
+    configs whose confidence intervals are still wider than the target,
+    fewest runs first (the most expensive among equals), never more than
+    the current estimate of the runs they still need.  ``pending`` maps
+    every config to the number of runs it has left, ``todo(cfg)`` generates
+    their indices, ``cost`` maps it to its expected seconds per run.
+    """
+
+    def __init__(self, pending: dict, todo, stats: dict, min_runs: int,
+                 target: float, cost: dict):
+        self.left = dict(pending)
+        self.todo = {cfg: todo(cfg) for cfg in pending}
+        self.stats = stats
+        self.min_runs = min_runs
+        self.target = target
+        self.cost = cost
+        self.in_flight = dict.fromkeys(pending, 0)
+
+    def converged(self, cfg) -> bool:
+        return self.stats[cfg].converged(self.target, self.min_runs)
+
+    def add(self, cfg, entries: list[dict]) -> None:
+        self.in_flight[cfg] -= len(entries)
+        for entry in entries:
+            self.stats[cfg].add(entry)
+
+    def next_chunk(self, size: int):
+        """``(config, run_indices)`` to run next, or None if every config
+        has converged, is out of runs, or waits for the runs in flight."""
+        best = None
+        for cfg, left in self.left.items():
+            if not left or self.converged(cfg):
+                continue
+            st = self.stats[cfg]
+            scheduled = st.runs + self.in_flight[cfg]
+            if scheduled >= st.runs_needed(self.target, self.min_runs):
+                continue
+            rank = (scheduled, -self.cost[cfg])
+            if best is None or rank < best[0]:
+                best = (rank, cfg)
+        if best is None:
+            return None
+        (scheduled, _), cfg = best
+        need = min(self.stats[cfg].runs_needed(self.target, self.min_runs) - scheduled,
+                   self.left[cfg])
+        take = min(size, max(1, math.ceil(need)))
+        run_indices = tuple(itertools.islice(self.todo[cfg], take))
+        self.left[cfg] -= take
+        self.in_flight[cfg] += take
+        return cfg, run_indices
+
+    def seconds_left(self) -> float:
+        """Expected run time of the runs in flight and of those the
+        unconverged configs are estimated to still need."""
+        total = 0.0
+        for cfg, left in self.left.items():
+            runs = self.in_flight[cfg]
+            if left and not self.converged(cfg):
+                st = self.stats[cfg]
+                need = min(st.runs_needed(self.target, self.min_runs), st.runs + runs + left)
+                runs = max(runs, math.ceil(need) - st.runs)
+            total += runs * self.cost[cfg]
+        return total
+
+
+def _print_stage_counters(totals: dict[str, int]) -> None:
+    """Where the instrumented runs of this sweep spent their loop time."""
+    loop_ns = sum(totals[f"{stage}_ns"] for stage in STAGES) or 1
+    print("Stage time: " + ", ".join(
+        f"{stage} {totals[f'{stage}_ns'] / 1e9:.2f} s ({totals[f'{stage}_ns'] / loop_ns:.0%})"
+        for stage in STAGES))
+    rounds, meetings = max(1, totals["rounds"]), max(1, totals["meetings"])
+    print(f"Events: {totals['rounds']} rounds, {totals['meetings'] / rounds:.2f} meetings/round, "
+          f"{totals['meeting_agents'] / meetings:.2f} agents/meeting "
+          f"(max {totals['max_meeting']}), {totals['parent_changes']} parent changes, "
+          f"{totals['votes']} votes, {totals['phase_ends']} phase ends")
+
+
 def run_simulation_suite(args):
     graph_types   = args.types
     node_counts   = args.nodes
     graph_seeds   = args.graph_seeds
     runs_per_graph= args.runs_per_graph
+    adaptive      = args.sampling == "adaptive"
 
     combos = list(itertools.product(graph_types,
                                     node_counts,
                                     graph_seeds))
     total_runs = len(combos) * runs_per_graph
-    print(f"Launching {total_runs} runs "
-          f"({len(combos)} configs × {runs_per_graph} port randomisations)")
+    if adaptive:
+        print(f"Launching up to {total_runs} runs ({len(combos)} configs × "
+              f"{args.min_runs}–{runs_per_graph} port randomisations, until the "
+              f"95% CI is within ±{args.ci_target:.0%} of the mean)")
+    else:
+        print(f"Launching {total_runs} runs "
+              f"({len(combos)} configs × {runs_per_graph} port randomisations)")
+
+    # runs already in the journal of an interrupted sweep are not run again
+    journal = args.journal or os.path.splitext(args.output)[0] + ".jsonl"
+    recorded = recorded_keys(journal) if args.resume else set()
+    kept = Counter(key[:3] for key in recorded if key[3] < runs_per_graph)
+    stats = {}
+    if adaptive:
+        stats = {cfg: ConfigStats() for cfg in combos}
+        for r in iter_records(journal) if recorded else ():
+            if run_key(r)[:3] in stats:
+                stats[run_key(r)[:3]].add(r)
+
+    # configs with runs left and how many; the run indices themselves are
+    # only generated as their tasks are submitted
+    pending = {}
+    for cfg in combos:
+        left = runs_per_graph - kept[cfg]
+        if left > 0 and not (adaptive and stats[cfg].converged(args.ci_target,
+                                                                args.min_runs)):
+            pending[cfg] = left
+    remaining = sum(pending.values())
+
+    def todo(cfg):
+        return (r for r in range(runs_per_graph) if (*cfg, r) not in recorded)
+    if args.resume:
+        print(f"Resuming: {len(recorded)} runs already in {journal}")
 
-    # Create list of argument tuples for workers
-    worker_args = []
-    for kind, n, gseed in combos:
-        for run_idx in range(runs_per_graph):
-            worker_args.append((kind, n, gseed, run_idx, args.max_rounds))
+    cache_dir = None if args.no_graph_cache else args.graph_cache
+    graphs = {cache_key(kind, n, gseed): (kind, n, gseed, cache_dir)
+              for kind, n, gseed in pending}
+    published: dict[tuple, SharedGraph] = {}
+
+    # adaptive budgets: a multiple of the rounds earlier runs of the config
+    # needed (history files, plus the journal when resuming), or of the
+    # predicted bound for configs without history
+    observed = {}
+    if args.round_budget == "adaptive":
+        observed = observed_rounds(args.budget_history +
+                                   ([journal] if args.resume and recorded else []))
+
+    def budget(kind, n, gseed):
+        if args.round_budget != "adaptive":
+            return None
+        return (args.budget_factor, observed.get((kind, n, gseed)))
+
+    # enough chunks for every worker to have two, but no more than that;
+    # adaptive sampling decides after every chunk, so its chunks are small
+    if args.engine == BATCH_ENGINE:
+        chunk_size = args.batch_size
+    elif adaptive:
+        chunk_size = args.chunk_size or args.min_runs
+    else:
+        chunk_size = args.chunk_size or math.ceil(
+            runs_per_graph / max(1, math.ceil(2 * args.workers / max(1, len(combos)))))
+
+    def task(kind, n, gseed, run_indices):
+        graph = published.get(cache_key(kind, n, gseed))
+        shared = graph.descriptor if graph is not None else None
+        if args.engine == BATCH_ENGINE:
+            return _run_batch, (kind, n, gseed, run_indices, args.max_rounds,
+                                cache_dir, shared, budget(kind, n, gseed),
+                                args.wall_limit)
+        return _run_chunk, (kind, n, gseed, run_indices, args.max_rounds,
+                            args.engine, cache_dir, shared,
+                            budget(kind, n, gseed), args.wall_limit,
+                            args.stage_counters)
+
+    costs = CostModel(args.engine, None if args.no_cost_history else args.cost_history)
+    metrics: dict[tuple, dict | None] = {}
 
-    results = []
     start_all = time.time()
 
+    if not args.no_shared_graphs:
+        start_tracker()
+
     # Allow Ctrl‑C to stop cleanly
     orig_sigint = signal.signal(signal.SIGINT, signal.SIG_IGN)
-    with ProcessPoolExecutor(max_workers=args.workers) as pool:
-        signal.signal(signal.SIGINT, orig_sigint)
-        futures = [pool.submit(_run_single, wa) for wa in worker_args]
+    try:
+        with ResultLog(journal, resume=args.resume,
+                       fsync_interval=args.fsync_interval) as log, \
+             ProcessPoolExecutor(max_workers=args.workers,
+                                 initializer=_init_worker,
+                                 initargs=(args.worker_graphs,)) as pool:
+            signal.signal(signal.SIGINT, orig_sigint)
+            if not args.no_shared_graphs:
+                # every distinct graph is built (or loaded) once, in
+                # parallel, and published in shared memory for its runs
+                for key, arrays in zip(graphs, pool.map(_graph_arrays, graphs.values())):
+                    if arrays is not None:
+                        published[key] = SharedGraph.publish(*arrays)
+                        metrics[key] = arrays[3]
+            elif cache_dir:
+                # every distinct graph is built (or found) once before the runs
+                # start, instead of by each of its racing tasks
+                metrics.update(zip(graphs, pool.map(_warm_graph, graphs.values())))
+
+            # expected seconds per run of every config, for the schedule and the ETA
+            cost = {cfg: costs.run_seconds(*cfg, metrics.get(cache_key(*cfg)))
+                    for cfg in pending}
+
+            # tasks are generated as the window of submitted but unfinished
+            # ones has room, so the coordinator holds a bounded number of
+            # futures and argument tuples however large the sweep
+            window = args.max_in_flight or DEFAULT_TASKS_PER_WORKER * args.workers
+
+            if adaptive:
+                # every finished chunk decides what runs next, so workers
+                # move on to unconverged configs
+                sampler = _Sampler(pending, todo, stats, args.min_runs,
+                                   args.ci_target, cost)
+
+                def next_task():
+                    chunk = sampler.next_chunk(chunk_size)
+                    return chunk and task(*chunk[0], chunk[1])
+
+                seconds_left = sampler.seconds_left
+            else:
+                # a graph's runs go out together, in chunks, so that they
+                # mostly land on workers that already hold the graph; the
+                # chunks of expensive configs are cut to about their share of
+                # a worker's time so that none runs alone at the end
+                sampler = None
+                left = [sum(cost[cfg] * runs for cfg, runs in pending.items())]
+                share = left[0] / (2 * args.workers)
+                size = {}
+                for cfg in pending:
+                    size[cfg] = chunk_size
+                    if not args.chunk_size and args.engine != BATCH_ENGINE and cost[cfg] > 0:
+                        size[cfg] = max(1, min(chunk_size, int(share // cost[cfg])))
+                order = list(pending)
+                if args.schedule == "longest-first":
+                    order.sort(key=lambda cfg: cost[cfg] * min(size[cfg], pending[cfg]),
+                               reverse=True)
+                worker_args = (task(*cfg, run_indices) for cfg in order
+                               for run_indices in _chunks(todo(cfg), size[cfg]))
 
-        done = 0
-        for fut in as_completed(futures):
+                def next_task():
+                    return next(worker_args, None)
+
+                def seconds_left():
+                    return left[0]
+
+            futures = {}
+
+            def fill():
+                while len(futures) < window:
+                    item = next_task()
+                    if item is None:
+                        break
+                    fn, wa = item
+                    futures[pool.submit(_counted, fn, wa)] = wa
+
+            done = hits = lookups = 0
+            predicted = measured = 0.0
+            last_print = time.time()
+            timeouts = {"rounds": 0, "wall": 0}
+            stage_totals: dict[str, int] = {}
             try:
-                res = fut.result()
-            except Exception as e:      # should never happen
-                res = {"error": f"worker exception: {e}"}
-            results.append(res)
-            done += 1
-            if not args.quiet and (done % 20 == 0 or done == total_runs):
-                elapsed = time.time() - start_all
-                rate = done / elapsed if elapsed else 0
-                print(f"  {done}/{total_runs} runs finished "
-                      f"({rate:.1f} runs/s)")
+                fill()
+                while futures:
+                    finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        kind, n, gseed, run_indices = futures.pop(fut)[:4]
+                        cfg = (kind, n, gseed)
+                        try:
+                            batch, h, m, seconds = fut.result()
+                        except Exception as e:      # should never happen
+                            batch, h, m, seconds = [dict(_new_entry(kind, n, gseed, run_idx),
+                                                         error=f"worker exception: {e}")
+                                                    for run_idx in run_indices], 0, 0, 0.0
+                        log.append(batch)
+                        if not any(entry["error"] for entry in batch):
+                            costs.observe(kind, n, gseed, metrics.get(cache_key(*cfg)),
+                                          seconds, len(batch))
+                        predicted += cost[cfg] * len(run_indices)
+                        measured += seconds
+                        if sampler is not None:
+                            sampler.add(cfg, batch)
+                        else:
+                            left[0] -= cost[cfg] * len(run_indices)
+                        for entry in batch:
+                            if entry.get("timeout_reason"):
+                                timeouts[entry["timeout_reason"]] += 1
+                            if entry.get("stage_counters"):
+                                add_counters(stage_totals, entry["stage_counters"])
+                        hits, lookups = hits + h, lookups + h + m
+                        prev, done = done, done + len(batch)
+                        now = time.time()
+                        if not args.quiet and (done // 20 > prev // 20 or done == remaining
+                                               or now - last_print >= PROGRESS_INTERVAL):
+                            last_print = now
+                            elapsed = now - start_all
+                            rate = done / elapsed if elapsed else 0
+                            # the model's estimate of the work left, corrected
+                            # by how far off it was for the tasks so far
+                            eta = (seconds_left() * measured / predicted / args.workers
+                                   if predicted else None)
+                            print(f"  {done}/{remaining} runs finished "
+                                  f"({rate:.1f} runs/s, ETA {format_eta(eta)}, "
+                                  f"worker graph hits {hits / max(1, lookups):.0%})")
+                    fill()
+            except KeyboardInterrupt:
+                pool.shutdown(wait=False, cancel_futures=True)
+                print(f"Interrupted; {done} runs kept in {journal} "
+                      f"(continue with --resume), waiting for running tasks")
+                raise
+    finally:
+        for graph in published.values():
+            graph.unlink()
+        costs.save()
+
+    if any(timeouts.values()):
+        print(f"Timed out: {timeouts['rounds']} runs at the round cap, "
+              f"{timeouts['wall']} at the wall-clock limit")
+    if stage_totals:
+        _print_stage_counters(stage_totals)
+    if adaptive:
+        converged = sum(st.converged(args.ci_target, args.min_runs) for st in stats.values())
+        print(f"Converged: {converged}/{len(combos)} configs after "
+              f"{sum(st.runs for st in stats.values())} of at most {total_runs} runs")
 
     # — save —
-    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
-    with open(args.output, "w") as f:
-        json.dump(results, f, indent=2)
-    print(f"Saved {len(results)} records → {args.output}")
+    if args.summary_only:
+        rows = summarize(iter_records(journal),
+                         args.ci_target if adaptive else None, args.min_runs)
+        tmp = args.output + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(rows, f, indent=2)
+        os.replace(tmp, args.output)
+        os.unlink(journal)
+        print(f"Saved {len(rows)} config summaries → {args.output}")
+        return
+    if args.output_format == "columnar":
+        output = args.output
+        if output.endswith(".json"):
+            output = output[:-len(".json")] + ".cols"
+        saved = write_columnar(sorted_records(journal, tmp_dir=os.path.dirname(output) or "."),
+                               output)
+        print(f"Saved {saved} records → {output}/")
+        return
+    saved = compact(journal, args.output)
+    print(f"Saved {saved} records → {args.output}")
 
 # ————————————————————————————————————————————————————————————————
 if __name__ == "__main__":
     p = argparse.ArgumentParser(description="Parallel leader‑election sims")
     p.add_argument("-o","--output", default=DEFAULT_OUTPUT_FILE,
                    help="JSON file (default: %(default)s)")
+    p.add_argument("--output-format", choices=["json", "columnar"], default="json",
+                   help="json: one JSON list; columnar: a directory of "
+                        "compressed .npz column chunks (OUTPUT with .json "
+                        "replaced by .cols) for plot_election (default: %(default)s)")
+    p.add_argument("--journal", metavar="PATH",
+                   help="JSONL file every finished run is appended to "
+                        "(default: OUTPUT with a .jsonl suffix)")
+    p.add_argument("--resume", action="store_true",
+                   help="Keep the journal and skip the runs already in it")
+    p.add_argument("--fsync-interval", type=float, default=DEFAULT_FSYNC_INTERVAL,
+                   metavar="SECONDS",
+                   help="Flush the journal to disk this often (default: %(default)s)")
     p.add_argument("--types",   nargs="+", default=DEFAULT_GRAPH_TYPES)
     p.add_argument("--nodes",   nargs="+", type=int, default=DEFAULT_NODE_COUNTS)
     p.add_argument("--graph-seeds", nargs="+", type=int, default=DEFAULT_GRAPH_SEEDS)
     p.add_argument("--runs-per-graph", type=int, default=DEFAULT_NUM_RUNS_PER_GRAPH)
     p.add_argument("--max-rounds", type=int, default=DEFAULT_MAX_ROUNDS)
+    p.add_argument("--round-budget", choices=["fixed", "adaptive"], default="fixed",
+                   help="fixed: every run gets --max-rounds; adaptive: "
+                        "--budget-factor times the rounds the config needed "
+                        "before (--budget-history) or is predicted to need, "
+                        "at most --max-rounds (default: %(default)s)")
+    p.add_argument("--budget-factor", type=float, default=DEFAULT_BUDGET_FACTOR,
+                   help="Multiple of the round bound given with "
+                        "--round-budget adaptive (default: %(default)s)")
+    p.add_argument("--budget-history", nargs="+", default=[], metavar="PATH",
+                   help="Earlier results (JSON or JSONL) to take observed "
+                        "rounds from")
+    p.add_argument("--sampling", choices=["fixed", "adaptive"], default="fixed",
+                   help="fixed: --runs-per-graph runs per config; adaptive: "
+                        "stop a config once the 95%% CI of its mean rounds and "
+                        "edge traversals is within --ci-target, after at least "
+                        "--min-runs and at most --runs-per-graph runs "
+                        "(default: %(default)s)")
+    p.add_argument("--ci-target", type=float, default=DEFAULT_CI_TARGET,
+                   help="CI half-width relative to the mean with --sampling "
+                        "adaptive (default: %(default)s)")
+    p.add_argument("--min-runs", type=int, default=DEFAULT_MIN_RUNS,
+                   help="Runs per config before --sampling adaptive may stop "
+                        "it (default: %(default)s)")
+    p.add_argument("--summary-only", action="store_true",
+                   help="Write per-config statistics instead of every run "
+                        "(the journal is removed once they are saved)")
+    p.add_argument("--schedule", choices=["longest-first", "product"],
+                   default="longest-first",
+                   help="Order of the tasks: longest expected first, or "
+                        "configs in --types × --nodes × --graph-seeds order "
+                        "(default: %(default)s)")
+    p.add_argument("--cost-history", default=DEFAULT_COST_HISTORY, metavar="PATH",
+                   help="Task runtimes of earlier sweeps, for the schedule and "
+                        "the ETA; updated after every sweep (default: %(default)s)")
+    p.add_argument("--no-cost-history", action="store_true",
+                   help="Estimate runtimes from the graph metrics alone and "
+                        "keep no history")
+    p.add_argument("--wall-limit", type=float, default=None, metavar="SECONDS",
+                   help="Stop any run still going after this long")
+    p.add_argument("--engine", choices=sorted(ENGINES) + [BATCH_ENGINE],
+                   default=DEFAULT_ENGINE,
+                   help="Election engine (default: %(default)s)")
+    p.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                   help="Runs per task with --engine batch (default: %(default)s)")
+    p.add_argument("--graph-cache", default=DEFAULT_GRAPH_CACHE, metavar="DIR",
+                   help="Directory of cached base graphs (default: %(default)s)")
+    p.add_argument("--no-graph-cache", action="store_true",
+                   help="Build every graph in every task, without the cache")
+    p.add_argument("--no-shared-graphs", action="store_true",
+                   help="Build or load the graph in every task instead of "
+                        "attaching to one copy in shared memory")
+    p.add_argument("--chunk-size", type=int, default=0,
+                   help="Runs of one graph per task (default: enough chunks "
+                        "for two per worker)")
+    p.add_argument("--max-in-flight", type=int, default=0, metavar="TASKS",
+                   help="Tasks submitted to the pool at a time (default: "
+                        f"{DEFAULT_TASKS_PER_WORKER} per worker)")
+    p.add_argument("--worker-graphs", type=int, default=DEFAULT_WORKER_GRAPHS,
+                   help="Base graphs each worker keeps (LRU, default: %(default)s)")
     p.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
                    help=f"Processes to launch (default = CPU count: {DEFAULT_WORKERS})")
+    p.add_argument("--stage-counters", action="store_true",
+                   help="Run the election instrumented: per-stage loop times "
+                        "and event counts go into every record and are "
+                        "summed over the sweep (--engine python only)")
     p.add_argument("--quiet", action="store_true",
                    help="Suppress progress output")
     args = p.parse_args()
+    if args.stage_counters and args.engine != "python":
+        p.error("--stage-counters needs --engine python")
 
-    run_simulation_suite(args)
+    try:
+        run_simulation_suite(args)
+    except KeyboardInterrupt:
+        sys.exit(130)
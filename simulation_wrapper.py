@@ -91,7 +91,9 @@ else:
     G = create_port_labeled_graph(nodes, max_degree, seed)
     if __name__ == "__main__":
         print(f'Graph created with {G.number_of_nodes()} nodes and {G.number_of_edges()} edges', file=sys.stderr)
-randomize_ports(G, seed)
+# one generator for port labels and start positions, so a seed reproduces a run
+rng = random.Random(seed)
+randomize_ports(G, seed, rng)
 
 for node in G.nodes():
     G.nodes[node]['agents'] = set()
@@ -99,7 +101,7 @@ for node in G.nodes():
 
 number_of_starting_positions = min(starting_positions, G.number_of_nodes()) if G.number_of_nodes() > 0 else 0
 # Ensure we have at least one node to start on if nodes > 0
-start_nodes = random.sample(list(G.nodes()), number_of_starting_positions) if number_of_starting_positions > 0 else (list(G.nodes())[0:1] if G.number_of_nodes() > 0 else [])
+start_nodes = rng.sample(list(G.nodes()), number_of_starting_positions) if number_of_starting_positions > 0 else (list(G.nodes())[0:1] if G.number_of_nodes() > 0 else [])
 
 if algorithm == "Help by Scouts":
     AgentClass = agent_help_scouts.Agent
@@ -118,7 +120,7 @@ else:
         start_nodes = [0]
         agents = [AgentClass(i, 0) for i in range(agent_count)]
     else:
-        agents = [AgentClass(i, random.choice(start_nodes)) for i in range(agent_count)]
+        agents = [AgentClass(i, rng.choice(start_nodes)) for i in range(agent_count)]
 
 if __name__ == "__main__": # Only print agent info when run directly
     print(f"Initialized {len(agents)} agents at nodes: {start_nodes}", file=sys.stderr)
@@ -135,7 +137,9 @@ if agents and rounds > 0 and G.number_of_nodes() > 0:
     else:
         sim_mod = agent_drop_freeze
 
-    all_positions, all_statuses, all_node_settled_states, all_homes, all_tree_edges = sim_mod.run_simulation(G, agents, rounds)
+    # help_scouts returns lazily rebuilt series; json.dumps wants lists
+    all_positions, all_statuses, all_node_settled_states, all_homes, all_tree_edges = map(
+        list, sim_mod.run_simulation(G, agents, rounds))
     if __name__ == "__main__": # Only print simulation finished info when run directly
         print(f'Simulation finished after {len(all_positions) - 1} recorded steps.', file=sys.stderr)
 else:
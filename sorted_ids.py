@@ -0,0 +1,119 @@
+# sorted_ids.py
+"""
+Sets of agent IDs that know their order.
+
+`SortedIDs` is a set of IDs drawn from a fixed universe (the IDs of a run's
+agents).  Besides the members themselves it counts them in a Fenwick tree
+indexed by rank in the universe, so ``ids[i]``, the i-th smallest member
+(``ids[0]`` the lowest, ``ids[-1]`` the highest), takes O(log k), as do `add`
+and `discard`.  Membership and iteration are those of a plain set; iteration
+is in no particular order -- index for order.
+
+`IDUnion` is a live view of the union of disjoint `SortedIDs` over the same
+universe, indexed the same way, without ever building the union.
+
+Pure Python: loaded by the Pyodide build.
+"""
+from itertools import chain
+
+
+class SortedIDs:
+    """Set of IDs from ``universe``, initially ``ids``."""
+
+    def __init__(self, universe, ids=()):
+        self._order = sorted(universe)
+        self._rank = {aid: r for r, aid in enumerate(self._order, 1)}
+        self._tree = [0] * (len(self._order) + 1)
+        self._members = set()
+        for aid in ids:
+            self.add(aid)
+
+    def _update(self, aid, delta):
+        tree, r = self._tree, self._rank[aid]
+        while r < len(tree):
+            tree[r] += delta
+            r += r & -r
+
+    def add(self, aid):
+        if aid not in self._members:
+            self._members.add(aid)
+            self._update(aid, 1)
+
+    def discard(self, aid):
+        if aid in self._members:
+            self._members.remove(aid)
+            self._update(aid, -1)
+
+    def remove(self, aid):
+        if aid not in self._members:
+            raise KeyError(aid)
+        self.discard(aid)
+
+    def __contains__(self, aid):
+        return aid in self._members
+
+    def __len__(self):
+        return len(self._members)
+
+    def __iter__(self):
+        return iter(self._members)
+
+    def __getitem__(self, i):
+        return _select((self,), i)
+
+    def __reversed__(self):
+        return _descending(self)
+
+    def __repr__(self):
+        return f"SortedIDs({sorted(self._members)})"
+
+
+class IDUnion:
+    """Union of the disjoint `SortedIDs` ``parts``, which share a universe."""
+
+    def __init__(self, *parts):
+        self._parts = parts
+
+    def __contains__(self, aid):
+        return any(aid in p for p in self._parts)
+
+    def __len__(self):
+        return sum(len(p) for p in self._parts)
+
+    def __iter__(self):
+        return chain.from_iterable(self._parts)
+
+    def __getitem__(self, i):
+        return _select(self._parts, i)
+
+    def __reversed__(self):
+        return _descending(self)
+
+    def __repr__(self):
+        return f"IDUnion({sorted(self)})"
+
+
+def _select(parts, i):
+    """The i-th smallest member of the union of ``parts``."""
+    n = sum(len(p) for p in parts)
+    if i < 0:
+        i += n
+    if not 0 <= i < n:
+        raise IndexError("ID index out of range")
+    trees = [p._tree for p in parts]
+    size = len(trees[0]) - 1
+    pos, left = 0, i + 1
+    step = 1 << size.bit_length()
+    while step:
+        nxt = pos + step
+        if nxt <= size:
+            count = sum(t[nxt] for t in trees)
+            if count < left:
+                pos, left = nxt, left - count
+        step >>= 1
+    return parts[0]._order[pos]
+
+
+def _descending(ids):
+    for i in range(len(ids) - 1, -1, -1):
+        yield ids[i]
@@ -16,7 +16,7 @@ def run_one(nodes: int, agent_count: int, degree: int, seed: int):
     G = graph_utils.create_port_labeled_graph(nodes, degree, seed)
     graph_utils.randomize_ports(G, seed)
     agents = [agent_help_scouts.Agent(i, 0) for i in range(agent_count)]
-    agent_help_scouts.run_simulation(G, agents)
+    agent_help_scouts.run_simulation(G, agents, record="none")
 
 def main():
     rng = random.Random(0)
@@ -0,0 +1,68 @@
+# test_plot_election.py
+"""Follow mode's journal tail (`plot_election._Tail`)."""
+import os
+
+from plot_election import _Tail
+from results_log import ResultLog
+
+
+def _write(path, entries, resume=False):
+    with ResultLog(path, resume=resume) as log:
+        log.append(entries)
+
+
+def _runs(n, start=0, tag="a"):
+    return [{"run_index": i, "tag": tag} for i in range(start, start + n)]
+
+
+def test_appended_records_only(tmp_path):
+    path = str(tmp_path / "sweep.jsonl")
+    _write(path, _runs(3))
+    tail = _Tail(path)
+    assert tail.read() == (_runs(3), False)
+    _write(path, _runs(2, start=3), resume=True)
+    assert tail.read() == (_runs(2, start=3), False)
+    assert tail.read() == ([], False)
+
+
+def test_partial_line_waits_for_its_newline(tmp_path):
+    path = str(tmp_path / "sweep.jsonl")
+    _write(path, _runs(1))
+    with open(path, "a") as f:
+        f.write('{"run_index": 1')
+    tail = _Tail(path)
+    assert tail.read() == (_runs(1), False)
+    with open(path, "a") as f:
+        f.write(', "tag": "a"}\nnot json\n')
+    assert tail.read() == (_runs(1, start=1), False)
+
+
+def test_rewrite_with_same_first_line_shorter(tmp_path):
+    path = str(tmp_path / "sweep.jsonl")
+    _write(path, _runs(9))
+    tail = _Tail(path)
+    tail.read()
+    _write(path, _runs(4, tag="a")[:1] + _runs(3, start=1, tag="b"))
+    assert tail.read() == (_runs(1) + _runs(3, start=1, tag="b"), True)
+
+
+def test_rewrite_with_same_first_line_past_old_offset(tmp_path):
+    path = str(tmp_path / "sweep.jsonl")
+    _write(path, _runs(6))
+    tail = _Tail(path)
+    tail.read()
+    # the rerun has already outgrown what was read before the next poll
+    _write(path, _runs(1) + _runs(8, start=1, tag="b"))
+    assert tail.read() == (_runs(1) + _runs(8, start=1, tag="b"), True)
+    assert tail.read() == ([], False)
+
+
+def test_replaced_file(tmp_path):
+    path = str(tmp_path / "sweep.jsonl")
+    _write(path, _runs(3))
+    tail = _Tail(path)
+    tail.read()
+    other = str(tmp_path / "new.jsonl")
+    _write(other, _runs(5))
+    os.replace(other, path)
+    assert tail.read() == (_runs(5), True)
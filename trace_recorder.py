@@ -0,0 +1,202 @@
+# trace_recorder.py
+"""
+Delta-encoded trace of a dispersion run.
+
+The visualizer wants, for every round of a run, the position, status and
+home of every agent and the tree edges of the settled agents
+(``all_positions``, ``all_statuses``, ``all_homes``, ``all_tree_edges``).
+Copying all of that at every recorded step costs O(k) per step and
+O(rounds × k) memory.  `TraceRecorder` keeps one live copy of what the trace
+shows of each agent (a "cell": position, status, home and tree edge) and
+logs only the changes, one ``(slot, cell)`` event per agent whose cell
+changed; cells are interned, so an event costs two array entries.  A round
+is a reference into that log plus the cells of the agents that moved in it
+after it was opened.  A full keyframe of the live cells is kept every
+`KEYFRAME_INTERVAL` events (or every k, if larger) so that any round can be
+rebuilt without replaying the log from the start.
+
+`TraceSeries` are the per-round lists themselves, rebuilt on demand.
+
+The recorder only re-reads agents it is told about: the moving ones, and
+those passed to `touch` after their status, home or parent port changed.
+Labels are kept as a format string and its arguments and only formatted
+when read.
+
+Recording levels (`RECORD_LEVELS`): ``"full"`` records every step,
+``"rounds"`` only the state each round is opened with, and ``"none"`` is no
+recorder at all (the engine skips it).
+
+Pure Python: loaded by the Pyodide build.
+"""
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+
+KEYFRAME_INTERVAL = 4096
+RECORD_LEVELS = ("none", "rounds", "full")
+
+# fields of a cell and the series built from them
+POSITION, STATUS, HOME, EDGE = range(4)
+SERIES = ("positions", "statuses", "node_states", "homes", "tree_edges")
+_FIELD = {"positions": POSITION, "statuses": STATUS, "homes": HOME}
+
+
+class TraceRecorder:
+    """Trace of the agents in ``agents`` (id -> agent); ``read(agent)`` is
+    the agent's cell, a hashable ``(position, status, home, edge)``.
+    ``edge`` is None or ``(key, u, v, srcPort, dstPort)``; of several agents
+    with the same edge key only the lowest-ID one's edge is shown.  Agents
+    not in ``agents`` may be passed to `touch` and `snapshot`; they are not
+    recorded.  ``level`` is ``"full"`` or ``"rounds"``."""
+
+    def __init__(self, agents, read, level="full", keyframe_interval=KEYFRAME_INTERVAL):
+        if level not in ("rounds", "full"):
+            raise ValueError(f"level={level!r}, expected 'rounds' or 'full'")
+        order = sorted(agents)
+        self._full = level == "full"
+        self._read = read
+        self._agents = [agents[aid] for aid in order]
+        self._slot = {aid: i for i, aid in enumerate(order)}
+        self._cells = {}
+        self._live = [self._intern(read(a)) for a in self._agents]
+        self._event_slot = array("l")
+        self._event_cell = []
+        self._keyframes = [list(self._live)]
+        self._keyframe_at = [0]         # event count of each keyframe
+        self._keyframe_interval = max(keyframe_interval, len(order))
+        self._dirty = set()
+        # per round: [(label, args), opened at (event count),
+        #             {slot: cell} or None, tree edges at (event count)]
+        self._rows = []
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _intern(self, cell):
+        return self._cells.setdefault(cell, cell)
+
+    def touch(self, aid):
+        """Agent ``aid``'s cell may have changed; read it at the next snapshot."""
+        slot = self._slot.get(aid)
+        if slot is not None:
+            self._dirty.add(slot)
+
+    def _flush(self):
+        for slot in self._dirty:
+            cell = self._read(self._agents[slot])
+            if cell != self._live[slot]:
+                cell = self._live[slot] = self._intern(cell)
+                self._event_slot.append(slot)
+                self._event_cell.append(cell)
+        self._dirty.clear()
+        if len(self._event_cell) - self._keyframe_at[-1] >= self._keyframe_interval:
+            self._keyframes.append(list(self._live))
+            self._keyframe_at.append(len(self._event_cell))
+
+    def snapshot(self, label, round_number, moved=(), args=()):
+        """Record the state after a step of round ``round_number`` (at most
+        one past the last round), labelled ``label.format(*args)``.  A new
+        round takes every agent's current cell; at level ``"full"`` an
+        earlier round takes those of the ``moved`` agents only, and the
+        step's label and the current tree edges."""
+        moved = [slot for slot in map(self._slot.get, moved) if slot is not None]
+        self._dirty.update(moved)
+        rounds = len(self._rows)
+        if round_number > rounds:
+            raise ValueError(f"round_number={round_number} > simmer.rounds={rounds}")
+        if round_number < rounds and not self._full:
+            return
+        self._flush()
+        now = len(self._event_cell)
+        if round_number == rounds:
+            self._rows.append([(label, args), now, None, now])
+            return
+        row = self._rows[round_number]
+        row[0], row[3] = (label, args), now
+        if moved:
+            if row[2] is None:
+                row[2] = {}
+            for slot in moved:
+                row[2][slot] = self._live[slot]
+
+    def series(self):
+        """End the recording; ``(all_positions, all_statuses,
+        all_node_states, all_homes, all_tree_edges)`` of the run, as
+        `TraceSeries`."""
+        self._read = self._agents = self._cells = None
+        return tuple(TraceSeries(self, name) for name in SERIES)
+
+    def _cells_at(self, t, cursor):
+        """Live cells after the first ``t`` events; ``cursor`` is
+        ``[t, cells]`` of an earlier call, advanced in place."""
+        k = bisect_right(self._keyframe_at, t) - 1
+        start = self._keyframe_at[k]
+        if cursor[1] is None or t < cursor[0] or start > cursor[0]:
+            cursor[0], cursor[1] = start, list(self._keyframes[k])
+        live, slots, cells = cursor[1], self._event_slot, self._event_cell
+        for i in range(cursor[0], t):
+            live[slots[i]] = cells[i]
+        cursor[0] = t
+        return live
+
+    def _round(self, name, row, cursor):
+        (label, args), opened, moved, edges_at = row
+        if args:
+            label = label.format(*args)
+        if name == "node_states":
+            return (label, [])
+        if name == "tree_edges":
+            return (label, _tree_edges(self._cells_at(edges_at, cursor)))
+        cells = self._cells_at(opened, cursor)
+        field = _FIELD[name]
+        if moved:
+            cells = list(cells)
+            for slot, cell in moved.items():
+                cells[slot] = cell
+        return (label, [[cell[field]] for cell in cells])
+
+
+def _tree_edges(cells):
+    edges, seen = [], set()
+    for cell in cells:
+        edge = cell[EDGE]
+        if edge is None or edge[0] in seen:
+            continue
+        seen.add(edge[0])
+        _, u, v, src, dst = edge
+        edges.append({"u": u, "v": v, "srcPort": src, "dstPort": dst})
+    return edges
+
+
+class TraceSeries(Sequence):
+    """One per-round list of a recorded run, ``(label, value)`` per round,
+    rebuilt from the recorder when read.  Compares equal to a list with the
+    same items; ``list(series)`` materialises it."""
+
+    def __init__(self, recorder, name):
+        self._recorder = recorder
+        self._name = name
+
+    def __len__(self):
+        return len(self._recorder)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        row = self._recorder._rows[i]
+        return self._recorder._round(self._name, row, [0, None])
+
+    def __iter__(self):
+        cursor = [0, None]
+        for row in self._recorder._rows:
+            yield self._recorder._round(self._name, row, cursor)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"<TraceSeries {self._name}: {len(self)} rounds>"